@@ -29,7 +29,7 @@ COPY public."CONSTANTS" ("ID", "NAME", "VALUE") FROM stdin;
 --
 
 COPY public."EVENT_TYPE" ("ID", "NAME", "DESCRIPTION") FROM stdin;
-2	comitee_event	Vorstand
+2	committee_event	Vorstand
 3	chalet	Chalet
 1	scout_event	Pfadfinder
 \.
@@ -104,23 +104,23 @@ COPY public."ROLE" ("ID", "NAME") FROM stdin;
 -- Data for Name: ROLE_EVENT_TYPE; Type: TABLE DATA; Schema: public; Owner: dbtest_mtpe_user
 --
 
-COPY public."ROLE_EVENT_TYPE" ("ROLE_ID", "EVENT_TYPE_ID", "CAN_EDIT", "CAN_SEE", "CAN_ADD") FROM stdin;
-1	1	t	t	t
-1	2	t	t	t
-1	3	t	t	t
-2	1	t	t	t
-2	2	t	t	t
-2	3	t	t	t
-3	2	f	t	f
-6	2	t	t	t
-3	3	f	t	f
-5	3	f	t	f
-6	3	f	t	f
-7	3	f	t	f
-3	1	t	t	t
-4	1	t	t	t
-5	1	f	t	f
-6	1	f	t	f
+COPY public."ROLE_EVENT_TYPE" ("ROLE_ID", "EVENT_TYPE_ID", "PERMISSIONS") FROM stdin;
+1	1	7
+1	2	7
+1	3	7
+2	1	7
+2	2	7
+2	3	7
+3	2	2
+6	2	7
+3	3	2
+5	3	2
+6	3	2
+7	3	2
+3	1	7
+4	1	7
+5	1	2
+6	1	2
 \.
 
 
@@ -0,0 +1,24 @@
+"""add username index
+
+Revision ID: 3f1c9a7e5b20
+Revises: a04ac3f7b505
+Create Date: 2026-10-19 09:12:31.412518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7e5b20'
+down_revision = 'a04ac3f7b505'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('USER_USERNAME_idx', 'USER', ['USERNAME'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('USER_USERNAME_idx', table_name='USER')
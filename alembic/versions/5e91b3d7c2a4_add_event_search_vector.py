@@ -0,0 +1,32 @@
+"""add event search vector
+
+Revision ID: 5e91b3d7c2a4
+Revises: c4e7a2f19d58
+Create Date: 2026-10-19 19:26:08.114270
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5e91b3d7c2a4'
+down_revision = 'c4e7a2f19d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled for the existing rows when the column is added
+    op.add_column('EVENT', sa.Column('SEARCH_VECTOR', postgresql.TSVECTOR, sa.Computed(
+        "setweight(to_tsvector('simple', coalesce(\"TITLE\", '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(\"DESCRIPTION\", '')), 'B')",
+        persisted=True,
+    )))
+    op.create_index('EVENT_SEARCH_VECTOR_idx', 'EVENT', ['SEARCH_VECTOR'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('EVENT_SEARCH_VECTOR_idx', table_name='EVENT')
+    op.drop_column('EVENT', 'SEARCH_VECTOR')
@@ -0,0 +1,34 @@
+"""add unique role and event type names
+
+Revision ID: 8b2d6e4c1a93
+Revises: 3f1c9a7e5b20
+Create Date: 2026-10-19 16:58:04.215873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d6e4c1a93'
+down_revision = '3f1c9a7e5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The seed upserts event types by name, rename the misspelled one so it is not created a second time
+    op.execute(
+        """
+        UPDATE "EVENT_TYPE" SET "NAME" = 'committee_event'
+        WHERE "NAME" = 'comitee_event'
+          AND NOT EXISTS (SELECT 1 FROM "EVENT_TYPE" WHERE "NAME" = 'committee_event')
+        """
+    )
+    op.create_index('ROLE_NAME_idx', 'ROLE', ['NAME'], unique=True)
+    op.create_index('EVENT_TYPE_NAME_idx', 'EVENT_TYPE', ['NAME'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('EVENT_TYPE_NAME_idx', table_name='EVENT_TYPE')
+    op.drop_index('ROLE_NAME_idx', table_name='ROLE')
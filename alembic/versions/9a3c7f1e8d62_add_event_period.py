@@ -0,0 +1,54 @@
+"""add event period
+
+Revision ID: 9a3c7f1e8d62
+Revises: 5e91b3d7c2a4
+Create Date: 2026-10-19 20:41:55.382019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3c7f1e8d62'
+down_revision = '5e91b3d7c2a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.add_column('EVENT', sa.Column('PERIOD', postgresql.TSTZRANGE, sa.Computed(
+        'tstzrange("START_DATE", greatest("START_DATE", "END_DATE"), \'[)\')', persisted=True
+    )))
+    op.create_index(
+        'EVENT_TYPE_PERIOD_idx', 'EVENT', ['EVENT_TYPE', 'PERIOD'], postgresql_using='gist',
+        postgresql_include=['ID']
+    )
+    op.add_column('EVENT_TYPE', sa.Column('IS_EXCLUSIVE', sa.Boolean, nullable=False, server_default=sa.false()))
+
+    # Chalet bookings become exclusive, unless some already overlap and must be resolved first
+    bind = op.get_bind()
+    chalet_id = bind.execute(sa.text('SELECT "ID" FROM "EVENT_TYPE" WHERE "NAME" = \'chalet\'')).scalar()
+    if chalet_id is None:
+        return
+    overlapping = bind.execute(sa.text(
+        'SELECT EXISTS (SELECT 1 FROM "EVENT" a JOIN "EVENT" b ON a."ID" < b."ID" AND a."PERIOD" && b."PERIOD" '
+        'WHERE a."EVENT_TYPE" = :id AND b."EVENT_TYPE" = :id)'
+    ), {'id': chalet_id}).scalar()
+    if not overlapping:
+        op.execute(
+            f'ALTER TABLE "EVENT" ADD CONSTRAINT "EVENT_PERIOD_{int(chalet_id)}_excl" '
+            f'EXCLUDE USING gist ("PERIOD" WITH &&) WHERE ("EVENT_TYPE" = {int(chalet_id)})'
+        )
+        op.execute(f'UPDATE "EVENT_TYPE" SET "IS_EXCLUSIVE" = true WHERE "ID" = {int(chalet_id)}')
+
+
+def downgrade() -> None:
+    exclusive_ids = op.get_bind().execute(sa.text('SELECT "ID" FROM "EVENT_TYPE" WHERE "IS_EXCLUSIVE"')).scalars().all()
+    for event_type_id in exclusive_ids:
+        op.execute(f'ALTER TABLE "EVENT" DROP CONSTRAINT IF EXISTS "EVENT_PERIOD_{int(event_type_id)}_excl"')
+    op.drop_column('EVENT_TYPE', 'IS_EXCLUSIVE')
+    op.drop_index('EVENT_TYPE_PERIOD_idx', table_name='EVENT')
+    op.drop_column('EVENT', 'PERIOD')
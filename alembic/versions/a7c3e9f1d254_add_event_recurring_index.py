@@ -0,0 +1,28 @@
+"""add event recurring index
+
+Revision ID: a7c3e9f1d254
+Revises: f2b6d9a4e173
+Create Date: 2026-10-20 10:12:37.218440
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1d254'
+down_revision = 'f2b6d9a4e173'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Created on every partition, CONCURRENTLY is not supported on a partitioned table
+    op.create_index(
+        'EVENT_TYPE_RECURRING_idx', 'EVENT', ['EVENT_TYPE', 'START_DATE'],
+        postgresql_where=sa.text('"RECURRENCE_RULE" IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('EVENT_TYPE_RECURRING_idx', table_name='EVENT')
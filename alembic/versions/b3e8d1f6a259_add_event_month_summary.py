@@ -0,0 +1,56 @@
+"""add event month summary
+
+Revision ID: b3e8d1f6a259
+Revises: d7f2b8a4c6e1
+Create Date: 2026-10-19 23:02:41.176204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8d1f6a259'
+down_revision = 'd7f2b8a4c6e1'
+branch_labels = None
+depends_on = None
+
+# settings.TIMEZONE, months are those of the calendar
+TIMEZONE = 'Europe/Paris'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'EVENT_MONTH_SUMMARY',
+        sa.Column('EVENT_TYPE', sa.Integer, sa.ForeignKey('EVENT_TYPE.ID', ondelete='CASCADE'), primary_key=True),
+        sa.Column('MONTH', sa.Date, primary_key=True),
+        sa.Column('EVENT_COUNT', sa.Integer, nullable=False),
+        sa.Column('BOOKED_SECONDS', sa.BigInteger, nullable=False),
+        sa.Column('UPDATED_AT', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Every month an event spans, it counts in the first one and books the whole seconds it covers of each
+    op.execute(sa.text('''
+        INSERT INTO "EVENT_MONTH_SUMMARY" ("EVENT_TYPE", "MONTH", "EVENT_COUNT", "BOOKED_SECONDS", "UPDATED_AT")
+        SELECT
+            e."EVENT_TYPE",
+            m.month::date,
+            count(*) FILTER (WHERE m.month = date_trunc('month', e."START_DATE" AT TIME ZONE :tz)),
+            sum(floor(extract(epoch FROM greatest(
+                least(greatest(e."START_DATE", e."END_DATE"), (m.month + interval '1 month') AT TIME ZONE :tz)
+                - greatest(e."START_DATE", m.month AT TIME ZONE :tz),
+                interval '0'
+            ))))::bigint,
+            now()
+        FROM "EVENT" e
+        CROSS JOIN LATERAL generate_series(
+            date_trunc('month', e."START_DATE" AT TIME ZONE :tz),
+            date_trunc('month', greatest(e."START_DATE", e."END_DATE" - interval '1 microsecond') AT TIME ZONE :tz),
+            interval '1 month'
+        ) AS m(month)
+        GROUP BY e."EVENT_TYPE", m.month
+    ''').bindparams(tz=TIMEZONE))
+
+
+def downgrade() -> None:
+    op.drop_table('EVENT_MONTH_SUMMARY')
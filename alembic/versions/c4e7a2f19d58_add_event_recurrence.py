@@ -0,0 +1,37 @@
+"""add event recurrence
+
+Revision ID: c4e7a2f19d58
+Revises: 8b2d6e4c1a93
+Create Date: 2026-10-19 18:03:47.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a2f19d58'
+down_revision = '8b2d6e4c1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('EVENT', sa.Column('RECURRENCE_RULE', sa.String(length=1024), nullable=True))
+    op.create_table(
+        'EVENT_OVERRIDE',
+        sa.Column('EVENT_ID', sa.Integer, sa.ForeignKey('EVENT.ID', ondelete='CASCADE'), primary_key=True),
+        sa.Column('ORIGINAL_START', sa.DateTime(timezone=True), primary_key=True),
+        sa.Column('IS_CANCELLED', sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column('TITLE', sa.String(length=1024), nullable=True),
+        sa.Column('DESCRIPTION', sa.String(length=1024), nullable=True),
+        sa.Column('START_DATE', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('END_DATE', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('CREATED_AT', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('UPDATED_AT', sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('EVENT_OVERRIDE')
+    op.drop_column('EVENT', 'RECURRENCE_RULE')
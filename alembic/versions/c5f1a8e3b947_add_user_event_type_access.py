@@ -0,0 +1,104 @@
+"""add user event type access
+
+Revision ID: c5f1a8e3b947
+Revises: e4a9c2d7b815
+Create Date: 2026-10-20 00:31:45.218930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f1a8e3b947'
+down_revision = 'e4a9c2d7b815'
+branch_labels = None
+depends_on = None
+
+ACCESS_LOCK_ID = 0x61636373
+
+
+def upgrade() -> None:
+    op.create_table(
+        'USER_EVENT_TYPE_ACCESS',
+        sa.Column('USER_ID', sa.Integer, sa.ForeignKey('USER.ID', ondelete='CASCADE'), primary_key=True),
+        sa.Column('EVENT_TYPE_ID', sa.Integer, sa.ForeignKey('EVENT_TYPE.ID', ondelete='CASCADE'), primary_key=True),
+        sa.Column('CAN_EDIT', sa.Boolean, nullable=False),
+        sa.Column('CAN_SEE', sa.Boolean, nullable=False),
+        sa.Column('CAN_ADD', sa.Boolean, nullable=False),
+    )
+
+    op.execute(f'''
+        CREATE OR REPLACE FUNCTION "USER_EVENT_TYPE_ACCESS_refresh"(user_ids integer[], event_type_ids integer[])
+        RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock({ACCESS_LOCK_ID});
+            DELETE FROM "USER_EVENT_TYPE_ACCESS"
+            WHERE "USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR "EVENT_TYPE_ID" = ANY(event_type_ids));
+            INSERT INTO "USER_EVENT_TYPE_ACCESS" ("USER_ID", "EVENT_TYPE_ID", "CAN_EDIT", "CAN_SEE", "CAN_ADD")
+            SELECT ur."USER_ID", p."EVENT_TYPE_ID",
+                bool_or(coalesce(p."CAN_EDIT", false)), bool_or(coalesce(p."CAN_SEE", false)),
+                bool_or(coalesce(p."CAN_ADD", false))
+            FROM "USER_ROLE" ur
+            JOIN "ROLE_EVENT_TYPE" p ON p."ROLE_ID" = ur."ROLE_ID"
+            JOIN "USER" u ON u."ID" = ur."USER_ID"
+            JOIN "EVENT_TYPE" t ON t."ID" = p."EVENT_TYPE_ID"
+            WHERE ur."USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR p."EVENT_TYPE_ID" = ANY(event_type_ids))
+            GROUP BY ur."USER_ID", p."EVENT_TYPE_ID"
+            HAVING bool_or(
+                coalesce(p."CAN_EDIT", false) OR coalesce(p."CAN_SEE", false) OR coalesce(p."CAN_ADD", false)
+            );
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE OR REPLACE FUNCTION "USER_ROLE_refresh_access"() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY[OLD."USER_ID"], NULL);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY[NEW."USER_ID"], NULL);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE OR REPLACE FUNCTION "ROLE_EVENT_TYPE_refresh_access"() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(
+                    ARRAY(SELECT "USER_ID" FROM "USER_ROLE" WHERE "ROLE_ID" = OLD."ROLE_ID"), ARRAY[OLD."EVENT_TYPE_ID"]
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(
+                    ARRAY(SELECT "USER_ID" FROM "USER_ROLE" WHERE "ROLE_ID" = NEW."ROLE_ID"), ARRAY[NEW."EVENT_TYPE_ID"]
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER "USER_ROLE_access_trg"
+        AFTER INSERT OR UPDATE OR DELETE ON "USER_ROLE"
+        FOR EACH ROW EXECUTE FUNCTION "USER_ROLE_refresh_access"()
+    ''')
+    op.execute('''
+        CREATE TRIGGER "ROLE_EVENT_TYPE_access_trg"
+        AFTER INSERT OR UPDATE OR DELETE ON "ROLE_EVENT_TYPE"
+        FOR EACH ROW EXECUTE FUNCTION "ROLE_EVENT_TYPE_refresh_access"()
+    ''')
+
+    op.execute('SELECT "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY(SELECT "ID" FROM "USER"), NULL)')
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER "ROLE_EVENT_TYPE_access_trg" ON "ROLE_EVENT_TYPE"')
+    op.execute('DROP TRIGGER "USER_ROLE_access_trg" ON "USER_ROLE"')
+    op.execute('DROP FUNCTION "ROLE_EVENT_TYPE_refresh_access"()')
+    op.execute('DROP FUNCTION "USER_ROLE_refresh_access"()')
+    op.execute('DROP FUNCTION "USER_EVENT_TYPE_ACCESS_refresh"(integer[], integer[])')
+    op.drop_table('USER_EVENT_TYPE_ACCESS')
@@ -0,0 +1,159 @@
+"""partition event by start date
+
+Revision ID: d7f2b8a4c6e1
+Revises: 9a3c7f1e8d62
+Create Date: 2026-10-19 22:13:07.519644
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f2b8a4c6e1'
+down_revision = '9a3c7f1e8d62'
+branch_labels = None
+depends_on = None
+
+YEARS_AHEAD = 2
+EXCLUSIVE_LOCK_ID = 0x65786373
+COLUMNS = (
+    '"ID", "CREATED_BY", "EVENT_TYPE", "TITLE", "DESCRIPTION", "START_DATE", "END_DATE", "RECURRENCE_RULE", '
+    '"CREATED_AT", "UPDATED_AT"'
+)
+
+
+def create_event_table(name: str, **kwargs) -> None:
+    op.create_table(
+        name,
+        sa.Column('ID', sa.Integer, server_default=sa.text('nextval(\'"EVENT_ID_seq"\'::regclass)'), nullable=False),
+        sa.Column('CREATED_BY', sa.Integer, sa.ForeignKey('USER.ID', ondelete='CASCADE'), nullable=False),
+        sa.Column('EVENT_TYPE', sa.Integer, sa.ForeignKey('EVENT_TYPE.ID', ondelete='CASCADE'), nullable=False),
+        sa.Column('TITLE', sa.String(length=1024), nullable=False),
+        sa.Column('DESCRIPTION', sa.String(length=1024), nullable=True),
+        sa.Column('START_DATE', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('END_DATE', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('RECURRENCE_RULE', sa.String(length=1024), nullable=True),
+        sa.Column('SEARCH_VECTOR', postgresql.TSVECTOR, sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(\"TITLE\", '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(\"DESCRIPTION\", '')), 'B')", persisted=True
+        )),
+        sa.Column('PERIOD', postgresql.TSTZRANGE, sa.Computed(
+            'tstzrange("START_DATE", greatest("START_DATE", "END_DATE"), \'[)\')', persisted=True
+        )),
+        sa.Column('CREATED_AT', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('UPDATED_AT', sa.DateTime(timezone=True), nullable=True),
+        **kwargs,
+    )
+
+
+def create_event_indexes() -> None:
+    op.create_index('EVENT_SEARCH_VECTOR_idx', 'EVENT', ['SEARCH_VECTOR'], postgresql_using='gin')
+    op.create_index(
+        'EVENT_TYPE_PERIOD_idx', 'EVENT', ['EVENT_TYPE', 'PERIOD'], postgresql_using='gist',
+        postgresql_include=['ID']
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Exclusion constraints of a partitioned table must include the partition key, a trigger replaces them
+    exclusive_ids = bind.execute(sa.text('SELECT "ID" FROM "EVENT_TYPE" WHERE "IS_EXCLUSIVE"')).scalars().all()
+    for event_type_id in exclusive_ids:
+        op.execute(f'ALTER TABLE "EVENT" DROP CONSTRAINT IF EXISTS "EVENT_PERIOD_{int(event_type_id)}_excl"')
+    op.drop_constraint('EVENT_OVERRIDE_EVENT_ID_fkey', 'EVENT_OVERRIDE', type_='foreignkey')
+
+    op.rename_table('EVENT', 'EVENT_UNPARTITIONED')
+    op.drop_index('EVENT_SEARCH_VECTOR_idx', table_name='EVENT_UNPARTITIONED')
+    op.drop_index('EVENT_TYPE_PERIOD_idx', table_name='EVENT_UNPARTITIONED')
+    op.execute('ALTER TABLE "EVENT_UNPARTITIONED" RENAME CONSTRAINT "EVENT_pkey" TO "EVENT_UNPARTITIONED_pkey"')
+
+    # The primary key must hold the partition key, events are still identified by their id alone
+    create_event_table(
+        'EVENT', sa.PrimaryKeyConstraint('ID', 'START_DATE', name='EVENT_pkey'),
+        postgresql_partition_by='RANGE ("START_DATE")',
+    )
+    op.execute('ALTER SEQUENCE "EVENT_ID_seq" OWNED BY "EVENT"."ID"')
+
+    # One partition per year of the existing events up to the next years, the rest goes to the default one
+    current_year = datetime.datetime.now(tz=datetime.timezone.utc).year
+    first_year = bind.execute(sa.text(
+        'SELECT extract(year FROM min("START_DATE") AT TIME ZONE \'UTC\')::int FROM "EVENT_UNPARTITIONED"'
+    )).scalar() or current_year
+    for year in range(min(first_year, current_year), current_year + YEARS_AHEAD + 1):
+        op.execute(
+            f'CREATE TABLE "EVENT_{year}" PARTITION OF "EVENT" '
+            f'FOR VALUES FROM (\'{year}-01-01 00:00:00+00\') TO (\'{year + 1}-01-01 00:00:00+00\')'
+        )
+    op.execute('CREATE TABLE "EVENT_DEFAULT" PARTITION OF "EVENT" DEFAULT')
+
+    op.execute(f'INSERT INTO "EVENT" ({COLUMNS}) SELECT {COLUMNS} FROM "EVENT_UNPARTITIONED"')
+    op.drop_table('EVENT_UNPARTITIONED')
+    create_event_indexes()
+
+    # Foreign keys to a partitioned table must reference its whole primary key
+    op.add_column('EVENT_OVERRIDE', sa.Column('EVENT_START_DATE', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        'UPDATE "EVENT_OVERRIDE" o SET "EVENT_START_DATE" = e."START_DATE" FROM "EVENT" e WHERE e."ID" = o."EVENT_ID"'
+    )
+    op.alter_column('EVENT_OVERRIDE', 'EVENT_START_DATE', nullable=False)
+    op.create_foreign_key(
+        'EVENT_OVERRIDE_EVENT_fkey', 'EVENT_OVERRIDE', 'EVENT', ['EVENT_ID', 'EVENT_START_DATE'],
+        ['ID', 'START_DATE'], ondelete='CASCADE', onupdate='CASCADE'
+    )
+
+    op.execute(f'''
+        CREATE OR REPLACE FUNCTION "EVENT_check_exclusive"() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM "EVENT_TYPE" WHERE "ID" = NEW."EVENT_TYPE" AND "IS_EXCLUSIVE") THEN
+                PERFORM pg_advisory_xact_lock({EXCLUSIVE_LOCK_ID}, NEW."EVENT_TYPE");
+                IF EXISTS (
+                    SELECT 1 FROM "EVENT"
+                    WHERE "EVENT_TYPE" = NEW."EVENT_TYPE" AND "ID" <> NEW."ID" AND "PERIOD" && NEW."PERIOD"
+                ) THEN
+                    RAISE EXCEPTION 'Event overlaps another event of its exclusive event type'
+                        USING ERRCODE = 'exclusion_violation';
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER "EVENT_exclusive_trg"
+        AFTER INSERT OR UPDATE OF "EVENT_TYPE", "START_DATE", "END_DATE" ON "EVENT"
+        FOR EACH ROW EXECUTE FUNCTION "EVENT_check_exclusive"()
+    ''')
+
+
+def downgrade() -> None:
+    # Partitions detached by the archival are not brought back
+    op.execute('DROP TRIGGER "EVENT_exclusive_trg" ON "EVENT"')
+    op.execute('DROP FUNCTION "EVENT_check_exclusive"()')
+    op.drop_constraint('EVENT_OVERRIDE_EVENT_fkey', 'EVENT_OVERRIDE', type_='foreignkey')
+    op.drop_column('EVENT_OVERRIDE', 'EVENT_START_DATE')
+
+    op.rename_table('EVENT', 'EVENT_PARTITIONED')
+    op.drop_index('EVENT_SEARCH_VECTOR_idx', table_name='EVENT_PARTITIONED')
+    op.drop_index('EVENT_TYPE_PERIOD_idx', table_name='EVENT_PARTITIONED')
+    op.execute('ALTER TABLE "EVENT_PARTITIONED" RENAME CONSTRAINT "EVENT_pkey" TO "EVENT_PARTITIONED_pkey"')
+
+    create_event_table('EVENT', sa.PrimaryKeyConstraint('ID', name='EVENT_pkey'))
+    op.execute('ALTER SEQUENCE "EVENT_ID_seq" OWNED BY "EVENT"."ID"')
+    op.execute(f'INSERT INTO "EVENT" ({COLUMNS}) SELECT {COLUMNS} FROM "EVENT_PARTITIONED"')
+    op.drop_table('EVENT_PARTITIONED')
+    create_event_indexes()
+
+    op.create_foreign_key(
+        'EVENT_OVERRIDE_EVENT_ID_fkey', 'EVENT_OVERRIDE', 'EVENT', ['EVENT_ID'], ['ID'], ondelete='CASCADE'
+    )
+    exclusive_ids = op.get_bind().execute(sa.text('SELECT "ID" FROM "EVENT_TYPE" WHERE "IS_EXCLUSIVE"')).scalars().all()
+    for event_type_id in exclusive_ids:
+        op.execute(
+            f'ALTER TABLE "EVENT" ADD CONSTRAINT "EVENT_PERIOD_{int(event_type_id)}_excl" '
+            f'EXCLUDE USING gist ("PERIOD" WITH &&) WHERE ("EVENT_TYPE" = {int(event_type_id)})'
+        )
@@ -0,0 +1,27 @@
+"""add event upcoming and creator indexes
+
+Revision ID: e4a9c2d7b815
+Revises: b3e8d1f6a259
+Create Date: 2026-10-19 23:48:12.604381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c2d7b815'
+down_revision = 'b3e8d1f6a259'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Created on every partition, CONCURRENTLY is not supported on a partitioned table
+    op.create_index('EVENT_TYPE_START_DATE_idx', 'EVENT', ['EVENT_TYPE', 'START_DATE', 'ID'])
+    op.create_index('EVENT_CREATED_BY_START_DATE_idx', 'EVENT', ['CREATED_BY', 'START_DATE', 'ID'])
+
+
+def downgrade() -> None:
+    op.drop_index('EVENT_CREATED_BY_START_DATE_idx', table_name='EVENT')
+    op.drop_index('EVENT_TYPE_START_DATE_idx', table_name='EVENT')
@@ -0,0 +1,100 @@
+"""store permissions as bitmask
+
+Revision ID: f2b6d9a4e173
+Revises: c5f1a8e3b947
+Create Date: 2026-10-20 01:12:38.740215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d9a4e173'
+down_revision = 'c5f1a8e3b947'
+branch_labels = None
+depends_on = None
+
+ACCESS_LOCK_ID = 0x61636373
+# Bits of app.models.db.role_event_type.Permission
+EDIT, SEE, ADD = 1, 2, 4
+
+
+def create_refresh_function(columns: str, values: str, having: str) -> None:
+    op.execute(f'''
+        CREATE OR REPLACE FUNCTION "USER_EVENT_TYPE_ACCESS_refresh"(user_ids integer[], event_type_ids integer[])
+        RETURNS void AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock({ACCESS_LOCK_ID});
+            DELETE FROM "USER_EVENT_TYPE_ACCESS"
+            WHERE "USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR "EVENT_TYPE_ID" = ANY(event_type_ids));
+            INSERT INTO "USER_EVENT_TYPE_ACCESS" ("USER_ID", "EVENT_TYPE_ID", {columns})
+            SELECT ur."USER_ID", p."EVENT_TYPE_ID", {values}
+            FROM "USER_ROLE" ur
+            JOIN "ROLE_EVENT_TYPE" p ON p."ROLE_ID" = ur."ROLE_ID"
+            JOIN "USER" u ON u."ID" = ur."USER_ID"
+            JOIN "EVENT_TYPE" t ON t."ID" = p."EVENT_TYPE_ID"
+            WHERE ur."USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR p."EVENT_TYPE_ID" = ANY(event_type_ids))
+            GROUP BY ur."USER_ID", p."EVENT_TYPE_ID"
+            HAVING {having};
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+
+
+def upgrade() -> None:
+    # Recomputed once at the end rather than row by row
+    op.execute('ALTER TABLE "USER_ROLE" DISABLE TRIGGER "USER_ROLE_access_trg"')
+    op.execute('ALTER TABLE "ROLE_EVENT_TYPE" DISABLE TRIGGER "ROLE_EVENT_TYPE_access_trg"')
+
+    op.add_column('ROLE_EVENT_TYPE', sa.Column('PERMISSIONS', sa.Integer, nullable=False, server_default='0'))
+    op.execute(f'''
+        UPDATE "ROLE_EVENT_TYPE" SET "PERMISSIONS" =
+            CASE WHEN "CAN_EDIT" THEN {EDIT} ELSE 0 END
+            | CASE WHEN "CAN_SEE" THEN {SEE} ELSE 0 END
+            | CASE WHEN "CAN_ADD" THEN {ADD} ELSE 0 END
+    ''')
+    op.alter_column('ROLE_EVENT_TYPE', 'PERMISSIONS', server_default=None)
+    for column in ('CAN_EDIT', 'CAN_SEE', 'CAN_ADD'):
+        op.drop_column('ROLE_EVENT_TYPE', column)
+
+    op.execute('DELETE FROM "USER_EVENT_TYPE_ACCESS"')
+    for column in ('CAN_EDIT', 'CAN_SEE', 'CAN_ADD'):
+        op.drop_column('USER_EVENT_TYPE_ACCESS', column)
+    op.add_column('USER_EVENT_TYPE_ACCESS', sa.Column('PERMISSIONS', sa.Integer, nullable=False))
+
+    create_refresh_function(
+        columns='"PERMISSIONS"', values='bit_or(p."PERMISSIONS")', having='bit_or(p."PERMISSIONS") <> 0'
+    )
+    op.execute('SELECT "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY(SELECT "ID" FROM "USER"), NULL)')
+
+    op.execute('ALTER TABLE "USER_ROLE" ENABLE TRIGGER "USER_ROLE_access_trg"')
+    op.execute('ALTER TABLE "ROLE_EVENT_TYPE" ENABLE TRIGGER "ROLE_EVENT_TYPE_access_trg"')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE "USER_ROLE" DISABLE TRIGGER "USER_ROLE_access_trg"')
+    op.execute('ALTER TABLE "ROLE_EVENT_TYPE" DISABLE TRIGGER "ROLE_EVENT_TYPE_access_trg"')
+
+    for column, bit in (('CAN_EDIT', EDIT), ('CAN_SEE', SEE), ('CAN_ADD', ADD)):
+        op.add_column('ROLE_EVENT_TYPE', sa.Column(column, sa.Boolean, nullable=True))
+        op.execute(f'UPDATE "ROLE_EVENT_TYPE" SET "{column}" = ("PERMISSIONS" & {bit}) <> 0')
+    op.drop_column('ROLE_EVENT_TYPE', 'PERMISSIONS')
+
+    op.execute('DELETE FROM "USER_EVENT_TYPE_ACCESS"')
+    op.drop_column('USER_EVENT_TYPE_ACCESS', 'PERMISSIONS')
+    for column in ('CAN_EDIT', 'CAN_SEE', 'CAN_ADD'):
+        op.add_column('USER_EVENT_TYPE_ACCESS', sa.Column(column, sa.Boolean, nullable=False))
+
+    create_refresh_function(
+        columns='"CAN_EDIT", "CAN_SEE", "CAN_ADD"',
+        values=(
+            'bool_or(coalesce(p."CAN_EDIT", false)), bool_or(coalesce(p."CAN_SEE", false)), '
+            'bool_or(coalesce(p."CAN_ADD", false))'
+        ),
+        having='bool_or(coalesce(p."CAN_EDIT", false) OR coalesce(p."CAN_SEE", false) OR coalesce(p."CAN_ADD", false))',
+    )
+    op.execute('SELECT "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY(SELECT "ID" FROM "USER"), NULL)')
+
+    op.execute('ALTER TABLE "USER_ROLE" ENABLE TRIGGER "USER_ROLE_access_trg"')
+    op.execute('ALTER TABLE "ROLE_EVENT_TYPE" ENABLE TRIGGER "ROLE_EVENT_TYPE_access_trg"')
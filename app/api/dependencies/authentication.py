@@ -1,9 +1,11 @@
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status, Request
 
+from app.cache.user import user_cache
 from app.security.authorization.jwt_generator import jwt_generator
 from app.models.db.user import User
 from app.repositories.user import UserRepository
+from app.utilities.exceptions.database import EntityDoesNotExist
 from app.utilities.exceptions.http.exc_401 import http_exc_401_unauthorized_request
 from app.utilities.exceptions.http.exc_404 import http_404_exc_username_not_found_request
 
@@ -31,7 +33,15 @@ async def get_current_user(
     except Exception:
         raise await http_exc_401_unauthorized_request()
 
-    db_user = await user_repo.get_user_by_username(username)
+    is_cached, db_user = user_cache.get(username)
+    if not is_cached:
+        generation = user_cache.generation
+        try:
+            db_user = await user_repo.get_user_by_username(username)
+        except EntityDoesNotExist:
+            db_user = None
+        user_cache.set(username, db_user, generation=generation)
+
     if db_user is None:
         raise await http_404_exc_username_not_found_request(username=username)
 
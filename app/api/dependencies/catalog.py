@@ -0,0 +1,11 @@
+import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.api.dependencies.session import get_async_session
+from app.cache.catalog import catalog_cache, CatalogSnapshot
+
+
+async def get_catalog_snapshot(
+        async_session: SQLAlchemyAsyncSession = fastapi.Depends(get_async_session),
+) -> CatalogSnapshot:
+    return await catalog_cache.get(async_session=async_session)
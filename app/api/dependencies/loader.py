@@ -0,0 +1,10 @@
+import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.api.dependencies.session import get_async_session
+from app.repositories.loaders import Loaders
+
+
+def get_loaders(async_session: SQLAlchemyAsyncSession = fastapi.Depends(get_async_session)) -> Loaders:
+    # Created once per request, as FastAPI caches dependencies for the duration of a request
+    return Loaders(async_session=async_session)
@@ -1,22 +1,34 @@
 import fastapi
 
+from app.api.dependencies.catalog import get_catalog_snapshot
 from app.api.dependencies.repository import get_repository
 from app.api.dependencies.role import is_user_in_role
 from app.api.dependencies.service import get_service
+from app.cache.catalog import CatalogSnapshot
+from app.cache.metrics import metrics_registry
 from app.models.schemas.event_operation import EventOperation
+from app.models.schemas.event_type import EventTypeInExclusiveUpdate, EventTypeInResponse
 from app.models.schemas.role import RoleInResponse, RoleInUpdate, RoleInCreate
-from app.models.schemas.role_event_type import RoleEventTypeInResponse, RoleEventTypeInCreate
-from app.models.schemas.user import UserInResponse, UserInUpdate, UserInCreate
-from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove
+from app.models.schemas.role_event_type import RoleEventTypeInResponse, RoleEventTypeInCreate, RoleEventTypeInMatrix
+from app.models.schemas.user import UserInImportResult, UserInResponse, UserInUpdate, UserInCreate
+from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove, UserRolesInBatchAssign, \
+    UserRolesInBatchAssignResult
+from app.repositories.event_type import EventTypeRepository
 from app.repositories.role import RoleRepository
 from app.repositories.role_event_type import RoleEventTypeRepository
 from app.repositories.user import UserRepository
 from app.services.notification import NotificationService
-from app.utilities.exceptions.database import EntityDoesNotExist, EntityAlreadyExists
+from app.services.user_import import parse_user_import, UserImportService
+from app.utilities.exceptions.database import EntityConflict, EntityDoesNotExist, EntityAlreadyExists
 from app.utilities.exceptions.http.exc_400 import http_400_exc_bad_username_request
 from app.utilities.exceptions.http.exc_404 import http_404_exc_user_id_not_found_request, \
-    http_404_exc_user_role_not_found_request, http_404_exc_user_role_relation_not_found_request
+    http_404_exc_user_role_not_found_request, http_404_exc_user_role_relation_not_found_request, \
+    http_404_exc_ids_not_found_request, http_404_exc_role_id_not_found_request, \
+    http_404_exc_event_type_id_not_found_request
+from app.utilities.exceptions.http.exc_409 import http_409_exc_exclusive_event_type_request
+from app.utilities.exceptions.http.exc_422 import http_422_exc_invalid_import_file_request
 from app.utilities.exceptions.http.exc_500 import http_500_exc_internal_server_error
+from app.utilities.exceptions.upload import InvalidImportFile
 
 router = fastapi.APIRouter(prefix="/admin", tags=["admin"], dependencies=[fastapi.Depends(is_user_in_role(role="admin"))])
 
@@ -112,6 +124,35 @@ async def create_user(
     return response
 
 
+@router.post(
+    path="/import/users",
+    response_model=list[UserInImportResult],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def import_users(
+        file: fastapi.UploadFile = fastapi.File(...),
+        import_service: UserImportService = fastapi.Depends(get_service(service_type=UserImportService)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> list[UserInImportResult]:
+    """Create users, with their roles, from a CSV or JSON file"""
+    try:
+        records = parse_user_import(
+            content=await file.read(), filename=file.filename, content_type=file.content_type
+        )
+    except InvalidImportFile as e:
+        raise await http_422_exc_invalid_import_file_request(reason=str(e))
+    finally:
+        await file.close()
+
+    results = await import_service.import_users(records=records)
+
+    new_users = [result.user for result in results if result.user is not None]
+    if new_users:
+        await notif_service.send_user_batch_notification(users=new_users, event_operation=EventOperation.USER_IMPORT)
+
+    return results
+
+
 @router.put(
     path="/update/user/{user_id}",
     response_model=UserInResponse,
@@ -214,6 +255,30 @@ async def assign_role_to_user(
     return user_role
 
 
+@router.post(
+    path="/users/assign/roles",
+    response_model=UserRolesInBatchAssignResult,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def assign_roles_to_users(
+        user_roles_assign: UserRolesInBatchAssign,
+        user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> UserRolesInBatchAssignResult:
+    """Assign every given role to every given user, unknown users and roles are reported and skipped"""
+    result = await user_repo.assign_roles_to_users(
+        user_ids=user_roles_assign.user_ids, role_ids=user_roles_assign.role_ids
+    )
+
+    if result.assigned:
+        await notif_service.send_user_role_batch_notification(
+            user_roles=result,
+            event_operation=EventOperation.USER_ROLE_BATCH_ASSIGN
+        )
+
+    return result
+
+
 @router.post(
     path="/user/{user_id}/remove/role/{role_id}",
     response_model=UserRoleInRemove,
@@ -338,3 +403,71 @@ async def create_permission(
     )
 
     return response
+
+
+@router.put(
+    path="/roles/{role_id}/permissions",
+    response_model=list[RoleEventTypeInResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def replace_permissions(
+        role_id: int,
+        permissions: list[RoleEventTypeInMatrix] = fastapi.Body(...),
+        snapshot: CatalogSnapshot = fastapi.Depends(get_catalog_snapshot),
+        role_event_type_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> list[RoleEventTypeInResponse]:
+    """Replace the permissions of a role on all event types, the event types left out lose their permissions"""
+    if role_id not in snapshot.roles_by_id:
+        raise await http_404_exc_role_id_not_found_request(_id=role_id)
+
+    unknown_event_type_ids = sorted({
+        permission.event_type_id for permission in permissions
+        if permission.event_type_id not in snapshot.event_types_by_id
+    })
+    if unknown_event_type_ids:
+        raise await http_404_exc_ids_not_found_request(_object="event type", ids=unknown_event_type_ids)
+
+    db_permissions = await role_event_type_repo.replace_permissions_of_role(role_id=role_id, permissions=permissions)
+
+    response = [RoleEventTypeInResponse.from_orm(db_permission) for db_permission in db_permissions]
+
+    await notif_service.send_permission_batch_notification(
+        permissions=response,
+        event_operation=EventOperation.PERMISSION_MATRIX_REPLACE
+    )
+
+    return response
+
+
+@router.put(
+    path="/event_types/{event_type_id}/exclusive",
+    response_model=EventTypeInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def set_event_type_exclusive(
+        event_type_id: int,
+        exclusive_update: EventTypeInExclusiveUpdate,
+        event_type_repo: EventTypeRepository = fastapi.Depends(get_repository(repo_type=EventTypeRepository)),
+) -> EventTypeInResponse:
+    """Forbid or allow overlapping events of an event type, such as double bookings of the chalet"""
+    try:
+        db_event_type = await event_type_repo.set_exclusive_by_id(
+            event_type_id=event_type_id, is_exclusive=exclusive_update.is_exclusive
+        )
+    except EntityDoesNotExist:
+        raise await http_404_exc_event_type_id_not_found_request(_id=event_type_id)
+    except EntityConflict:
+        raise await http_409_exc_exclusive_event_type_request(event_type_id=event_type_id)
+
+    return EventTypeInResponse.from_orm(db_event_type)
+
+
+@router.get(
+    path="/cache/stats",
+    response_model=dict[str, dict[str, float]],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_cache_stats() -> dict[str, dict[str, float]]:
+    """Get hit rates and database queries saved per request of the caches"""
+    return metrics_registry.as_dict()
@@ -1,14 +1,47 @@
+import os
+import stat
+
 import fastapi
 from fastapi import UploadFile
+from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.dependencies.authentication import get_current_user
 from app.api.dependencies.repository import get_repository
+from app.config.manager import settings
 from app.models.db.user import User
 from app.repositories.assets import AssetsRepository
 from app.repositories.user import UserRepository
+from app.storage.backends.factory import storage_backend
+from app.storage.blobs import BLOBS_DIRECTORY
+from app.storage.files import (
+    asset_etag_cache,
+    AssetFileResponse,
+    etag_matches,
+    parse_range,
+    resolve_asset_path,
+)
+from app.storage.uploads import IMAGE_CONTENT_TYPES
+from app.utilities.exceptions.assets import AssetNotFound, RangeNotSatisfiable
+from app.utilities.exceptions.http.exc_404 import http_404_exc_asset_not_found_request
+from app.utilities.exceptions.http.exc_413 import http_413_exc_upload_too_large_request
+from app.utilities.exceptions.http.exc_415 import http_415_exc_unsupported_media_type_request
+from app.utilities.exceptions.http.exc_416 import http_416_exc_range_not_satisfiable_request
+from app.utilities.exceptions.upload import UnsupportedMediaType, UploadTooLarge
 
 router = fastapi.APIRouter(prefix="/assets", tags=["assets"])
 
+# Blobs and versioned URLs never change content, other files are revalidated with their ETag on every use
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+# Shortest prefix of the content hash accepted as the version of a URL
+MIN_VERSION_LENGTH = 16
+
+
+def is_current_version(version: str | None, etag: str) -> bool:
+    """Whether the `v` query of a URL names the content served, a stale or made up version must not be pinned"""
+    return version is not None and len(version) >= MIN_VERSION_LENGTH and etag.strip('"').startswith(version)
+
 
 @router.post(
     path="/upload/profile_pic",
@@ -16,28 +49,93 @@ router = fastapi.APIRouter(prefix="/assets", tags=["assets"])
     status_code=fastapi.status.HTTP_201_CREATED,
 )
 async def upload_profile_pic(
+        request: fastapi.Request,
         assets_repo: AssetsRepository = fastapi.Depends(get_repository(repo_type=AssetsRepository)),
         user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
         current_user: User = fastapi.Depends(get_current_user),
         file: UploadFile = fastapi.File(...),
 ) -> str:
     """Upload new profile picture for current user"""
-    allowed_file_types = ["image/jpeg", "image/png"]
-    if file.content_type not in allowed_file_types:
-        raise fastapi.HTTPException(
-            status_code=415,
-            detail=f"Allowed types: {allowed_file_types}",
-        )
     try:
-        file_path = await assets_repo.upload_profile_pic(current_user.id, file)
-    except ValueError as ve:
-        raise fastapi.HTTPException(status_code=400, detail=str(ve))
+        key = await assets_repo.upload_profile_pic(current_user.id, file)
+    except UploadTooLarge:
+        raise await http_413_exc_upload_too_large_request(max_bytes=settings.PROFILE_PIC_MAX_BYTES)
+    except UnsupportedMediaType:
+        raise await http_415_exc_unsupported_media_type_request(allowed_types=list(IMAGE_CONTENT_TYPES.values()))
     except IOError as ioe:
         raise fastapi.HTTPException(status_code=500, detail=str(ioe))
 
-    updated_user = await user_repo.update_user_profile_pic(user_id=current_user.id, profile_pic=file_path)
+    # Addressed by content hash, the URL changes with every new picture, so clients can cache it forever
+    file_url = str(request.app.url_path_for("get_asset_file", path=key))
+
+    updated_user = await user_repo.update_user_profile_pic(user_id=current_user.id, profile_pic=file_url)
 
     if not updated_user:
         raise fastapi.HTTPException(status_code=500, detail="Failed to update user profile pic")
 
-    return file_path
+    return file_url
+
+
+@router.get(
+    path="/files/{path:path}",
+    response_class=AssetFileResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+    name="get_asset_file",
+)
+async def get_asset_file(path: str, request: fastapi.Request) -> fastapi.Response:
+    """Get an asset file"""
+    try:
+        file_path = resolve_asset_path(root=settings.ASSETS_PATH, relative_path=path)
+    except AssetNotFound:
+        raise await http_404_exc_asset_not_found_request(path=path)
+
+    # Object storage serves the file itself, the redirect is cached as long as its presigned URL stays the same
+    download = await storage_backend.download_url(key=path)
+    if download is not None:
+        url, max_age = download
+        return RedirectResponse(url=url, headers={"cache-control": f"private, max-age={max_age}"})
+
+    try:
+        file_stat = await run_in_threadpool(os.stat, file_path)
+    except OSError:
+        raise await http_404_exc_asset_not_found_request(path=path)
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise await http_404_exc_asset_not_found_request(path=path)
+
+    etag = await asset_etag_cache.get(path=file_path, stat=file_stat)
+    is_immutable = path.startswith(f"{BLOBS_DIRECTORY}/") or is_current_version(
+        version=request.query_params.get("v"), etag=etag
+    )
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        "cache-control": IMMUTABLE_CACHE_CONTROL if is_immutable else REVALIDATE_CACHE_CONTROL,
+    }
+
+    if etag_matches(if_none_match=request.headers.get("if-none-match"), etag=etag):
+        return fastapi.Response(status_code=fastapi.status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if request.headers.get("if-range", etag) != etag:
+        # The client holds another version, partial content of this one would corrupt it
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header=range_header, size=file_stat.st_size)
+    except RangeNotSatisfiable:
+        raise await http_416_exc_range_not_satisfiable_request(size=file_stat.st_size)
+
+    if byte_range is None:
+        return AssetFileResponse(path=file_path, offset=0, count=file_stat.st_size, headers=headers)
+
+    offset, count = byte_range
+    headers["content-range"] = f"bytes {offset}-{offset + count - 1}/{file_stat.st_size}"
+
+    return AssetFileResponse(
+        path=file_path,
+        offset=offset,
+        count=count,
+        status_code=fastapi.status.HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+    )
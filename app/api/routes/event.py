@@ -1,20 +1,66 @@
+import asyncio
+import datetime
+import typing
+
 import fastapi
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
 
+from app.api.dependencies.catalog import get_catalog_snapshot
+from app.api.dependencies.loader import get_loaders
 from app.api.dependencies.repository import get_repository
 from app.api.dependencies.service import get_service
-from app.models.schemas.event import EventInCreate, EventInResponse, EventInUpdate
+from app.api.dependencies.session import get_async_session
+from app.cache.calendar import calendar_cache
+from app.cache.catalog import CatalogSnapshot
+from app.cache.intervals import interval_index
+from app.cache.occurrences import occurrence_cache
+from app.cache.single_flight import read_single_flight, SingleFlight
+from app.database.database import async_db
+from app.config.manager import settings
+from app.models.schemas.event import (
+    EventInBatchResult,
+    EventInBatchUpdate,
+    EventInCreate,
+    EventInDetailedResponse,
+    EventInResponse,
+    EventInSearchResponse,
+    EventInUpdate,
+    EventOccurrenceInResponse,
+    EventOverrideInResponse,
+    EventOverrideInUpsert,
+    EventsInBatchRead,
+    EventsInSearch,
+    EventTypeAvailability,
+    EventTypeMonthSummary,
+)
 from app.models.schemas.event_operation import EventOperation
 from app.models.schemas.event_type import EventTypeInResponse
+from app.models.schemas.user import UserInResponse
 from app.repositories.event import EventRepository
+from app.repositories.event_summary import EventSummaryRepository
+from app.repositories.loaders import Loaders
 from app.models.db.user import User
 from app.api.dependencies.authentication import get_current_user
-from app.repositories.event_type import EventTypeRepository
 from app.repositories.role_event_type import RoleEventTypeRepository
-from app.repositories.user import UserRepository
 from app.services.notification import NotificationService
-from app.utilities.authorization.permissions import check_event_type_permission
-from app.utilities.exceptions.database import EntityDoesNotExist
-from app.utilities.exceptions.http.exc_404 import http_404_exc_event_id_not_found_request
+from app.utilities.authorization.permissions import check_event_type_permission, get_permitted_event_types
+from app.utilities.exceptions.database import EntityConflict, EntityDoesNotExist
+from app.utilities.exceptions.http.exc_404 import (
+    http_404_exc_event_id_not_found_request,
+    http_404_exc_override_not_found_request,
+)
+from app.utilities.exceptions.http.exc_409 import http_409_exc_booking_conflict_request
+from app.utilities.exceptions.http.exc_422 import (
+    http_422_exc_invalid_month_range_request,
+    http_422_exc_invalid_window_request,
+    http_422_exc_not_an_occurrence_request,
+)
+from app.utilities.formatters.datetime_formatter import convert_to_utc
+from app.utilities.formatters.response_formatter import serialize_response
+from app.utilities.recurrence.expansion import expand_event, is_occurrence, next_occurrence_start
+from app.utilities.scheduling.availability import find_availability
+from app.utilities.scheduling.months import month_bounds, month_span, months_between
+from app.utilities.messages.exc_details import http_403_permission_denied_details, http_404_id_details
 
 router = fastapi.APIRouter(prefix="/events", tags=["events"])
 
@@ -25,13 +71,19 @@ router = fastapi.APIRouter(prefix="/events", tags=["events"])
     status_code=fastapi.status.HTTP_200_OK,
     dependencies=[fastapi.Depends(get_current_user)]
 )
-async def get_events(
-        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository))
-) -> list[EventInResponse]:
+async def get_events(request: fastapi.Request) -> fastapi.Response:
     """Get all events"""
-    db_events = await event_repo.get_events()
+    async def load_events() -> bytes:
+        # Shared by all coalesced requests, so it must not use the session of a single request
+        async with async_db.get_session() as async_session:
+            db_events = await EventRepository(async_session=async_session).get_events()
+            return serialize_response([EventInResponse.from_orm(event) for event in db_events])
+
+    # Every authenticated user can see all events, so they share one visibility scope
+    key = SingleFlight.request_key(request=request, scope="all")
+    body = await read_single_flight.do(key=key, fn=load_events)
 
-    return [EventInResponse.from_orm(event) for event in db_events]
+    return fastapi.Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -61,26 +113,287 @@ async def get_event(
 )
 async def get_events_for_user(
         current_user: User = fastapi.Depends(get_current_user),
-        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository))
-) -> list[EventInResponse]:
+) -> fastapi.Response:
     """Get all events"""
-    db_events = await event_repo.get_events_for_user(user_id=current_user.id)
-    db_event_list = list()
-    for db_event in db_events:
-        event = EventInResponse(
-            id=db_event.id,
-            created_by=db_event.created_by,
-            event_type=db_event.event_type,
-            title=db_event.title,
-            description=db_event.description,
-            start_date=db_event.start_date,
-            end_date=db_event.end_date,
-            created_at=db_event.created_at,
-            updated_at=db_event.updated_at,
+    async def load_calendar() -> tuple[typing.Sequence[int], bytes]:
+        # May refresh in the background after the response is sent, so it must not use the request session
+        async with async_db.get_session() as async_session:
+            event_repo = EventRepository(async_session=async_session)
+            event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+            db_events = await event_repo.get_events_by_event_type_ids(event_type_ids)
+            return event_type_ids, serialize_response([EventInResponse.from_orm(event) for event in db_events])
+
+    body = await calendar_cache.get(user_id=current_user.id, load=load_calendar)
+
+    return fastapi.Response(content=body, media_type="application/json")
+
+
+@router.get(
+    path="/occurrences",
+    response_model=list[EventOccurrenceInResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_occurrences_for_user(
+        start: datetime.datetime,
+        end: datetime.datetime,
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+) -> fastapi.Response:
+    """
+    Get the occurrences of the events visible to the user between `start` and `end`.
+
+    Recurring events are expanded for this window only, with their cancelled and modified occurrences applied.
+    """
+    window_start, window_end = convert_to_utc(start), convert_to_utc(end)
+    if window_end <= window_start or window_end - window_start > datetime.timedelta(
+            days=settings.OCCURRENCE_WINDOW_MAX_DAYS
+    ):
+        raise await http_422_exc_invalid_window_request(max_days=settings.OCCURRENCE_WINDOW_MAX_DAYS)
+
+    event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+
+    async def load_occurrences() -> bytes:
+        # Shared by all coalesced requests, so it must not use the session of a single request
+        async with async_db.get_session() as async_session:
+            window_repo = EventRepository(async_session=async_session)
+            event_ids = await interval_index.overlapping(
+                async_session=async_session, event_type_ids=event_type_ids, window_start=window_start,
+                window_end=window_end,
+            )
+            db_events = await window_repo.get_events_by_ids(event_ids) if event_ids else []
+            recurring_ids = [db_event.id for db_event in db_events if db_event.recurrence_rule]
+            db_overrides = await window_repo.get_overrides_by_event_ids(recurring_ids) if recurring_ids else []
+
+        overrides: dict[int, list] = {}
+        for db_override in db_overrides:
+            overrides.setdefault(db_override.event_id, []).append(db_override)
+
+        occurrences = [
+            occurrence
+            for db_event in db_events
+            for occurrence in expand_event(
+                event=db_event,
+                overrides=overrides.get(db_event.id, []),
+                window_start=window_start,
+                window_end=window_end,
+            )
+        ]
+        occurrences.sort(key=lambda occurrence: (occurrence.start_date, occurrence.event_id))
+        return serialize_response(occurrences)
+
+    body = await occurrence_cache.get(
+        event_type_ids=event_type_ids, window_start=window_start, window_end=window_end, load=load_occurrences
+    )
+
+    return fastapi.Response(content=body, media_type="application/json")
+
+
+@router.get(
+    path="/window",
+    response_model=list[EventInResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_events_in_window(
+        start: datetime.datetime,
+        end: datetime.datetime,
+        limit: int = fastapi.Query(50, ge=1, le=settings.EVENT_PAGE_MAX_LIMIT),
+        offset: int = fastapi.Query(0, ge=0),
+        current_user: User = fastapi.Depends(get_current_user),
+        async_session: SQLAlchemyAsyncSession = fastapi.Depends(get_async_session),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+) -> list[EventInResponse]:
+    """
+    Get a page of the events visible to the user overlapping `start` to `end`, by start.
+
+    Recurring events are listed once, see `/events/occurrences` for their occurrences.
+    """
+    window_start, window_end = convert_to_utc(start), convert_to_utc(end)
+    if window_end <= window_start or window_end - window_start > datetime.timedelta(
+            days=settings.EVENT_WINDOW_MAX_DAYS
+    ):
+        raise await http_422_exc_invalid_window_request(max_days=settings.EVENT_WINDOW_MAX_DAYS)
+
+    event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+    event_ids = await interval_index.overlapping(
+        async_session=async_session, event_type_ids=event_type_ids, window_start=window_start,
+        window_end=window_end,
+    )
+    page_ids = event_ids[offset:offset + limit]
+
+    # Only the rows of the page are read
+    db_events = {db_event.id: db_event for db_event in await event_repo.get_events_by_ids(page_ids)}
+
+    return [EventInResponse.from_orm(db_events[event_id]) for event_id in page_ids if event_id in db_events]
+
+
+@router.get(
+    path="/upcoming",
+    response_model=list[EventInResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_upcoming_events(
+        limit: int = fastapi.Query(20, ge=1, le=settings.EVENT_PAGE_MAX_LIMIT),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+) -> list[EventInResponse]:
+    """
+    Get the next events visible to the user, by start.
+
+    Recurring events are listed once, by their next occurrence, see `/events/occurrences` for the following ones.
+    """
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+    event_ids = await event_repo.get_upcoming_event_ids(event_type_ids=event_type_ids, after=now, limit=limit)
+    db_events = {db_event.id: db_event for db_event in await event_repo.get_events_by_ids(event_ids)}
+    upcoming = [
+        (db_events[event_id].start_date, db_events[event_id]) for event_id in event_ids if event_id in db_events
+    ]
+
+    # Series that began before now are out of the range of the index, they are merged by their next occurrence
+    for db_event in await event_repo.get_recurring_events_started_before(event_type_ids=event_type_ids, before=now):
+        next_start = next_occurrence_start(event=db_event, after=now)
+        if next_start is not None:
+            upcoming.append((next_start, db_event))
+    upcoming.sort(key=lambda item: item[0])
+
+    return [EventInResponse.from_orm(db_event) for _, db_event in upcoming[:limit]]
+
+
+@router.get(
+    path="/mine",
+    response_model=list[EventInResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_my_events(
+        limit: int = fastapi.Query(50, ge=1, le=settings.EVENT_PAGE_MAX_LIMIT),
+        offset: int = fastapi.Query(0, ge=0),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+) -> list[EventInResponse]:
+    """Get a page of the events created by the user, latest start first"""
+    event_ids = await event_repo.get_event_ids_created_by(user_id=current_user.id, limit=limit, offset=offset)
+    db_events = {db_event.id: db_event for db_event in await event_repo.get_events_by_ids(event_ids)}
+
+    return [EventInResponse.from_orm(db_events[event_id]) for event_id in event_ids if event_id in db_events]
+
+
+@router.get(
+    path="/search",
+    response_model=EventsInSearch,
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def search_events(
+        q: str = fastapi.Query(..., min_length=1, max_length=256),
+        limit: int = fastapi.Query(20, ge=1, le=settings.EVENT_SEARCH_MAX_LIMIT),
+        offset: int = fastapi.Query(0, ge=0),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+) -> EventsInSearch:
+    """Search the title and description of the events visible to the user, best matches first"""
+    event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+    if not event_type_ids:
+        return EventsInSearch(events=[], next_offset=None)
+
+    # One more row tells whether there is a next page, without counting every match
+    results = await event_repo.search_events(text=q, event_type_ids=event_type_ids, limit=limit + 1, offset=offset)
+    events = [
+        EventInSearchResponse(**EventInResponse.from_orm(db_event).dict(), rank=rank)
+        for db_event, rank in results[:limit]
+    ]
+
+    return EventsInSearch(events=events, next_offset=offset + limit if len(results) > limit else None)
+
+
+@router.get(
+    path="/availability",
+    response_model=EventTypeAvailability,
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_availability(
+        event_type: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+) -> EventTypeAvailability:
+    """Get the free slots of an event type between `start` and `end`, and its events that overlap"""
+    window_start, window_end = convert_to_utc(start), convert_to_utc(end)
+    if window_end <= window_start or window_end - window_start > datetime.timedelta(
+            days=settings.AVAILABILITY_WINDOW_MAX_DAYS
+    ):
+        raise await http_422_exc_invalid_window_request(max_days=settings.AVAILABILITY_WINDOW_MAX_DAYS)
+
+    await check_event_type_permission(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_type=event_type,
+        action='see'
+    )
+    periods = await event_repo.get_periods_in_window(
+        event_type_id=event_type, window_start=window_start, window_end=window_end
+    )
+    free_slots, conflicts = find_availability(periods=periods, window_start=window_start, window_end=window_end)
+
+    return EventTypeAvailability(event_type=event_type, free_slots=free_slots, conflicts=conflicts)
+
+
+@router.get(
+    path="/summary/monthly",
+    response_model=list[EventTypeMonthSummary],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_monthly_summaries(
+        first_month: datetime.date,
+        last_month: datetime.date,
+        event_type: list[int] | None = fastapi.Query(None),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        summary_repo: EventSummaryRepository = fastapi.Depends(get_repository(repo_type=EventSummaryRepository)),
+) -> list[EventTypeMonthSummary]:
+    """
+    Get the events per month of the event types visible to the user, from `first_month` to `last_month`.
+
+    Months are those of the configured timezone and every one of the range is listed, with zeros when it has no
+    events. Summaries are kept up to date by every write to the events, so reads do not grow with the events.
+    """
+    if not 0 < month_span(first=first_month, last=last_month) <= settings.EVENT_SUMMARY_MAX_MONTHS:
+        raise await http_422_exc_invalid_month_range_request(max_months=settings.EVENT_SUMMARY_MAX_MONTHS)
+
+    event_type_ids = await event_repo.get_event_type_ids_for_user(user_id=current_user.id)
+    if event_type is not None:
+        requested = set(event_type)
+        event_type_ids = [event_type_id for event_type_id in event_type_ids if event_type_id in requested]
+    months = months_between(first=first_month, last=last_month)
+    summaries = {
+        (summary.event_type, summary.month): summary
+        for summary in await summary_repo.get_monthly_summaries(
+            event_type_ids=event_type_ids, first_month=months[0], last_month=months[-1]
         )
-        db_event_list.append(event)
+    }
+
+    response = []
+    for event_type_id in sorted(set(event_type_ids)):
+        for month in months:
+            month_start, month_end = month_bounds(month=month, timezone=settings.TIMEZONE)
+            summary = summaries.get((event_type_id, month))
+            booked_seconds = summary.booked_seconds if summary else 0
+            response.append(EventTypeMonthSummary(
+                event_type=event_type_id,
+                month=month,
+                event_count=summary.event_count if summary else 0,
+                booked_seconds=booked_seconds,
+                occupancy=booked_seconds / (month_end - month_start).total_seconds(),
+            ))
 
-    return db_event_list
+    return response
 
 
 @router.get(
@@ -93,7 +406,6 @@ async def get_event_for_user(
         event_id: int,
         current_user: User = fastapi.Depends(get_current_user),
         event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
-        user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
         permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository))
 ) -> EventInResponse:
     """Get event by id"""
@@ -103,7 +415,6 @@ async def get_event_for_user(
         raise await http_404_exc_event_id_not_found_request(_id=event_id)
 
     await check_event_type_permission(
-        user_repo=user_repo, 
         permission_repo=permission_repo, 
         current_user=current_user, 
         event_type=db_event.event_type, 
@@ -118,6 +429,7 @@ async def get_event_for_user(
         description=db_event.description,
         start_date=db_event.start_date,
         end_date=db_event.end_date,
+        recurrence_rule=db_event.recurrence_rule,
         created_at=db_event.created_at,
         updated_at=db_event.updated_at,
     )
@@ -133,19 +445,20 @@ async def create_event(
         event_create: EventInCreate,
         current_user: User = fastapi.Depends(get_current_user),
         event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
-        user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
         permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
         notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
 ) -> EventInResponse:
     """Create new event"""
     await check_event_type_permission(
-        user_repo=user_repo,
         permission_repo=permission_repo,
         current_user=current_user,
         event_type=event_create.event_type,
         action='add'
     )
-    db_event = await event_repo.create_event(event_create=event_create)
+    try:
+        db_event = await event_repo.create_event(event_create=event_create)
+    except EntityConflict:
+        raise await http_409_exc_booking_conflict_request()
 
     response = EventInResponse(
         id=db_event.id,
@@ -155,6 +468,7 @@ async def create_event(
         description=db_event.description,
         start_date=db_event.start_date,
         end_date=db_event.end_date,
+        recurrence_rule=db_event.recurrence_rule,
         created_at=db_event.created_at,
         updated_at=db_event.updated_at,
     )
@@ -175,7 +489,6 @@ async def update_event(
         event_update: EventInUpdate,
         current_user: User = fastapi.Depends(get_current_user),
         event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
-        user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
         permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
         notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
 ) -> EventInResponse:
@@ -187,13 +500,15 @@ async def update_event(
         raise await http_404_exc_event_id_not_found_request(_id=event_id)
 
     await check_event_type_permission(
-        user_repo=user_repo,
         permission_repo=permission_repo,
         current_user=current_user,
         event_type=db_event.event_type,
         action='edit'
     )
-    updated_event = await event_repo.update_event_by_id(event_id=event_id, event_update=event_update)
+    try:
+        updated_event = await event_repo.update_event_by_id(event_id=event_id, event_update=event_update)
+    except EntityConflict:
+        raise await http_409_exc_booking_conflict_request()
 
     response = EventInResponse(
         id=updated_event.id,
@@ -203,6 +518,7 @@ async def update_event(
         description=updated_event.description,
         start_date=updated_event.start_date,
         end_date=updated_event.end_date,
+        recurrence_rule=updated_event.recurrence_rule,
         created_at=updated_event.created_at,
         updated_at=updated_event.updated_at,
     )
@@ -222,7 +538,6 @@ async def delete_event(
         event_id: int,
         current_user: User = fastapi.Depends(get_current_user),
         event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
-        user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository)),
         permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
         notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService)),
 ) -> EventInResponse:
@@ -235,7 +550,6 @@ async def delete_event(
         raise await http_404_exc_event_id_not_found_request(_id=event_id)
 
     await check_event_type_permission(
-        user_repo=user_repo,
         permission_repo=permission_repo,
         current_user=current_user,
         event_type=db_event.event_type,
@@ -251,6 +565,7 @@ async def delete_event(
         description=deleted_event.description,
         start_date=deleted_event.start_date,
         end_date=deleted_event.end_date,
+        recurrence_rule=deleted_event.recurrence_rule,
         created_at=deleted_event.created_at,
         updated_at=deleted_event.updated_at,
     )
@@ -260,22 +575,313 @@ async def delete_event(
     return response
 
 
+@router.put(
+    path="/update/{event_id}/occurrence",
+    response_model=EventOverrideInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def update_occurrence(
+        event_id: int,
+        override: EventOverrideInUpsert,
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+) -> EventOverrideInResponse:
+    """Cancel or modify one occurrence of a recurring event, the others keep following its rule"""
+    try:
+        db_event = await event_repo.get_event_by_id(event_id)
+    except EntityDoesNotExist:
+        raise await http_404_exc_event_id_not_found_request(_id=event_id)
+
+    await check_event_type_permission(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_type=db_event.event_type,
+        action='edit'
+    )
+    if not db_event.recurrence_rule or not is_occurrence(event=db_event, start=override.original_start):
+        raise await http_422_exc_not_an_occurrence_request(
+            event_id=event_id, start=override.original_start.isoformat()
+        )
+
+    db_override = await event_repo.upsert_event_override(event=db_event, override=override)
+
+    return EventOverrideInResponse.from_orm(db_override)
+
+
+@router.delete(
+    path="/delete/{event_id}/occurrence",
+    response_model=EventOverrideInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def delete_occurrence_override(
+        event_id: int,
+        original_start: datetime.datetime,
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+) -> EventOverrideInResponse:
+    """Restore an occurrence of a recurring event as generated by its rule"""
+    try:
+        db_event = await event_repo.get_event_by_id(event_id)
+    except EntityDoesNotExist:
+        raise await http_404_exc_event_id_not_found_request(_id=event_id)
+
+    await check_event_type_permission(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_type=db_event.event_type,
+        action='edit'
+    )
+    try:
+        db_override = await event_repo.delete_event_override(event=db_event, original_start=original_start)
+    except EntityDoesNotExist:
+        raise await http_404_exc_override_not_found_request(event_id=event_id, start=original_start.isoformat())
+
+    return EventOverrideInResponse.from_orm(db_override)
+
+
+async def load_event_details(event: EventInDetailedResponse, loaders: Loaders) -> None:
+    creator, event_type = await asyncio.gather(
+        loaders.users.load(event.created_by), loaders.event_types.load(event.event_type)
+    )
+    event.creator = UserInResponse.from_orm(creator) if creator else None
+    event.event_type_details = EventTypeInResponse.from_orm(event_type) if event_type else None
+
+
+def forbidden_result(index: int) -> EventInBatchResult:
+    return EventInBatchResult(
+        index=index,
+        status_code=fastapi.status.HTTP_403_FORBIDDEN,
+        detail=http_403_permission_denied_details(),
+    )
+
+
+def not_found_result(index: int, event_id: int) -> EventInBatchResult:
+    return EventInBatchResult(
+        index=index,
+        status_code=fastapi.status.HTTP_404_NOT_FOUND,
+        detail=http_404_id_details(_object="event", _id=event_id),
+    )
+
+
+@router.get(
+    path="/batch",
+    response_model=EventsInBatchRead,
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def get_events_by_ids(
+        ids: list[int] = fastapi.Query(..., min_items=1, max_items=settings.EVENT_BATCH_MAX_ITEMS),
+        details: bool = False,
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+        loaders: Loaders = fastapi.Depends(get_loaders),
+) -> EventsInBatchRead:
+    """
+    Get events by ids in one query, the missing and forbidden ones are reported instead.
+
+    With `details`, each event also has its creator and event type, loaded with one query for all of them.
+    """
+    event_ids = list(dict.fromkeys(ids))
+    db_events = {db_event.id: db_event for db_event in await event_repo.get_events_by_ids(event_ids)}
+    permitted = await get_permitted_event_types(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_types={db_event.event_type for db_event in db_events.values()},
+        action='see'
+    )
+
+    events, missing_ids, forbidden_ids = [], [], []
+    for event_id in event_ids:
+        db_event = db_events.get(event_id)
+        if db_event is None:
+            missing_ids.append(event_id)
+        elif db_event.event_type not in permitted:
+            forbidden_ids.append(event_id)
+        else:
+            events.append(EventInDetailedResponse.from_orm(db_event))
+
+    if details:
+        await asyncio.gather(*(load_event_details(event=event, loaders=loaders) for event in events))
+
+    return EventsInBatchRead(events=events, missing_ids=missing_ids, forbidden_ids=forbidden_ids)
+
+
+@router.post(
+    path="/batch/create",
+    response_model=list[EventInBatchResult],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def create_events(
+        event_creates: list[EventInCreate] = fastapi.Body(..., min_items=1, max_items=settings.EVENT_BATCH_MAX_ITEMS),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> list[EventInBatchResult]:
+    """Create events in one transaction, returns the outcome of each of them"""
+    permitted = await get_permitted_event_types(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_types={event_create.event_type for event_create in event_creates},
+        action='add'
+    )
+
+    results: dict[int, EventInBatchResult] = {}
+    to_create: dict[int, EventInCreate] = {}
+    for index, event_create in enumerate(event_creates):
+        if event_create.event_type in permitted:
+            to_create[index] = event_create
+        else:
+            results[index] = forbidden_result(index=index)
+
+    responses = []
+    if to_create:
+        try:
+            db_events = await event_repo.create_events(event_creates=list(to_create.values()))
+        except EntityConflict:
+            # One transaction, so a double booking fails the whole batch
+            raise await http_409_exc_booking_conflict_request()
+        for index, db_event in zip(to_create, db_events):
+            response = EventInResponse.from_orm(db_event)
+            responses.append(response)
+            results[index] = EventInBatchResult(
+                index=index, status_code=fastapi.status.HTTP_201_CREATED, event=response
+            )
+
+        await notif_service.send_event_batch_notification(
+            events=responses, event_operation=EventOperation.EVENT_BATCH_CREATE
+        )
+
+    return [results[index] for index in range(len(event_creates))]
+
+
+@router.put(
+    path="/batch/update",
+    response_model=list[EventInBatchResult],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def update_events(
+        event_updates: list[EventInBatchUpdate] = fastapi.Body(
+            ..., min_items=1, max_items=settings.EVENT_BATCH_MAX_ITEMS
+        ),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> list[EventInBatchResult]:
+    """Update events in one transaction, returns the outcome of each of them"""
+    # Locked, so no event changes its type between the permission check and the update
+    db_events = {
+        db_event.id: db_event
+        for db_event in await event_repo.get_events_by_ids(
+            [event_update.id for event_update in event_updates], for_update=True
+        )
+    }
+    # Moving an event to another type requires editing rights on both types
+    permitted = await get_permitted_event_types(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_types={db_event.event_type for db_event in db_events.values()}
+        | {event_update.event_type for event_update in event_updates if event_update.event_type is not None},
+        action='edit'
+    )
+
+    results: dict[int, EventInBatchResult] = {}
+    to_update: dict[int, EventInBatchUpdate] = {}
+    for index, event_update in enumerate(event_updates):
+        db_event = db_events.get(event_update.id)
+        if db_event is None:
+            results[index] = not_found_result(index=index, event_id=event_update.id)
+        elif db_event.event_type not in permitted or event_update.event_type not in permitted | {None}:
+            results[index] = forbidden_result(index=index)
+        else:
+            to_update[index] = event_update
+
+    if to_update:
+        try:
+            db_updated_events = await event_repo.update_events(event_updates=list(to_update.values()))
+        except EntityConflict:
+            raise await http_409_exc_booking_conflict_request()
+        updated_events = {
+            updated_event.id: EventInResponse.from_orm(updated_event) for updated_event in db_updated_events
+        }
+        for index, event_update in to_update.items():
+            results[index] = EventInBatchResult(
+                index=index, status_code=fastapi.status.HTTP_200_OK, event=updated_events[event_update.id]
+            )
+
+        await notif_service.send_event_batch_notification(
+            events=list(updated_events.values()), event_operation=EventOperation.EVENT_BATCH_UPDATE
+        )
+
+    return [results[index] for index in range(len(event_updates))]
+
+
+@router.post(
+    path="/batch/delete",
+    response_model=list[EventInBatchResult],
+    status_code=fastapi.status.HTTP_200_OK,
+    dependencies=[fastapi.Depends(get_current_user)]
+)
+async def delete_events(
+        event_ids: list[int] = fastapi.Body(..., min_items=1, max_items=settings.EVENT_BATCH_MAX_ITEMS),
+        current_user: User = fastapi.Depends(get_current_user),
+        event_repo: EventRepository = fastapi.Depends(get_repository(repo_type=EventRepository)),
+        permission_repo: RoleEventTypeRepository = fastapi.Depends(get_repository(repo_type=RoleEventTypeRepository)),
+        notif_service: NotificationService = fastapi.Depends(get_service(service_type=NotificationService))
+) -> list[EventInBatchResult]:
+    """Delete events in one transaction, returns the outcome of each of them"""
+    db_events = {db_event.id: db_event for db_event in await event_repo.get_events_by_ids(event_ids, for_update=True)}
+    permitted = await get_permitted_event_types(
+        permission_repo=permission_repo,
+        current_user=current_user,
+        event_types={db_event.event_type for db_event in db_events.values()},
+        action='edit'
+    )
+
+    results: dict[int, EventInBatchResult] = {}
+    to_delete: dict[int, int] = {}
+    for index, event_id in enumerate(event_ids):
+        db_event = db_events.get(event_id)
+        if db_event is None:
+            results[index] = not_found_result(index=index, event_id=event_id)
+        elif db_event.event_type not in permitted:
+            results[index] = forbidden_result(index=index)
+        else:
+            to_delete[index] = event_id
+
+    if to_delete:
+        deleted_events = {
+            deleted_event.id: EventInResponse.from_orm(deleted_event)
+            for deleted_event in await event_repo.delete_events_by_ids(list(set(to_delete.values())))
+        }
+        for index, event_id in to_delete.items():
+            results[index] = EventInBatchResult(
+                index=index, status_code=fastapi.status.HTTP_200_OK, event=deleted_events[event_id]
+            )
+
+        await notif_service.send_event_batch_notification(
+            events=list(deleted_events.values()), event_operation=EventOperation.EVENT_BATCH_DELETE
+        )
+
+    return [results[index] for index in range(len(event_ids))]
+
+
 @router.get(
     path="/event_types",
     response_model=list[EventTypeInResponse],
     status_code=fastapi.status.HTTP_200_OK,
 )
 async def get_event_types(
-        event_type_repo: EventTypeRepository = fastapi.Depends(get_repository(repo_type=EventTypeRepository)),
-) -> list[EventTypeInResponse]:
+        snapshot: CatalogSnapshot = fastapi.Depends(get_catalog_snapshot),
+) -> fastapi.Response:
     """Get event types"""
-    event_types = await event_type_repo.get_event_types()
-    event_type_list = []
-    for event_type in event_types:
-        event_type_list.append(EventTypeInResponse(
-            id=event_type.id,
-            name=event_type.name,
-            description=event_type.description,
-        ))
-
-    return event_type_list
+    # Serialized once per catalog snapshot
+    return fastapi.Response(content=snapshot.event_types_json, media_type="application/json")
@@ -1,8 +1,10 @@
 import fastapi
 
+from app.api.dependencies.catalog import get_catalog_snapshot
 from app.api.dependencies.repository import get_repository
 from app.api.dependencies.role import is_user_in_role
 from app.api.dependencies.service import get_service
+from app.cache.catalog import CatalogSnapshot
 from app.models.schemas.event_operation import EventOperation
 from app.models.schemas.role import RoleInCreate, RoleInResponse, RoleInUpdate
 from app.models.schemas.role_event_type import RoleEventTypeInResponse, RoleEventTypeInCreate
@@ -24,12 +26,11 @@ router = fastapi.APIRouter(prefix="/roles", tags=["roles"])
     status_code=fastapi.status.HTTP_200_OK,
 )
 async def get_roles(
-        role_repo: RoleRepository = fastapi.Depends(get_repository(repo_type=RoleRepository))
-) -> list[RoleInResponse]:
+        snapshot: CatalogSnapshot = fastapi.Depends(get_catalog_snapshot)
+) -> fastapi.Response:
     """Get all roles"""
-    db_roles = await role_repo.get_roles()
-
-    return [RoleInResponse.from_orm(role) for role in db_roles]
+    # Serialized once per catalog snapshot
+    return fastapi.Response(content=snapshot.roles_json, media_type="application/json")
 
 
 @router.get(
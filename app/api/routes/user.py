@@ -7,6 +7,7 @@ from app.api.dependencies.service import get_service
 from app.models.db.user import User
 from app.models.schemas.event_operation import EventOperation
 from app.models.schemas.event_type import EventTypeInResponse
+from app.models.schemas.profile_pic import ProfilePicFormat, ProfilePicSize
 from app.models.schemas.role import RoleInResponse
 from app.models.schemas.user import UserInCreate, UserInResponse, UserInUpdate
 from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove
@@ -29,6 +30,8 @@ router = fastapi.APIRouter(prefix="/users", tags=["users"])
     status_code=fastapi.status.HTTP_200_OK,
 )
 async def get_users(
+        profile_pic_size: ProfilePicSize | None = None,
+        profile_pic_format: ProfilePicFormat | None = None,
         user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository))
 ) -> list[UserInResponse]:
     """Get all users"""
@@ -42,7 +45,7 @@ async def get_users(
             last_name=db_user.last_name,
             created_at=db_user.created_at,
             updated_at=db_user.updated_at,
-            profile_pic_url=db_user.profile_pic_url,
+            profile_pic_url=db_user.profile_pic_url_for(size=profile_pic_size, image_format=profile_pic_format),
         )
         db_user_list.append(user)
 
@@ -56,6 +59,8 @@ async def get_users(
 )
 async def get_user(
         user_id: int,
+        profile_pic_size: ProfilePicSize | None = None,
+        profile_pic_format: ProfilePicFormat | None = None,
         user_repo: UserRepository = fastapi.Depends(get_repository(repo_type=UserRepository))
 ) -> UserInResponse:
     """Get user by id"""
@@ -72,7 +77,7 @@ async def get_user(
         last_name=db_user.last_name,
         created_at=db_user.created_at,
         updated_at=db_user.updated_at,
-        profile_pic_url=db_user.profile_pic_url,
+        profile_pic_url=db_user.profile_pic_url_for(size=profile_pic_size, image_format=profile_pic_format),
     )
 
 
@@ -0,0 +1,151 @@
+import asyncio
+import collections
+import time
+import typing
+
+from loguru import logger
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.cache.metrics import metrics_registry
+from app.cache.single_flight import SingleFlight
+from app.config.manager import settings
+
+# Rough per-entry bookkeeping cost on top of the response body, counted against the byte budget
+ENTRY_OVERHEAD_BYTES = 256
+
+CalendarLoader = typing.Callable[[], typing.Awaitable[tuple[typing.Iterable[int], bytes]]]
+
+
+class CalendarEntry:
+    def __init__(self, body: bytes, event_type_ids: frozenset[int], fetched_at: float):
+        self.body = body
+        self.event_type_ids = event_type_ids
+        self.fetched_at = fetched_at
+        self.size = len(body) + ENTRY_OVERHEAD_BYTES + 8 * len(event_type_ids)
+
+
+class CalendarCache:
+    """
+    Stale-while-revalidate cache of the serialized `/events/user` response of each user.
+
+    An entry younger than the soft TTL is served as is. Past the soft TTL it is still served, but refreshed in
+    the background, and past the hard TTL the caller waits for a fresh load. Entries remember the eventTypes
+    they cover, so a change to an event only evicts the users that can see its type. Memory is bounded by an
+    LRU over the total size of the cached bodies.
+    """
+
+    def __init__(self, max_bytes: int, soft_ttl: int, hard_ttl: int):
+        self.max_bytes = max_bytes
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.size = 0
+        self.generation = 0
+        self.metrics = metrics_registry.get("calendar")
+        self.logger = logger.bind(name="stdout")
+        self._entries: collections.OrderedDict[int, CalendarEntry] = collections.OrderedDict()
+        self._single_flight = SingleFlight(name="calendar_refresh")
+        self._revalidations: dict[int, asyncio.Task] = {}
+
+    async def get(self, user_id: int, load: CalendarLoader) -> bytes:
+        """Get the cached response of the user, `load` returns `(event_type_ids, body)` on a miss"""
+        entry = self._entries.get(user_id)
+        age = time.monotonic() - entry.fetched_at if entry is not None else None
+
+        if entry is None or age >= self.hard_ttl:  # type: ignore
+            self.metrics.record_miss()
+            return await self._refresh(user_id=user_id, load=load)
+
+        self._entries.move_to_end(user_id)
+        self.metrics.record_hit()
+
+        if age >= self.soft_ttl and user_id not in self._revalidations:  # type: ignore
+            self._revalidations[user_id] = asyncio.ensure_future(self._revalidate(user_id=user_id, load=load))
+
+        return entry.body
+
+    async def _refresh(self, user_id: int, load: CalendarLoader) -> bytes:
+        async def fetch() -> bytes:
+            generation = self.generation
+            event_type_ids, body = await load()
+            self.set(user_id=user_id, event_type_ids=event_type_ids, body=body, generation=generation)
+            return body
+
+        return await self._single_flight.do(key=user_id, fn=fetch)
+
+    async def _revalidate(self, user_id: int, load: CalendarLoader) -> None:
+        try:
+            await self._refresh(user_id=user_id, load=load)
+        except Exception as e:
+            # The stale entry stays until the hard TTL, the next request tries again
+            self.logger.warning(f"Failed to refresh calendar of user with ID {user_id}: {e}")
+        finally:
+            del self._revalidations[user_id]
+
+    def set(self, user_id: int, event_type_ids: typing.Iterable[int], body: bytes, generation: int) -> None:
+        """Cache the response, unless the cache was invalidated since `generation`"""
+        if generation != self.generation:
+            return
+
+        entry = CalendarEntry(body=body, event_type_ids=frozenset(event_type_ids), fetched_at=time.monotonic())
+        self.pop(user_id)
+        if entry.size > self.max_bytes:
+            return
+
+        self._entries[user_id] = entry
+        self.size += entry.size
+
+        while self.size > self.max_bytes:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def invalidate(self, keys: list[typing.Any] | None = None) -> None:
+        """Drop every entry"""
+        self.generation += 1
+        self.clear()
+
+    def invalidate_event_types(self, keys: list[typing.Any] | None) -> None:
+        """Drop the entries of users that can see one of the eventTypes"""
+        if keys is None:
+            self.invalidate()
+            return
+
+        self.generation += 1
+        event_type_ids = set(keys)
+        for user_id, entry in list(self._entries.items()):
+            if not entry.event_type_ids.isdisjoint(event_type_ids):
+                self.pop(user_id)
+
+    def invalidate_user_ids(self, keys: list[typing.Any] | None) -> None:
+        if keys is None:
+            self.invalidate()
+            return
+
+        self.generation += 1
+        for user_id in keys:
+            self.pop(user_id)
+
+
+def get_calendar_cache() -> CalendarCache:
+    return CalendarCache(
+        max_bytes=settings.CALENDAR_CACHE_MAX_BYTES,
+        soft_ttl=settings.CALENDAR_CACHE_SOFT_TTL,
+        hard_ttl=settings.CALENDAR_CACHE_HARD_TTL,
+    )
+
+
+calendar_cache: CalendarCache = get_calendar_cache()
+
+invalidation_bus.register(InvalidationNamespace.EVENTS, calendar_cache.invalidate_event_types)
+invalidation_bus.register(InvalidationNamespace.USER_ROLES, calendar_cache.invalidate_user_ids)
+invalidation_bus.register(InvalidationNamespace.USERS, calendar_cache.invalidate_user_ids)
+# Which users a role grant reaches is not tracked, so permission changes flush every calendar
+invalidation_bus.register(InvalidationNamespace.PERMISSIONS, calendar_cache.invalidate)
+invalidation_bus.register(InvalidationNamespace.ROLES, calendar_cache.invalidate)
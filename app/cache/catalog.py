@@ -0,0 +1,109 @@
+import asyncio
+import typing
+
+import sqlalchemy
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.models.db.event_type import EventType
+from app.models.db.role import Role
+from app.models.schemas.event_type import EventTypeInResponse
+from app.models.schemas.role import RoleInResponse
+from app.utilities.formatters.response_formatter import serialize_response
+
+
+class CatalogSnapshot:
+    """
+    Immutable in-memory copy of the EVENT_TYPE and ROLE tables.
+
+    A snapshot is never modified after creation, a mutation replaces the whole snapshot instead, so readers
+    holding a reference keep a consistent view.
+    """
+
+    def __init__(self, version: int, event_types: typing.Sequence[EventType], roles: typing.Sequence[Role]):
+        self.version = version
+
+        # Detached copies, so no request session ever owns the cached instances
+        self.event_types: tuple[EventType, ...] = tuple(
+            EventType(
+                id=event_type.id, name=event_type.name, description=event_type.description,
+                is_exclusive=event_type.is_exclusive,
+            )
+            for event_type in event_types
+        )
+        self.roles: tuple[Role, ...] = tuple(Role(id=role.id, name=role.name) for role in roles)
+
+        self.event_types_by_id: dict[int, EventType] = {event_type.id: event_type for event_type in self.event_types}
+        self.event_types_by_name: dict[str, EventType] = {}
+        for event_type in self.event_types:
+            self.event_types_by_name.setdefault(event_type.name, event_type)
+
+        self.roles_by_id: dict[int, Role] = {role.id: role for role in self.roles}
+        self.roles_by_name: dict[str, Role] = {}
+        for role in self.roles:
+            self.roles_by_name.setdefault(role.name, role)
+
+        self.event_types_json: bytes = serialize_response(
+            [EventTypeInResponse.from_orm(event_type) for event_type in self.event_types]
+        )
+        self.roles_json: bytes = serialize_response([RoleInResponse.from_orm(role) for role in self.roles])
+
+
+class CatalogCache:
+    """Read-through cache holding the current `CatalogSnapshot`"""
+
+    def __init__(self):
+        self.logger = logger.bind(name="stdout")
+        self._snapshot: CatalogSnapshot | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, keys: list[typing.Any] | None = None) -> None:
+        """Drop the current snapshot, the next read loads a new one"""
+        self._generation += 1
+        self._snapshot = None
+
+    async def get(self, async_session: SQLAlchemyAsyncSession) -> CatalogSnapshot:
+        """Get the current snapshot, loading it from the database if needed"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+
+            generation = self._generation
+            snapshot = await self._load(async_session=async_session, version=generation)
+
+            # Do not keep a snapshot that was invalidated while it was loading
+            if generation == self._generation:
+                self._snapshot = snapshot
+
+            return snapshot
+
+    async def _load(self, async_session: SQLAlchemyAsyncSession, version: int) -> CatalogSnapshot:
+        self.logger.debug("Loading eventTypes and roles snapshot from database")
+
+        event_types_query = await async_session.execute(sqlalchemy.select(EventType).order_by(EventType.id))
+        roles_query = await async_session.execute(sqlalchemy.select(Role).order_by(Role.id))
+        snapshot = CatalogSnapshot(
+            version=version,
+            event_types=event_types_query.scalars().all(),
+            roles=roles_query.scalars().all(),
+        )
+
+        self.logger.debug(f"Loaded {len(snapshot.event_types)} eventTypes and {len(snapshot.roles)} roles")
+
+        return snapshot
+
+
+def get_catalog_cache() -> CatalogCache:
+    return CatalogCache()
+
+
+catalog_cache: CatalogCache = get_catalog_cache()
+
+invalidation_bus.register(InvalidationNamespace.EVENT_TYPES, catalog_cache.invalidate)
+invalidation_bus.register(InvalidationNamespace.ROLES, catalog_cache.invalidate)
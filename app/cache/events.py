@@ -0,0 +1,38 @@
+import fastapi
+from loguru import logger
+
+from app.cache.catalog import catalog_cache
+from app.cache.intervals import interval_index
+from app.cache.invalidation import invalidation_bus
+
+
+async def init_cache(app: fastapi.FastAPI) -> None:
+    logger.info("Cache Invalidation --- Starting listener . . .")
+
+    dsn = app.state.db.async_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)  # type: ignore
+    await invalidation_bus.start(dsn=dsn)
+    app.state.invalidation_bus = invalidation_bus  # type: ignore
+
+    logger.info("Cache Invalidation --- Listener started!")
+
+    logger.info("Catalog Cache --- Preloading . . .")
+
+    async with app.state.db.get_session() as async_session:  # type: ignore
+        snapshot = await catalog_cache.get(async_session=async_session)
+
+    logger.info(f"Catalog Cache --- Preloaded {len(snapshot.event_types)} eventTypes and {len(snapshot.roles)} roles!")
+
+    logger.info("Interval Index --- Building . . .")
+
+    async with app.state.db.get_session() as async_session:  # type: ignore
+        indexed = await interval_index.build(async_session=async_session)
+
+    logger.info(f"Interval Index --- Indexed {indexed} events!")
+
+
+async def close_cache(app: fastapi.FastAPI) -> None:
+    logger.info("Cache Invalidation --- Stopping listener . . .")
+
+    await app.state.invalidation_bus.stop()  # type: ignore
+
+    logger.info("Cache Invalidation --- Listener stopped!")
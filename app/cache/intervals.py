@@ -0,0 +1,167 @@
+import asyncio
+import datetime
+import typing
+
+import numpy
+import sqlalchemy
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.cache.metrics import metrics_registry
+from app.models.db.event import Event
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# (id, start, end, is_recurring) of an event
+IntervalRow = tuple[int, datetime.datetime, datetime.datetime, bool]
+
+
+def to_microseconds(moment: datetime.datetime) -> int:
+    return (moment - EPOCH) // datetime.timedelta(microseconds=1)
+
+
+class EventTypeIntervals:
+    """
+    The events of one eventType as arrays of ids, starts and ends in microseconds, sorted by start.
+
+    Recurring events overlap every window after their start, so their positions are kept apart and they do not
+    count towards the longest duration, which bounds how long before a window an overlapping event starts.
+    """
+
+    def __init__(self, rows: typing.Iterable[IntervalRow]):
+        ordered = sorted(rows, key=lambda row: (row[1], row[0]))
+        self.ids = numpy.array([row[0] for row in ordered], dtype=numpy.int64)
+        self.starts = numpy.array([to_microseconds(row[1]) for row in ordered], dtype=numpy.int64)
+        self.ends = numpy.array([to_microseconds(row[2]) for row in ordered], dtype=numpy.int64)
+        is_recurring = numpy.array([row[3] for row in ordered], dtype=bool)
+        self.recurring = numpy.flatnonzero(is_recurring)
+        durations = (self.ends - self.starts)[~is_recurring]
+        self.max_duration = int(durations.max()) if durations.size else 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def overlapping(self, window_start: int, window_end: int) -> numpy.ndarray:
+        """Positions of the events overlapping the window, in start order"""
+        low = numpy.searchsorted(self.starts, window_start - self.max_duration, side="left")
+        high = numpy.searchsorted(self.starts, window_end, side="left")
+        starts, ends = self.starts[low:high], self.ends[low:high]
+        # Events without a duration belong to the window they start in, as in the occurrence expansion
+        positions = numpy.arange(low, high)[(ends > window_start) | (starts >= window_start)]
+        return numpy.union1d(positions, self.recurring[self.recurring < high])
+
+
+class IntervalIndex:
+    """
+    Process-local interval index of the events of every eventType, for window queries.
+
+    Queries are binary searches over sorted NumPy arrays, so the database is only read to hydrate the page of
+    events returned. Every write to EVENT publishes the eventTypes it touched on the EVENTS namespace, in every
+    worker; those eventTypes are dropped and rebuilt with one query on their next read.
+    """
+
+    def __init__(self):
+        self.metrics = metrics_registry.get("intervals")
+        self.logger = logger.bind(name="stdout")
+        self._intervals: dict[int, EventTypeIntervals] = {}
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def build(self, async_session: SQLAlchemyAsyncSession) -> int:
+        """Index the events of every eventType, returns how many events were indexed"""
+        async with self._lock:
+            generation = self._generation
+            intervals = await self._load(async_session=async_session, event_type_ids=None)
+            if generation == self._generation:
+                self._intervals = intervals
+        return sum(len(event_type_intervals) for event_type_intervals in intervals.values())
+
+    async def overlapping(
+            self,
+            async_session: SQLAlchemyAsyncSession,
+            event_type_ids: typing.Iterable[int],
+            window_start: datetime.datetime,
+            window_end: datetime.datetime,
+    ) -> list[int]:
+        """Get the ids of the events of the eventTypes overlapping the window, by start"""
+        start, end = to_microseconds(window_start), to_microseconds(window_end)
+        intervals = await self._get(async_session=async_session, event_type_ids=event_type_ids)
+        return self._merge([
+            (event_type_intervals, event_type_intervals.overlapping(window_start=start, window_end=end))
+            for event_type_intervals in intervals
+        ])
+
+    def invalidate(self, keys: list[typing.Any] | None = None) -> None:
+        """Drop every eventType"""
+        self._generation += 1
+        self._intervals = {}
+
+    def invalidate_event_types(self, keys: list[typing.Any] | None) -> None:
+        """Drop the eventTypes, which are rebuilt on their next read"""
+        if keys is None:
+            self.invalidate()
+            return
+
+        self._generation += 1
+        for event_type_id in keys:
+            self._intervals.pop(event_type_id, None)
+
+    @staticmethod
+    def _merge(results: list[tuple[EventTypeIntervals, numpy.ndarray]]) -> list[int]:
+        ids = numpy.concatenate([intervals.ids[positions] for intervals, positions in results] or [[]])
+        starts = numpy.concatenate([intervals.starts[positions] for intervals, positions in results] or [[]])
+        return ids[numpy.lexsort((ids, starts))].astype(int).tolist()
+
+    async def _get(
+            self, async_session: SQLAlchemyAsyncSession, event_type_ids: typing.Iterable[int]
+    ) -> list[EventTypeIntervals]:
+        event_type_ids = list(dict.fromkeys(event_type_ids))
+        if all(event_type_id in self._intervals for event_type_id in event_type_ids):
+            self.metrics.record_hit()
+            return [self._intervals[event_type_id] for event_type_id in event_type_ids]
+
+        self.metrics.record_miss()
+        async with self._lock:
+            # Taken before loading, an invalidation may drop eventTypes while the query runs
+            intervals = {
+                event_type_id: self._intervals[event_type_id]
+                for event_type_id in event_type_ids if event_type_id in self._intervals
+            }
+            missing = [event_type_id for event_type_id in event_type_ids if event_type_id not in intervals]
+            generation = self._generation
+            loaded = await self._load(async_session=async_session, event_type_ids=missing) if missing else {}
+
+            # Still answers from what was loaded, but does not keep eventTypes invalidated while loading
+            if generation == self._generation:
+                self._intervals.update(loaded)
+
+            intervals.update(loaded)
+            return [intervals[event_type_id] for event_type_id in event_type_ids]
+
+    async def _load(
+            self, async_session: SQLAlchemyAsyncSession, event_type_ids: list[int] | None
+    ) -> dict[int, EventTypeIntervals]:
+        self.logger.debug(f"Indexing events of eventTypes {'all' if event_type_ids is None else event_type_ids}")
+
+        stmt = sqlalchemy.select(
+            Event.event_type, Event.id, Event.start_date, Event.end_date, Event.recurrence_rule.is_not(None)
+        )
+        if event_type_ids is not None:
+            stmt = stmt.where(Event.event_type.in_(event_type_ids))
+        query = await async_session.execute(statement=stmt)
+
+        rows: dict[int, list[IntervalRow]] = {event_type_id: [] for event_type_id in event_type_ids or []}
+        for event_type_id, event_id, start, end, is_recurring in query.all():
+            rows.setdefault(event_type_id, []).append((event_id, start, end, is_recurring))
+
+        return {event_type_id: EventTypeIntervals(rows=event_rows) for event_type_id, event_rows in rows.items()}
+
+
+def get_interval_index() -> IntervalIndex:
+    return IntervalIndex()
+
+
+interval_index: IntervalIndex = get_interval_index()
+
+invalidation_bus.register(InvalidationNamespace.EVENTS, interval_index.invalidate_event_types)
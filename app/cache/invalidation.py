@@ -0,0 +1,180 @@
+import asyncio
+import enum
+import json
+import os
+import typing
+import uuid
+
+import asyncpg
+import sqlalchemy
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+from app.config.manager import settings
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+PENDING_INVALIDATIONS_KEY = "pending_invalidations"
+
+InvalidationHandler = typing.Callable[[list[typing.Any] | None], None]
+
+
+class InvalidationNamespace(str, enum.Enum):
+    USERS: str = "users"  # type: ignore  # keys: user ids
+    USERNAMES: str = "usernames"  # type: ignore  # keys: usernames
+    ROLES: str = "roles"  # type: ignore  # keys: role ids
+    EVENT_TYPES: str = "event_types"  # type: ignore  # keys: event type ids
+    PERMISSIONS: str = "permissions"  # type: ignore  # keys: role ids
+    USER_ROLES: str = "user_roles"  # type: ignore  # keys: user ids
+    EVENTS: str = "events"  # type: ignore  # keys: event type ids
+
+
+class InvalidationBus:
+    """
+    Broadcast cache invalidations to every worker process.
+
+    Repositories publish invalidations inside their transaction with `pg_notify`, so they are only delivered
+    once the change is committed. The local process applies them right after the commit, while every other
+    worker receives them on its dedicated `LISTEN` connection.
+    """
+
+    def __init__(self, channel: str, reconnect_delay: int, health_check_interval: int):
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.health_check_interval = health_check_interval
+        self.origin = ""
+        self.handlers: dict[str, list[InvalidationHandler]] = {}
+        self.logger = logger.bind(name="stdout")
+        self._task: asyncio.Task | None = None
+
+    def register(self, namespace: InvalidationNamespace, handler: InvalidationHandler) -> None:
+        """Call `handler` with the invalidated keys, or None for a full flush, of `namespace`"""
+        self.handlers.setdefault(namespace.value, []).append(handler)
+
+    def encode(self, namespace: InvalidationNamespace, keys: list[typing.Any] | None) -> str:
+        payload = json.dumps({"origin": self.origin, "namespace": namespace.value, "keys": keys})
+        if keys is not None and len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            # Too many keys to fit in one notification, invalidate the whole namespace instead
+            return self.encode(namespace=namespace, keys=None)
+        return payload
+
+    @staticmethod
+    def decode(payload: str) -> tuple[str, str, list[typing.Any] | None]:
+        data = json.loads(payload)
+        return data["origin"], data["namespace"], data["keys"]
+
+    async def publish(
+            self,
+            async_session: SQLAlchemyAsyncSession,
+            namespace: InvalidationNamespace,
+            keys: typing.Iterable[typing.Any] | None = None,
+    ) -> None:
+        """Queue an invalidation that is sent when the current transaction commits"""
+        key_list = None if keys is None else list(dict.fromkeys(keys))
+        self.logger.debug(f"Publishing invalidation of {namespace.value} for keys {key_list}")
+
+        payload = self.encode(namespace=namespace, keys=key_list)
+        await async_session.execute(sqlalchemy.select(sqlalchemy.func.pg_notify(self.channel, payload)))
+
+        async_session.info.setdefault(PENDING_INVALIDATIONS_KEY, []).append((namespace.value, key_list))
+
+    def dispatch(self, namespace: str, keys: list[typing.Any] | None) -> None:
+        """Apply an invalidation to every handler registered for `namespace`"""
+        for handler in self.handlers.get(namespace, []):
+            try:
+                handler(keys)
+            except Exception as e:
+                self.logger.error(f"Invalidation handler for {namespace} failed: {e}")
+
+    def flush_all(self) -> None:
+        """Invalidate every registered cache completely"""
+        self.logger.info("Cache Invalidation --- Flushing all caches")
+        for namespace in self.handlers:
+            self.dispatch(namespace=namespace, keys=None)
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            origin, namespace, keys = self.decode(payload)
+        except (ValueError, KeyError, TypeError):
+            self.logger.warning(f"Ignoring malformed invalidation payload: {payload}")
+            return
+
+        # Our own invalidations have already been applied after the commit
+        if origin == self.origin:
+            return
+
+        self.dispatch(namespace=namespace, keys=keys)
+
+    async def _listen(self, dsn: str) -> None:
+        is_reconnect = False
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                self.logger.warning(f"Cache Invalidation --- Could not connect listener: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            terminated = asyncio.Event()
+            connection.add_termination_listener(lambda _: terminated.set())
+            try:
+                await connection.add_listener(self.channel, self._on_notification)
+                self.logger.info(f"Cache Invalidation --- Listening on channel {self.channel}")
+
+                # Notifications sent while we were disconnected are lost
+                if is_reconnect:
+                    self.flush_all()
+                is_reconnect = True
+
+                while not terminated.is_set():
+                    try:
+                        await asyncio.wait_for(terminated.wait(), timeout=self.health_check_interval)
+                    except asyncio.TimeoutError:
+                        await connection.fetchval("SELECT 1", timeout=self.health_check_interval)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                self.logger.warning(f"Cache Invalidation --- Listener connection failed: {e}")
+            finally:
+                if not connection.is_closed():
+                    connection.terminate()
+
+            self.logger.warning("Cache Invalidation --- Listener disconnected, reconnecting . . .")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self, dsn: str) -> None:
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._task = asyncio.create_task(self._listen(dsn=dsn))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+@event.listens_for(SQLAlchemySession, "after_commit")
+def apply_pending_invalidations(session: SQLAlchemySession) -> None:
+    for namespace, keys in session.info.pop(PENDING_INVALIDATIONS_KEY, []):
+        invalidation_bus.dispatch(namespace=namespace, keys=keys)
+
+
+@event.listens_for(SQLAlchemySession, "after_rollback")
+def discard_pending_invalidations(session: SQLAlchemySession) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    return InvalidationBus(
+        channel=settings.CACHE_INVALIDATION_CHANNEL,
+        reconnect_delay=settings.CACHE_INVALIDATION_RECONNECT_DELAY,
+        health_check_interval=settings.CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL,
+    )
+
+
+invalidation_bus: InvalidationBus = get_invalidation_bus()
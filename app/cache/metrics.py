@@ -0,0 +1,49 @@
+class CacheMetrics:
+    """Hit/miss counters of a cache, each hit being one database query saved"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+
+    def record_hit(self) -> None:
+        self.lookups += 1
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        self.lookups += 1
+        self.misses += 1
+
+    @property
+    def queries_saved_per_request(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries_saved": self.hits,
+            "queries_saved_per_request": self.queries_saved_per_request,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, CacheMetrics] = {}
+
+    def get(self, name: str) -> CacheMetrics:
+        if name not in self.metrics:
+            self.metrics[name] = CacheMetrics(name=name)
+        return self.metrics[name]
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        return {name: metrics.as_dict() for name, metrics in self.metrics.items()}
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+metrics_registry: MetricsRegistry = get_metrics_registry()
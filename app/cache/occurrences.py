@@ -0,0 +1,89 @@
+import collections
+import datetime
+import typing
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.cache.metrics import metrics_registry
+from app.cache.single_flight import SingleFlight
+from app.config.manager import settings
+
+OccurrenceKey = tuple[frozenset[int], datetime.datetime, datetime.datetime]
+OccurrenceLoader = typing.Callable[[], typing.Awaitable[bytes]]
+
+
+class OccurrenceCache:
+    """
+    LRU cache of the serialized occurrences of a window, keyed by the visible eventTypes and the window.
+
+    Users seeing the same eventTypes share their entries. A change to an event, or to one of its overrides, only
+    evicts the windows covering its type, and a load started before an invalidation is not cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.metrics = metrics_registry.get("occurrences")
+        self._entries: collections.OrderedDict[OccurrenceKey, bytes] = collections.OrderedDict()
+        self._single_flight = SingleFlight(name="occurrences_load")
+
+    async def get(
+            self,
+            event_type_ids: typing.Iterable[int],
+            window_start: datetime.datetime,
+            window_end: datetime.datetime,
+            load: OccurrenceLoader,
+    ) -> bytes:
+        """Get the cached occurrences of the window, `load` expands them on a miss"""
+        key = (frozenset(event_type_ids), window_start, window_end)
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+            self.metrics.record_hit()
+            return body
+
+        self.metrics.record_miss()
+
+        async def fetch() -> bytes:
+            generation = self.generation
+            new_body = await load()
+            self.set(key=key, body=new_body, generation=generation)
+            return new_body
+
+        return await self._single_flight.do(key=key, fn=fetch)
+
+    def set(self, key: OccurrenceKey, body: bytes, generation: int) -> None:
+        """Cache the occurrences, unless the cache was invalidated since `generation`"""
+        if generation != self.generation:
+            return
+
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: list[typing.Any] | None = None) -> None:
+        """Drop every entry"""
+        self.generation += 1
+        self._entries.clear()
+
+    def invalidate_event_types(self, keys: list[typing.Any] | None) -> None:
+        """Drop the windows covering one of the eventTypes"""
+        if keys is None:
+            self.invalidate()
+            return
+
+        self.generation += 1
+        event_type_ids = set(keys)
+        for key in list(self._entries):
+            if not key[0].isdisjoint(event_type_ids):
+                del self._entries[key]
+
+
+def get_occurrence_cache() -> OccurrenceCache:
+    return OccurrenceCache(max_entries=settings.OCCURRENCE_CACHE_MAX_ENTRIES)
+
+
+occurrence_cache: OccurrenceCache = get_occurrence_cache()
+
+# Entries are keyed by the visible eventTypes already, so role and permission changes do not reach them
+invalidation_bus.register(InvalidationNamespace.EVENTS, occurrence_cache.invalidate_event_types)
@@ -0,0 +1,55 @@
+import asyncio
+import typing
+
+import fastapi
+
+from app.cache.metrics import metrics_registry
+
+T = typing.TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one.
+
+    The first caller for a key starts the call, every caller arriving while it is in flight awaits the same
+    result. The call runs in its own task, so a caller that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.metrics = metrics_registry.get(name)
+        self._calls: dict[typing.Hashable, asyncio.Task] = {}
+
+    async def do(self, key: typing.Hashable, fn: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is not None:
+            self.metrics.record_hit()
+            return await asyncio.shield(task)
+
+        self.metrics.record_miss()
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._forget(key=key, task=task))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: typing.Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    @staticmethod
+    def request_key(request: fastapi.Request, scope: typing.Hashable) -> typing.Hashable:
+        """Identify a read by its route, parameters and the visibility scope of the caller"""
+        return (
+            request.scope["route"].path if "route" in request.scope else request.url.path,
+            tuple(sorted(request.path_params.items())),
+            tuple(sorted(request.query_params.multi_items())),
+            scope,
+        )
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    return SingleFlight(name=name)
+
+
+read_single_flight: SingleFlight = get_single_flight(name="single_flight")
@@ -0,0 +1,107 @@
+import collections
+import time
+import typing
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.cache.metrics import metrics_registry
+from app.config.manager import settings
+from app.models.db.user import User
+
+
+class UserCache:
+    """
+    Bounded TTL cache of authenticated users keyed by username.
+
+    Entries are detached copies without credentials. Unknown usernames, e.g. from forged tokens, are cached as
+    `None` with a shorter TTL.
+    """
+
+    def __init__(self, max_size: int, ttl: int, negative_ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.metrics = metrics_registry.get("users")
+        self.generation = 0
+        self._entries: collections.OrderedDict[str, tuple[float, User | None]] = collections.OrderedDict()
+        self._usernames_by_id: dict[int, str] = {}
+
+    @staticmethod
+    def detach(user: User) -> User:
+        return User(
+            id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            is_active=user.is_active,
+            profile_pic_url=user.profile_pic_url,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def get(self, username: str) -> tuple[bool, User | None]:
+        """Get `(hit, user)`, a hit with no user means the username is known not to exist"""
+        entry = self._entries.get(username)
+        if entry is None or entry[0] < time.monotonic():
+            self.metrics.record_miss()
+            return False, None
+
+        self._entries.move_to_end(username)
+        self.metrics.record_hit()
+        return True, entry[1]
+
+    def set(self, username: str, user: User | None, generation: int) -> None:
+        """Cache the lookup result, unless the cache was invalidated since `generation`"""
+        if generation != self.generation:
+            return
+
+        ttl = self.ttl if user is not None else self.negative_ttl
+        self.pop(username)
+        self._entries[username] = (time.monotonic() + ttl, self.detach(user) if user is not None else None)
+        if user is not None:
+            self._usernames_by_id[user.id] = username
+
+        while len(self._entries) > self.max_size:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, username: str) -> None:
+        entry = self._entries.pop(username, None)
+        if entry is not None and entry[1] is not None:
+            self._usernames_by_id.pop(entry[1].id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._usernames_by_id.clear()
+
+    def invalidate_user_ids(self, keys: list[typing.Any] | None) -> None:
+        self.generation += 1
+        if keys is None:
+            self.clear()
+            return
+
+        for user_id in keys:
+            username = self._usernames_by_id.get(user_id)
+            if username is not None:
+                self.pop(username)
+
+    def invalidate_usernames(self, keys: list[typing.Any] | None) -> None:
+        self.generation += 1
+        if keys is None:
+            self.clear()
+            return
+
+        for username in keys:
+            self.pop(username)
+
+
+def get_user_cache() -> UserCache:
+    return UserCache(
+        max_size=settings.USER_CACHE_MAX_SIZE,
+        ttl=settings.USER_CACHE_TTL,
+        negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+    )
+
+
+user_cache: UserCache = get_user_cache()
+
+invalidation_bus.register(InvalidationNamespace.USERS, user_cache.invalidate_user_ids)
+invalidation_bus.register(InvalidationNamespace.USERNAMES, user_cache.invalidate_usernames)
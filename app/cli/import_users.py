@@ -0,0 +1,50 @@
+"""
+Import users from a CSV or JSON file, straight into the database.
+
+    python -m app.cli.import_users members.csv
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database.database import async_db
+from app.services.user_import import parse_user_import, UserImportService
+from app.utilities.exceptions.upload import InvalidImportFile
+from app.utilities.executors.process_pool import process_pool
+
+
+async def import_users(path: str) -> int:
+    with open(path, "rb") as file_object:
+        content = file_object.read()
+
+    try:
+        records = parse_user_import(content=content, filename=path)
+    except InvalidImportFile as e:
+        print(f"{path}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        async with async_db.get_session() as async_session:
+            results = await UserImportService(async_session=async_session).import_users(records=records)
+    finally:
+        await process_pool.shutdown()
+        await async_db.async_engine.dispose()
+
+    failed = [result for result in results if result.user is None]
+    for result in failed:
+        print(f"User {result.index + 1}: {result.status_code} {result.detail}", file=sys.stderr)
+    print(f"Imported {len(results) - len(failed)} of {len(results)} users")
+
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import users from a CSV or JSON file")
+    parser.add_argument("path", help="CSV file with a header row, or JSON array of users")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(import_users(path=args.path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Maintain the yearly partitions of the events, meant to run from cron.
+
+    python -m app.cli.partitions create --years-ahead 2
+    python -m app.cli.partitions archive --keep-years 3
+"""
+import argparse
+import asyncio
+import sys
+
+from app.config.manager import settings
+from app.database.database import async_db
+from app.database.partitions import archive_event_partitions, create_event_partitions
+
+
+async def create(years_ahead: int) -> int:
+    try:
+        async with async_db.get_session() as async_session:
+            created = await create_event_partitions(async_session=async_session, years_ahead=years_ahead)
+    finally:
+        await async_db.async_engine.dispose()
+
+    print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+
+    return 0
+
+
+async def archive(keep_years: int, schema: str) -> int:
+    try:
+        async with async_db.get_session() as async_session:
+            archived = await archive_event_partitions(
+                async_session=async_session, keep_years=keep_years, schema=schema
+            )
+    finally:
+        await async_db.async_engine.dispose()
+
+    print(f"Archived {len(archived)} partitions into {schema}: {', '.join(archived) or '-'}")
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the yearly partitions of the events")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = commands.add_parser("create", help="Create the partitions of the next years")
+    create_parser.add_argument("--years-ahead", type=int, default=settings.EVENT_PARTITION_YEARS_AHEAD)
+
+    archive_parser = commands.add_parser("archive", help="Detach the partitions of past years")
+    archive_parser.add_argument("--keep-years", type=int, default=settings.EVENT_ARCHIVE_KEEP_YEARS)
+    archive_parser.add_argument("--schema", default=settings.EVENT_ARCHIVE_SCHEMA)
+    args = parser.parse_args()
+
+    if args.command == "create":
+        sys.exit(asyncio.run(create(years_ahead=args.years_ahead)))
+    sys.exit(asyncio.run(archive(keep_years=args.keep_years, schema=args.schema)))
+
+
+if __name__ == "__main__":
+    main()
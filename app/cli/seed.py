@@ -0,0 +1,57 @@
+"""
+Seed the roles, event types and permissions the API relies on, and the super user.
+
+    python -m app.cli.seed
+    python -m app.cli.seed --spec seed.json --no-super-user
+    python -m app.cli.seed --force
+
+Permissions already in the database are kept, unless `--force` resets them to the spec.
+"""
+import argparse
+import asyncio
+import sys
+
+import pydantic
+
+from app.config.manager import settings
+from app.database.database import async_db
+from app.database.seed import apply_seed, DEFAULT_SEED, SeedSpec
+
+
+async def seed(spec: SeedSpec, with_super_user: bool, force: bool) -> int:
+    try:
+        async with async_db.get_session() as async_session:
+            await apply_seed(
+                async_session=async_session,
+                spec=spec,
+                super_user=(settings.SUPER_USER, settings.SUPER_PASS) if with_super_user else None,
+                overwrite_permissions=force,
+            )
+    finally:
+        await async_db.async_engine.dispose()
+
+    print(f"Seeded {len(spec.roles) + 1} roles and {len(spec.event_types)} event types")
+
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed roles, event types and permissions")
+    parser.add_argument("--spec", help="JSON seed spec, the built-in one by default")
+    parser.add_argument("--no-super-user", action="store_true", help="Do not create the super user")
+    parser.add_argument("--force", action="store_true", help="Reset the existing permissions to the spec")
+    args = parser.parse_args()
+
+    spec = DEFAULT_SEED
+    if args.spec:
+        try:
+            spec = SeedSpec.parse_file(args.spec)
+        except (OSError, pydantic.ValidationError) as e:
+            print(f"{args.spec}: {e}", file=sys.stderr)
+            sys.exit(2)
+
+    sys.exit(asyncio.run(seed(spec=spec, with_super_user=not args.no_super_user, force=args.force)))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,22 @@ import typing
 import fastapi
 from loguru import logger
 
-from app.database.events import init_db_connection, close_db_connection
+from app.cache.events import init_cache, close_cache
+from app.config.manager import settings
+from app.database.events import init_db_connection, init_partitions, init_seed, close_db_connection
+from app.storage.events import init_storage, close_storage
+from app.utilities.executors.events import init_process_pool, close_process_pool
 
 
 def startup_handler(app: fastapi.FastAPI) -> typing.Any:
     async def startup() -> None:
         await init_db_connection(app=app)
+        await init_partitions(app=app)
+        await init_cache(app=app)
+        if settings.SEED_ON_STARTUP:
+            await init_seed(app=app)
+        await init_process_pool(app=app)
+        await init_storage(app=app)
 
     return startup
 
@@ -16,6 +26,9 @@ def startup_handler(app: fastapi.FastAPI) -> typing.Any:
 def shutdown_handler(app: fastapi.FastAPI) -> typing.Any:
     @logger.catch
     async def shutdown() -> None:
+        await close_storage(app=app)
+        await close_process_pool(app=app)
+        await close_cache(app=app)
         await close_db_connection(app=app)
 
     return shutdown
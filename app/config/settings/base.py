@@ -24,7 +24,33 @@ class BaseSettings(pydantic.BaseSettings):
     OPENAPI_URL: str = "/openapi.json"
     REDOC_URL: str = "/redoc"
     OPENAPI_PREFIX: str = ""
+    EVENT_BATCH_MAX_ITEMS: int = decouple.config("EVENT_BATCH_MAX_ITEMS", cast=int, default=500)  # type: ignore
+    EVENT_SEARCH_MAX_LIMIT: int = decouple.config("EVENT_SEARCH_MAX_LIMIT", cast=int, default=100)  # type: ignore
+    EVENT_PAGE_MAX_LIMIT: int = decouple.config("EVENT_PAGE_MAX_LIMIT", cast=int, default=200)  # type: ignore
+    EVENT_WINDOW_MAX_DAYS: int = decouple.config("EVENT_WINDOW_MAX_DAYS", cast=int, default=3660)  # type: ignore
+    EVENT_SUMMARY_MAX_MONTHS: int = decouple.config("EVENT_SUMMARY_MAX_MONTHS", cast=int, default=120)  # type: ignore
+    # Yearly partitions of EVENT, created ahead at startup and archived by `app.cli.partitions`
+    EVENT_PARTITION_YEARS_AHEAD: int = decouple.config("EVENT_PARTITION_YEARS_AHEAD", cast=int, default=2)  # type: ignore
+    EVENT_ARCHIVE_KEEP_YEARS: int = decouple.config("EVENT_ARCHIVE_KEEP_YEARS", cast=int, default=3)  # type: ignore
+    EVENT_ARCHIVE_SCHEMA: str = decouple.config("EVENT_ARCHIVE_SCHEMA", cast=str, default="archive")  # type: ignore
+    USER_IMPORT_MAX_ROWS: int = decouple.config("USER_IMPORT_MAX_ROWS", cast=int, default=5000)  # type: ignore
+    SEED_ON_STARTUP: bool = decouple.config("SEED_ON_STARTUP", cast=bool, default=False)  # type: ignore
     ASSETS_PATH: str = decouple.config("ASSETS_PATH", cast=str, default=str("../assets"))
+    PROFILE_PIC_MAX_BYTES: int = decouple.config("PROFILE_PIC_MAX_BYTES", cast=int, default=10 * 1024 * 1024)  # type: ignore
+    PROCESS_POOL_MAX_WORKERS: int = decouple.config("PROCESS_POOL_MAX_WORKERS", cast=int, default=2)  # type: ignore
+    ASSET_GC_INTERVAL: int = decouple.config("ASSET_GC_INTERVAL", cast=int, default=3600)  # type: ignore
+    ASSET_GC_GRACE_PERIOD: int = decouple.config("ASSET_GC_GRACE_PERIOD", cast=int, default=24 * 3600)  # type: ignore
+    ASSET_GC_BATCH_SIZE: int = decouple.config("ASSET_GC_BATCH_SIZE", cast=int, default=500)  # type: ignore
+
+    # Storage, "local" keeps assets under ASSETS_PATH, "s3" in an S3 compatible bucket
+    STORAGE_BACKEND: str = decouple.config("STORAGE_BACKEND", cast=str, default="local")  # type: ignore
+    S3_ENDPOINT_URL: str = decouple.config("S3_ENDPOINT_URL", cast=str, default="")  # type: ignore
+    S3_REGION: str = decouple.config("S3_REGION", cast=str, default="us-east-1")  # type: ignore
+    S3_BUCKET: str = decouple.config("S3_BUCKET", cast=str, default="")  # type: ignore
+    S3_ACCESS_KEY_ID: str = decouple.config("S3_ACCESS_KEY_ID", cast=str, default="")  # type: ignore
+    S3_SECRET_ACCESS_KEY: str = decouple.config("S3_SECRET_ACCESS_KEY", cast=str, default="")  # type: ignore
+    S3_MULTIPART_PART_SIZE: int = decouple.config("S3_MULTIPART_PART_SIZE", cast=int, default=8 * 1024 * 1024)  # type: ignore
+    S3_PRESIGN_EXPIRES: int = decouple.config("S3_PRESIGN_EXPIRES", cast=int, default=3600)  # type: ignore
 
     # Discord
     DISCORD_CLIENT_ID: str = decouple.config("DISCORD_CLIENT_ID", cast=str)  # type: ignore
@@ -53,6 +79,20 @@ class BaseSettings(pydantic.BaseSettings):
     IS_DB_FORCE_ROLLBACK: bool = decouple.config("IS_DB_FORCE_ROLLBACK", cast=bool)  # type: ignore
     IS_DB_EXPIRE_ON_COMMIT: bool = decouple.config("IS_DB_EXPIRE_ON_COMMIT", cast=bool)  # type: ignore
 
+    # Cache
+    CACHE_INVALIDATION_CHANNEL: str = decouple.config("CACHE_INVALIDATION_CHANNEL", cast=str, default="cache_invalidation")  # type: ignore
+    CACHE_INVALIDATION_RECONNECT_DELAY: int = decouple.config("CACHE_INVALIDATION_RECONNECT_DELAY", cast=int, default=5)  # type: ignore
+    CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL: int = decouple.config("CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL", cast=int, default=30)  # type: ignore
+    USER_CACHE_MAX_SIZE: int = decouple.config("USER_CACHE_MAX_SIZE", cast=int, default=1024)  # type: ignore
+    USER_CACHE_TTL: int = decouple.config("USER_CACHE_TTL", cast=int, default=60)  # type: ignore
+    USER_CACHE_NEGATIVE_TTL: int = decouple.config("USER_CACHE_NEGATIVE_TTL", cast=int, default=30)  # type: ignore
+    CALENDAR_CACHE_MAX_BYTES: int = decouple.config("CALENDAR_CACHE_MAX_BYTES", cast=int, default=16 * 1024 * 1024)  # type: ignore
+    CALENDAR_CACHE_SOFT_TTL: int = decouple.config("CALENDAR_CACHE_SOFT_TTL", cast=int, default=30)  # type: ignore
+    CALENDAR_CACHE_HARD_TTL: int = decouple.config("CALENDAR_CACHE_HARD_TTL", cast=int, default=600)  # type: ignore
+    OCCURRENCE_CACHE_MAX_ENTRIES: int = decouple.config("OCCURRENCE_CACHE_MAX_ENTRIES", cast=int, default=512)  # type: ignore
+    OCCURRENCE_WINDOW_MAX_DAYS: int = decouple.config("OCCURRENCE_WINDOW_MAX_DAYS", cast=int, default=400)  # type: ignore
+    AVAILABILITY_WINDOW_MAX_DAYS: int = decouple.config("AVAILABILITY_WINDOW_MAX_DAYS", cast=int, default=400)  # type: ignore
+
     # Security
     API_TOKEN: str = decouple.config("API_TOKEN", cast=str)  # type: ignore
     AUTH_TOKEN: str = decouple.config("AUTH_TOKEN", cast=str)  # type: ignore
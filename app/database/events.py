@@ -7,7 +7,10 @@ from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.pool.base import _ConnectionRecord
 
+from app.config.manager import settings
 from app.database.database import async_db
+from app.database.partitions import create_event_partitions
+from app.database.seed import apply_seed
 from app.database.table import Base
 
 
@@ -46,6 +49,26 @@ async def init_db_connection(app: fastapi.FastAPI) -> None:
     logger.info("Database Connection --- Successfully Established!")
 
 
+async def init_partitions(app: fastapi.FastAPI) -> None:
+    logger.info("Event Partitions --- Creating . . .")
+
+    async with app.state.db.get_session() as async_session:  # type: ignore
+        created = await create_event_partitions(
+            async_session=async_session, years_ahead=settings.EVENT_PARTITION_YEARS_AHEAD
+        )
+
+    logger.info(f"Event Partitions --- Created {len(created)} partitions!")
+
+
+async def init_seed(app: fastapi.FastAPI) -> None:
+    logger.info("Database Seed --- Seeding . . .")
+
+    async with app.state.db.get_session() as async_session:  # type: ignore
+        await apply_seed(async_session=async_session, super_user=(settings.SUPER_USER, settings.SUPER_PASS))
+
+    logger.info("Database Seed --- Successfully Seeded!")
+
+
 async def close_db_connection(app: fastapi.FastAPI) -> None:
     logger.info("Database Connection --- Disposing . . .")
 
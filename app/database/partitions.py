@@ -0,0 +1,163 @@
+import datetime
+import re
+import typing
+
+import sqlalchemy
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.repositories.event_summary import EventSummaryRepository
+
+# Key of the advisory lock that keeps workers maintaining the partitions at the same time from racing their DDL
+PARTITION_LOCK_ID = 0x70617274
+
+DEFAULT_PARTITION = "EVENT_DEFAULT"
+PARTITION_NAME_PATTERN = re.compile(r"^EVENT_(\d{4})$")
+
+PARTITIONS_STMT = sqlalchemy.text(
+    'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+    'WHERE i.inhparent = \'"EVENT"\'::regclass'
+)
+
+
+def partition_name(year: int) -> str:
+    return f"EVENT_{year}"
+
+
+def partition_bounds(year: int) -> tuple[datetime.datetime, datetime.datetime]:
+    """Start and end of the partition of the year, in UTC like the dates of events"""
+    return (
+        datetime.datetime(year, 1, 1, tzinfo=datetime.timezone.utc),
+        datetime.datetime(year + 1, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+
+
+def partition_years(names: typing.Iterable[str]) -> list[int]:
+    """Years of the yearly partitions among the names, the default partition is left out"""
+    return sorted(int(match.group(1)) for match in map(PARTITION_NAME_PATTERN.match, names) if match)
+
+
+def years_to_create(existing: typing.Iterable[int], current_year: int, years_ahead: int) -> list[int]:
+    """The current year and the `years_ahead` next ones, unless they have a partition already"""
+    existing = set(existing)
+    return [year for year in range(current_year, current_year + years_ahead + 1) if year not in existing]
+
+
+def years_to_archive(existing: typing.Iterable[int], current_year: int, keep_years: int) -> list[int]:
+    """The years before the current one and the `keep_years` previous ones"""
+    return sorted(year for year in existing if year < current_year - keep_years)
+
+
+async def create_event_partitions(
+        async_session: SQLAlchemyAsyncSession,
+        years_ahead: int,
+        today: datetime.date | None = None,
+) -> list[str]:
+    """
+    Create the missing partitions of EVENT for the current year and the `years_ahead` next ones.
+
+    A year some events of the default partition fall in is skipped, postgres refuses to create its partition
+    while the default one holds rows of it, returns the names of the created partitions.
+    """
+    current_year = (today or datetime.datetime.now(tz=datetime.timezone.utc).date()).year
+    logger.info(f"Creating partitions of events from {current_year} to {current_year + years_ahead}")
+
+    created = []
+    try:
+        await async_session.execute(sqlalchemy.select(sqlalchemy.func.pg_advisory_xact_lock(PARTITION_LOCK_ID)))
+        existing = partition_years(await async_session.scalars(PARTITIONS_STMT))
+
+        for year in years_to_create(existing=existing, current_year=current_year, years_ahead=years_ahead):
+            start, end = partition_bounds(year=year)
+            in_default_stmt = sqlalchemy.text(
+                f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                f'WHERE "START_DATE" >= :start AND "START_DATE" < :end)'
+            )
+            if await async_session.scalar(in_default_stmt, {"start": start, "end": end}):
+                logger.warning(f"Events of {year} are in the default partition, not creating its partition")
+                continue
+
+            # Years are integers, so safe in the DDL
+            await async_session.execute(sqlalchemy.text(
+                f'CREATE TABLE "{partition_name(year=year)}" PARTITION OF "EVENT" '
+                f'FOR VALUES FROM (\'{start.isoformat()}\') TO (\'{end.isoformat()}\')'
+            ))
+            created.append(partition_name(year=year))
+        await async_session.commit()
+    except Exception as e:
+        await async_session.rollback()
+        raise e
+
+    logger.info(f"Created partitions {created}")
+
+    return created
+
+
+async def archive_event_partitions(
+        async_session: SQLAlchemyAsyncSession,
+        keep_years: int,
+        schema: str,
+        today: datetime.date | None = None,
+) -> list[str]:
+    """
+    Detach the partitions of EVENT older than the `keep_years` previous years into `schema`.
+
+    Archived events leave every query of the API, monthly summaries included, but stay in the database. A
+    partition with a recurring event is kept, its occurrences go on after its first year. Old events of the
+    default partition can not be detached, they are only reported. Returns the names of the archived partitions.
+    """
+    current_year = (today or datetime.datetime.now(tz=datetime.timezone.utc).date()).year
+    cutoff, _ = partition_bounds(year=current_year - keep_years)
+    logger.info(f"Archiving partitions of events before {current_year - keep_years} into {schema}")
+
+    summary_repo = EventSummaryRepository(async_session=async_session)
+    archived = []
+    try:
+        await async_session.execute(sqlalchemy.select(sqlalchemy.func.pg_advisory_xact_lock(PARTITION_LOCK_ID)))
+        existing = partition_years(await async_session.scalars(PARTITIONS_STMT))
+        await async_session.execute(sqlalchemy.text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+
+        in_default_stmt = sqlalchemy.text(
+            f'SELECT DISTINCT EXTRACT(YEAR FROM "START_DATE" AT TIME ZONE \'UTC\')::integer '
+            f'FROM "{DEFAULT_PARTITION}" WHERE "START_DATE" < :cutoff ORDER BY 1'
+        )
+        default_years = list(await async_session.scalars(in_default_stmt, {"cutoff": cutoff}))
+        if default_years:
+            logger.warning(
+                f"Events of {default_years} are in the default partition, not archiving them, "
+                f"move them into partitions of their years to archive them"
+            )
+
+        for year in years_to_archive(existing=existing, current_year=current_year, keep_years=keep_years):
+            name = partition_name(year=year)
+            recurring_stmt = sqlalchemy.text(
+                f'SELECT EXISTS (SELECT 1 FROM "{name}" WHERE "RECURRENCE_RULE" IS NOT NULL)'
+            )
+            if await async_session.scalar(recurring_stmt):
+                logger.warning(f"Partition {name} has recurring events, not archiving it")
+                continue
+
+            # Only recurring events have overrides, so no foreign key references the detached events
+            await async_session.execute(sqlalchemy.text(f'ALTER TABLE "EVENT" DETACH PARTITION "{name}"'))
+
+            # Read once detached, no event can be written to it anymore, and taken out of their months like deleted
+            # events
+            spans_stmt = sqlalchemy.text(f'SELECT "EVENT_TYPE", "START_DATE", "END_DATE" FROM "{name}"')
+            spans = (await async_session.execute(spans_stmt)).all()
+            await summary_repo.apply_event_changes(removed=[tuple(span) for span in spans])
+
+            await async_session.execute(sqlalchemy.text(f'ALTER TABLE "{name}" SET SCHEMA "{schema}"'))
+            archived.append(name)
+
+        if archived:
+            await summary_repo.delete_empty_summaries()
+            await invalidation_bus.publish(async_session, InvalidationNamespace.EVENTS)
+        await async_session.commit()
+    except Exception as e:
+        await async_session.rollback()
+        raise e
+
+    logger.info(f"Archived partitions {archived}")
+
+    return archived
@@ -0,0 +1,173 @@
+import typing
+
+import pydantic
+import sqlalchemy
+from loguru import logger
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from sqlalchemy.sql import functions as sqlalchemy_functions
+
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.models.db.event_type import EventType
+from app.models.db.role import Role
+from app.models.db.role_event_type import Permission, RoleEventType
+from app.models.db.user import User
+from app.models.db.user_role import user_roles
+from app.security.hashing.password import pass_generator
+
+# Key of the advisory lock that keeps workers seeding at the same startup from interleaving their upserts
+SEED_LOCK_ID = 0x73656564
+
+
+class Grant(pydantic.BaseModel):
+    can_see: bool = True
+    can_add: bool = False
+    can_edit: bool = False
+
+
+SEE = Grant()
+FULL = Grant(can_see=True, can_add=True, can_edit=True)
+
+
+class SeedSpec(pydantic.BaseModel):
+    """
+    Roles, event types and the permissions of roles on event types that the database must contain.
+
+    Applying a spec only adds or updates what it declares, rows and permissions it does not mention are kept.
+    """
+    roles: list[str]
+    # Event type name to description
+    event_types: dict[str, str]
+    # Role name to event type name to grant
+    permissions: dict[str, dict[str, Grant]]
+    # Role given to the super user, with every permission on every event type
+    super_role: str
+
+    @pydantic.root_validator(skip_on_failure=True)
+    def check_references(cls, values: dict) -> dict:
+        roles, event_types = set(values["roles"]) | {values["super_role"]}, set(values["event_types"])
+        for role, grants in values["permissions"].items():
+            if role not in roles:
+                raise ValueError(f"Permissions of undeclared role {role}")
+            if not set(grants) <= event_types:
+                raise ValueError(f"Permissions of {role} on undeclared event types {set(grants) - event_types}")
+        return values
+
+    def permission_rows(self) -> list[tuple[str, str, Grant]]:
+        rows = {(self.super_role, event_type): FULL for event_type in self.event_types}
+        for role, grants in self.permissions.items():
+            rows.update({(role, event_type): grant for event_type, grant in grants.items()})
+        return [(role, event_type, grant) for (role, event_type), grant in rows.items()]
+
+
+DEFAULT_SEED = SeedSpec(
+    roles=["chefleitung", "chef", "chefassistent", "committee", "chalet"],
+    event_types={
+        "scout_event": "Pfadfindertermine",
+        "committee_event": "Vorstandtermine",
+        "chalet": "Chaletvermietung",
+    },
+    permissions={
+        "chefleitung": {"scout_event": FULL, "committee_event": SEE, "chalet": SEE},
+        "chef": {"scout_event": FULL},
+        "chefassistent": {"scout_event": SEE, "chalet": SEE},
+        "committee": {"scout_event": SEE, "committee_event": FULL, "chalet": SEE},
+        "chalet": {"chalet": FULL},
+    },
+    super_role="super",
+)
+
+
+async def apply_seed(
+        async_session: SQLAlchemyAsyncSession,
+        spec: SeedSpec = DEFAULT_SEED,
+        super_user: tuple[str, str] | None = None,
+        overwrite_permissions: bool = False,
+) -> None:
+    """
+    Upsert the roles, event types and permissions of `spec`, and the `(username, password)` super user if given.
+
+    Idempotent, every table is written with one multi-row INSERT ... ON CONFLICT, all in one transaction. Existing
+    permissions are only reset to the spec with `overwrite_permissions`, so that the changes made to them through
+    the API survive the seed applied at every startup.
+    """
+    logger.info(f"Seeding {len(spec.roles) + 1} roles and {len(spec.event_types)} event types")
+
+    await async_session.execute(sqlalchemy.select(sqlalchemy.func.pg_advisory_xact_lock(SEED_LOCK_ID)))
+
+    role_names = list(dict.fromkeys([spec.super_role, *spec.roles]))
+    roles_stmt = postgresql.insert(Role).values([{"name": name} for name in role_names])
+    roles_stmt = roles_stmt.on_conflict_do_update(
+        index_elements=[Role.name], set_={"NAME": roles_stmt.excluded.NAME}
+    ).returning(Role.id, Role.name)
+
+    event_types_stmt = postgresql.insert(EventType).values([
+        {"name": name, "description": description} for name, description in spec.event_types.items()
+    ])
+    event_types_stmt = event_types_stmt.on_conflict_do_update(
+        index_elements=[EventType.name], set_={"DESCRIPTION": event_types_stmt.excluded.DESCRIPTION}
+    ).returning(EventType.id, EventType.name)
+
+    try:
+        # DO UPDATE rather than DO NOTHING, so existing rows are returned with their ids as well
+        role_ids: dict[str, int] = dict((name, _id) for _id, name in await async_session.execute(roles_stmt))
+        event_type_ids: dict[str, int] = dict(
+            (name, _id) for _id, name in await async_session.execute(event_types_stmt)
+        )
+
+        permissions_stmt = postgresql.insert(RoleEventType).values([
+            {
+                "role_id": role_ids[role],
+                "event_type_id": event_type_ids[event_type],
+                "permissions": Permission.from_flags(
+                    can_edit=grant.can_edit, can_see=grant.can_see, can_add=grant.can_add
+                ),
+            }
+            for role, event_type, grant in spec.permission_rows()
+        ])
+        if overwrite_permissions:
+            permissions_stmt = permissions_stmt.on_conflict_do_update(
+                index_elements=[RoleEventType.role_id, RoleEventType.event_type_id],
+                set_={"PERMISSIONS": permissions_stmt.excluded.PERMISSIONS},
+            )
+        else:
+            permissions_stmt = permissions_stmt.on_conflict_do_nothing(
+                index_elements=[RoleEventType.role_id, RoleEventType.event_type_id],
+            )
+        await async_session.execute(permissions_stmt)
+
+        if super_user is not None:
+            await _seed_super_user(
+                async_session=async_session, username=super_user[0], password=super_user[1],
+                role_id=role_ids[spec.super_role],
+            )
+
+        await invalidation_bus.publish(async_session, InvalidationNamespace.ROLES)
+        await invalidation_bus.publish(async_session, InvalidationNamespace.EVENT_TYPES)
+        await invalidation_bus.publish(async_session, InvalidationNamespace.PERMISSIONS, role_ids.values())
+        await async_session.commit()
+    except Exception as e:
+        await async_session.rollback()
+        raise e
+
+    logger.info("Seeding complete")
+
+
+async def _seed_super_user(async_session: SQLAlchemyAsyncSession, username: str, password: str, role_id: int) -> None:
+    user_id: int | None = await async_session.scalar(sqlalchemy.select(User.id).where(User.username == username))
+    if user_id is None:
+        # Only hashed when the user is missing, so applying the seed again stays cheap
+        salt = pass_generator.generate_salt
+        user_stmt = postgresql.insert(User).values(
+            username=username,
+            _hashed_password=pass_generator.generate_hashed_password(salt=salt, password=password),
+            _hash_salt=salt,
+            created_at=sqlalchemy_functions.now(),
+        ).on_conflict_do_update(index_elements=[User.username], set_={"USERNAME": username}).returning(User.id)
+        user_id = typing.cast(int, await async_session.scalar(user_stmt))
+        await invalidation_bus.publish(async_session, InvalidationNamespace.USERNAMES, [username])
+
+    await async_session.execute(
+        postgresql.insert(user_roles).values(USER_ID=user_id, ROLE_ID=role_id).on_conflict_do_nothing()
+    )
+    await invalidation_bus.publish(async_session, InvalidationNamespace.USER_ROLES, [user_id])
@@ -2,10 +2,21 @@ import datetime
 
 import sqlalchemy
 from sqlalchemy import ForeignKey
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
 
 from app.database.table import Base
 
+# Half-open, so back-to-back bookings do not overlap, and empty when the event ends before it starts
+PERIOD_EXPRESSION = 'tstzrange("START_DATE", greatest("START_DATE", "END_DATE"), \'[)\')'
+
+# Events mix languages, so words are indexed as written without stemming
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(\"TITLE\", '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(\"DESCRIPTION\", '')), 'B')"
+)
+
 
 class Event(Base):
     """Event table."""
@@ -31,14 +42,35 @@ class Event(Base):
         sqlalchemy.String(length=1024),
         nullable=True,
         name="DESCRIPTION")
+    # Partition key, so part of the primary key of the table although events are identified by their id alone
     start_date: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
         sqlalchemy.DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         name="START_DATE")
     end_date: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
         sqlalchemy.DateTime(timezone=True),
         nullable=False,
         name="END_DATE")
+    # RRULE of a recurring event, whose first occurrence is `start_date` to `end_date`
+    recurrence_rule: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.String(length=1024),
+        nullable=True,
+        name="RECURRENCE_RULE")
+    # Maintained by postgres from the title and description, only read by searches
+    search_vector: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        postgresql.TSVECTOR,
+        sqlalchemy.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+        name="SEARCH_VECTOR")
+    # Maintained by postgres from the dates, for overlap queries and the exclusivity check of event types
+    period: SQLAlchemyMapped[postgresql.Range[datetime.datetime]] = sqlalchemy_mapped_column(
+        postgresql.TSTZRANGE,
+        sqlalchemy.Computed(PERIOD_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+        name="PERIOD")
     created_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
         sqlalchemy.DateTime(timezone=True),
         nullable=True,
@@ -49,4 +81,61 @@ class Event(Base):
         server_onupdate=sqlalchemy.schema.FetchedValue(for_update=True),
         name="UPDATED_AT")
 
-    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        sqlalchemy.Index("EVENT_SEARCH_VECTOR_idx", "SEARCH_VECTOR", postgresql_using="gin"),
+        # Covers the availability queries, which then only read the index
+        sqlalchemy.Index(
+            "EVENT_TYPE_PERIOD_idx", "EVENT_TYPE", "PERIOD", postgresql_using="gist", postgresql_include=["ID"]
+        ),
+        # Upcoming events of an eventType and the events of a creator by start, read from the index alone
+        sqlalchemy.Index("EVENT_TYPE_START_DATE_idx", "EVENT_TYPE", "START_DATE", "ID"),
+        sqlalchemy.Index("EVENT_CREATED_BY_START_DATE_idx", "CREATED_BY", "START_DATE", "ID"),
+        # Recurring events that began in the past, still upcoming while their series goes on
+        sqlalchemy.Index(
+            "EVENT_TYPE_RECURRING_idx", "EVENT_TYPE", "START_DATE",
+            postgresql_where=sqlalchemy.text('"RECURRENCE_RULE" IS NOT NULL'),
+        ),
+        # One partition per year, see `app.database.partitions`
+        {"postgresql_partition_by": 'RANGE ("START_DATE")'},
+    )
+    __mapper_args__ = {"eager_defaults": True, "primary_key": ["id"]}
+
+
+# Key of the advisory locks that serialize the writes to the events of an exclusive event type
+EXCLUSIVE_LOCK_ID = 0x65786373
+
+# Exclusion constraints of a partitioned table must include the partition key, so overlaps across partitions of
+# an exclusive event type are rejected by this trigger instead, with the sqlstate of an exclusion violation
+EXCLUSIVE_CHECK_FUNCTION_DDL = f'''
+CREATE OR REPLACE FUNCTION "EVENT_check_exclusive"() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM "EVENT_TYPE" WHERE "ID" = NEW."EVENT_TYPE" AND "IS_EXCLUSIVE") THEN
+        PERFORM pg_advisory_xact_lock({EXCLUSIVE_LOCK_ID}, NEW."EVENT_TYPE");
+        IF EXISTS (
+            SELECT 1 FROM "EVENT"
+            WHERE "EVENT_TYPE" = NEW."EVENT_TYPE" AND "ID" <> NEW."ID" AND "PERIOD" && NEW."PERIOD"
+        ) THEN
+            RAISE EXCEPTION 'Event overlaps another event of its exclusive event type'
+                USING ERRCODE = 'exclusion_violation';
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+EXCLUSIVE_CHECK_TRIGGER_DDL = '''
+CREATE TRIGGER "EVENT_exclusive_trg"
+AFTER INSERT OR UPDATE OF "EVENT_TYPE", "START_DATE", "END_DATE" ON "EVENT"
+FOR EACH ROW EXECUTE FUNCTION "EVENT_check_exclusive"()
+'''
+
+# GiST indexes on the integer EVENT_TYPE need the btree operators of this extension
+sqlalchemy.event.listen(
+    Event.__table__, "before_create", sqlalchemy.DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
+# Events outside of the yearly partitions land in the default one
+sqlalchemy.event.listen(
+    Event.__table__, "after_create", sqlalchemy.DDL('CREATE TABLE "EVENT_DEFAULT" PARTITION OF "EVENT" DEFAULT')
+)
+sqlalchemy.event.listen(Event.__table__, "after_create", sqlalchemy.DDL(EXCLUSIVE_CHECK_FUNCTION_DDL))
+sqlalchemy.event.listen(Event.__table__, "after_create", sqlalchemy.DDL(EXCLUSIVE_CHECK_TRIGGER_DDL))
@@ -0,0 +1,38 @@
+import datetime
+
+import sqlalchemy
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
+
+from app.database.table import Base
+
+
+class EventMonthSummary(Base):
+    """Event month summary table, the events of an event type per month in the configured timezone."""
+    __tablename__ = "EVENT_MONTH_SUMMARY"
+
+    event_type: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        ForeignKey("EVENT_TYPE.ID", ondelete="CASCADE"),
+        primary_key=True,
+        name="EVENT_TYPE")
+    # First day of the month
+    month: SQLAlchemyMapped[datetime.date] = sqlalchemy_mapped_column(
+        sqlalchemy.Date,
+        primary_key=True,
+        name="MONTH")
+    # Events starting in the month, a recurring event counts once in the month of its first occurrence
+    event_count: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.Integer,
+        nullable=False,
+        default=0,
+        name="EVENT_COUNT")
+    # Seconds of the month covered by events, overlapping events count each
+    booked_seconds: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger,
+        nullable=False,
+        default=0,
+        name="BOOKED_SECONDS")
+    updated_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        name="UPDATED_AT")
@@ -0,0 +1,65 @@
+import datetime
+
+import sqlalchemy
+from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
+
+from app.database.table import Base
+
+
+class EventOverride(Base):
+    """Event override table, one row per cancelled or modified occurrence of a recurring event."""
+    __tablename__ = "EVENT_OVERRIDE"
+
+    event_id: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        primary_key=True,
+        name="EVENT_ID")
+    # Start of the event, the foreign key must hold the partition key of EVENT and follows it when it moves
+    event_start_date: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        name="EVENT_START_DATE")
+    # Start of the occurrence as generated by the recurrence rule, identifies it even once moved
+    original_start: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        primary_key=True,
+        name="ORIGINAL_START")
+    is_cancelled: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
+        sqlalchemy.Boolean,
+        nullable=False,
+        default=False,
+        name="IS_CANCELLED")
+    title: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.String(length=1024),
+        nullable=True,
+        name="TITLE")
+    description: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.String(length=1024),
+        nullable=True,
+        name="DESCRIPTION")
+    start_date: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        name="START_DATE")
+    end_date: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        name="END_DATE")
+    created_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        name="CREATED_AT")
+    updated_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        name="UPDATED_AT")
+
+    __table_args__ = (
+        sqlalchemy.ForeignKeyConstraint(
+            ["EVENT_ID", "EVENT_START_DATE"],
+            ["EVENT.ID", "EVENT.START_DATE"],
+            name="EVENT_OVERRIDE_EVENT_fkey",
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
@@ -20,7 +20,15 @@ class EventType(Base):
         sqlalchemy.String(length=1024),
         nullable=True,
         name="DESCRIPTION")
+    # Whether events of this type may not overlap, enforced by the exclusivity trigger of EVENT
+    is_exclusive: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
+        sqlalchemy.Boolean,
+        nullable=False,
+        default=False,
+        server_default=sqlalchemy.false(),
+        name="IS_EXCLUSIVE")
 
     # role_event_types = sqlalchemy_relationship("RoleEventType", back_populates="event_type")
 
+    __table_args__ = (sqlalchemy.Index("EVENT_TYPE_NAME_idx", "NAME", unique=True),)
     __mapper_args__ = {"eager_defaults": True}
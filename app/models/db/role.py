@@ -20,4 +20,5 @@ class Role(Base):
     # users = sqlalchemy_relationship("User", secondary=user_roles, back_populates="roles")
     # role_event_types = sqlalchemy_relationship("RoleEventType", back_populates="role")
 
+    __table_args__ = (sqlalchemy.Index("ROLE_NAME_idx", "NAME", unique=True),)
     __mapper_args__ = {"eager_defaults": True}
@@ -1,9 +1,54 @@
+import enum
+
 import sqlalchemy
 from sqlalchemy import ForeignKey
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
 from app.database.table import Base
 
 
+class Permission(enum.IntFlag):
+    """Actions allowed on the events of an event type, named like the actions of the permission checks"""
+    EDIT = 1
+    SEE = 2
+    ADD = 4
+
+    @classmethod
+    def from_flags(cls, can_edit: bool | None, can_see: bool | None, can_add: bool | None) -> "Permission":
+        permission = cls(0)
+        for flag, granted in ((cls.EDIT, can_edit), (cls.SEE, can_see), (cls.ADD, can_add)):
+            if granted:
+                permission |= flag
+        return permission
+
+
+class PermissionMask(sqlalchemy.types.TypeDecorator):
+    """Integer column holding a `Permission` bitmask"""
+    impl = sqlalchemy.Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Permission(value)
+
+
+def permission_flag(flag: Permission) -> hybrid_property:
+    """Boolean view of one flag of the `permissions` of a row, to read, write and filter on"""
+    def fget(self) -> bool:
+        return bool(self.permissions and self.permissions & flag)
+
+    def fset(self, granted: bool | None) -> None:
+        permissions = Permission(self.permissions or 0)
+        self.permissions = permissions | flag if granted else permissions & ~flag
+
+    def expr(cls):
+        return cls.permissions.op("&")(flag) != 0
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
 class RoleEventType(Base):
     """Role event type table."""
     __tablename__ = "ROLE_EVENT_TYPE"
@@ -16,19 +61,15 @@ class RoleEventType(Base):
         ForeignKey("EVENT_TYPE.ID", ondelete="CASCADE"),
         primary_key=True,
         name="EVENT_TYPE_ID")
-    can_edit: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
-        sqlalchemy.Boolean,
-        default=False,
-        name="CAN_EDIT")
-    can_see: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
-        sqlalchemy.Boolean,
-        default=False,
-        name="CAN_SEE")
-    can_add: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
-        sqlalchemy.Boolean,
-        default=False,
-        name="CAN_ADD")
+    permissions: SQLAlchemyMapped[Permission] = sqlalchemy_mapped_column(
+        PermissionMask,
+        nullable=False,
+        default=Permission(0),
+        name="PERMISSIONS")
+
+    can_edit = permission_flag(Permission.EDIT)
+    can_see = permission_flag(Permission.SEE)
+    can_add = permission_flag(Permission.ADD)
 
     # role = sqlalchemy_relationship("Role", back_populates="role_event_types")
     # event_type = sqlalchemy_relationship("EventType", back_populates="role_event_types")
-
@@ -4,6 +4,8 @@ import sqlalchemy
 from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
 
 from app.database.table import Base
+from app.models.schemas.profile_pic import ProfilePicFormat, ProfilePicSize
+from app.storage.blobs import profile_pic_variant_url
 
 
 class User(Base):
@@ -56,6 +58,7 @@ class User(Base):
 
     # roles = sqlalchemy_relationship("Role", secondary=user_roles, back_populates="users")
 
+    __table_args__ = (sqlalchemy.Index("USER_USERNAME_idx", "USERNAME", unique=True),)
     __mapper_args__ = {"eager_defaults": True}
 
     @property
@@ -71,3 +74,9 @@ class User(Base):
 
     def set_hash_salt(self, hash_salt: str) -> None:
         self._hash_salt = hash_salt  # type: ignore
+
+    def profile_pic_url_for(
+            self, size: ProfilePicSize | None = None, image_format: ProfilePicFormat | None = None
+    ) -> str | None:
+        """Get the URL of the profile picture derivative a client asks for, the original upload by default"""
+        return profile_pic_variant_url(url=self.profile_pic_url, size=size, image_format=image_format)
@@ -0,0 +1,113 @@
+import sqlalchemy
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped as SQLAlchemyMapped, mapped_column as sqlalchemy_mapped_column
+
+from app.database.table import Base
+from app.models.db.role_event_type import Permission, PermissionMask, permission_flag, RoleEventType
+from app.models.db.user_role import user_roles
+
+
+class UserEventTypeAccess(Base):
+    """User event type access table, the permissions of a user on an event type merged over all their roles."""
+    __tablename__ = "USER_EVENT_TYPE_ACCESS"
+
+    user_id: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        ForeignKey("USER.ID", ondelete="CASCADE"),
+        primary_key=True,
+        name="USER_ID")
+    event_type_id: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        ForeignKey("EVENT_TYPE.ID", ondelete="CASCADE"),
+        primary_key=True,
+        name="EVENT_TYPE_ID")
+    # Union of the permissions of the roles of the user
+    permissions: SQLAlchemyMapped[Permission] = sqlalchemy_mapped_column(
+        PermissionMask,
+        nullable=False,
+        default=Permission(0),
+        name="PERMISSIONS")
+
+    can_edit = permission_flag(Permission.EDIT)
+    can_see = permission_flag(Permission.SEE)
+    can_add = permission_flag(Permission.ADD)
+
+
+# Key of the advisory lock that serializes the refreshes of the access rows, so that a role given to a user and a
+# permission given to that role in concurrent transactions can not both miss the other
+ACCESS_LOCK_ID = 0x61636373
+
+# Rows are only written by these triggers: any change of the roles of a user or of the permissions of a role
+# recomputes the affected rows from USER_ROLE and ROLE_EVENT_TYPE. The joins on USER and EVENT_TYPE leave out the
+# user or event type whose deletion is cascading to the roles and permissions.
+ACCESS_REFRESH_FUNCTION_DDL = f'''
+CREATE OR REPLACE FUNCTION "USER_EVENT_TYPE_ACCESS_refresh"(user_ids integer[], event_type_ids integer[])
+RETURNS void AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock({ACCESS_LOCK_ID});
+    DELETE FROM "USER_EVENT_TYPE_ACCESS"
+    WHERE "USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR "EVENT_TYPE_ID" = ANY(event_type_ids));
+    INSERT INTO "USER_EVENT_TYPE_ACCESS" ("USER_ID", "EVENT_TYPE_ID", "PERMISSIONS")
+    SELECT ur."USER_ID", p."EVENT_TYPE_ID", bit_or(p."PERMISSIONS")
+    FROM "USER_ROLE" ur
+    JOIN "ROLE_EVENT_TYPE" p ON p."ROLE_ID" = ur."ROLE_ID"
+    JOIN "USER" u ON u."ID" = ur."USER_ID"
+    JOIN "EVENT_TYPE" t ON t."ID" = p."EVENT_TYPE_ID"
+    WHERE ur."USER_ID" = ANY(user_ids) AND (event_type_ids IS NULL OR p."EVENT_TYPE_ID" = ANY(event_type_ids))
+    GROUP BY ur."USER_ID", p."EVENT_TYPE_ID"
+    HAVING bit_or(p."PERMISSIONS") <> 0;
+END
+$$ LANGUAGE plpgsql
+'''
+USER_ROLE_REFRESH_FUNCTION_DDL = '''
+CREATE OR REPLACE FUNCTION "USER_ROLE_refresh_access"() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY[OLD."USER_ID"], NULL);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY[NEW."USER_ID"], NULL);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+ROLE_EVENT_TYPE_REFRESH_FUNCTION_DDL = '''
+CREATE OR REPLACE FUNCTION "ROLE_EVENT_TYPE_refresh_access"() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(
+            ARRAY(SELECT "USER_ID" FROM "USER_ROLE" WHERE "ROLE_ID" = OLD."ROLE_ID"), ARRAY[OLD."EVENT_TYPE_ID"]
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM "USER_EVENT_TYPE_ACCESS_refresh"(
+            ARRAY(SELECT "USER_ID" FROM "USER_ROLE" WHERE "ROLE_ID" = NEW."ROLE_ID"), ARRAY[NEW."EVENT_TYPE_ID"]
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+USER_ROLE_TRIGGER_DDL = '''
+CREATE TRIGGER "USER_ROLE_access_trg"
+AFTER INSERT OR UPDATE OR DELETE ON "USER_ROLE"
+FOR EACH ROW EXECUTE FUNCTION "USER_ROLE_refresh_access"()
+'''
+ROLE_EVENT_TYPE_TRIGGER_DDL = '''
+CREATE TRIGGER "ROLE_EVENT_TYPE_access_trg"
+AFTER INSERT OR UPDATE OR DELETE ON "ROLE_EVENT_TYPE"
+FOR EACH ROW EXECUTE FUNCTION "ROLE_EVENT_TYPE_refresh_access"()
+'''
+ACCESS_BACKFILL_DDL = '''
+SELECT "USER_EVENT_TYPE_ACCESS_refresh"(ARRAY(SELECT "ID" FROM "USER"), NULL)
+'''
+
+# The triggers go on USER_ROLE and ROLE_EVENT_TYPE, which must exist by the time this table is created
+access_table = UserEventTypeAccess.__table__
+access_table.add_is_dependent_on(user_roles)
+access_table.add_is_dependent_on(RoleEventType.__table__)
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(ACCESS_REFRESH_FUNCTION_DDL))
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(USER_ROLE_REFRESH_FUNCTION_DDL))
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(ROLE_EVENT_TYPE_REFRESH_FUNCTION_DDL))
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(USER_ROLE_TRIGGER_DDL))
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(ROLE_EVENT_TYPE_TRIGGER_DDL))
+sqlalchemy.event.listen(access_table, "after_create", sqlalchemy.DDL(ACCESS_BACKFILL_DDL))
@@ -1,6 +1,11 @@
 import datetime
 
+import pydantic
+
 from app.models.schemas.base import BaseSchemaModel
+from app.models.schemas.event_type import EventTypeInResponse
+from app.models.schemas.user import UserInResponse
+from app.utilities.recurrence.rules import validate_recurrence_rule
 
 
 class EventInCreate(BaseSchemaModel):
@@ -10,6 +15,12 @@ class EventInCreate(BaseSchemaModel):
     description: str
     start_date: datetime.datetime
     end_date: datetime.datetime
+    # RRULE, such as `FREQ=WEEKLY;BYDAY=SA`, the event is then the first occurrence
+    recurrence_rule: str | None = None
+
+    @pydantic.validator("recurrence_rule")
+    def check_recurrence_rule(cls, rule: str | None) -> str | None:
+        return validate_recurrence_rule(rule) if rule else rule
 
 
 class EventInUpdate(BaseSchemaModel):
@@ -18,6 +29,12 @@ class EventInUpdate(BaseSchemaModel):
     description: str | None
     start_date: datetime.datetime | None
     end_date: datetime.datetime | None
+    # An empty rule makes the event a single one again
+    recurrence_rule: str | None
+
+    @pydantic.validator("recurrence_rule")
+    def check_recurrence_rule(cls, rule: str | None) -> str | None:
+        return validate_recurrence_rule(rule) if rule else rule
 
 
 class EventInResponse(BaseSchemaModel):
@@ -28,5 +45,94 @@ class EventInResponse(BaseSchemaModel):
     description: str
     start_date: datetime.datetime
     end_date: datetime.datetime
+    recurrence_rule: str | None
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+
+
+class EventInDetailedResponse(EventInResponse):
+    """Event with its creator and event type, filled in when details are requested"""
+    creator: UserInResponse | None
+    event_type_details: EventTypeInResponse | None
+
+
+class EventInSearchResponse(EventInResponse):
+    rank: float
+
+
+class EventsInSearch(BaseSchemaModel):
+    """One page of search results by decreasing rank, `next_offset` is `None` on the last page"""
+    events: list[EventInSearchResponse]
+    next_offset: int | None
+
+
+class EventInBatchUpdate(EventInUpdate):
+    id: int
+
+
+class EventInBatchResult(BaseSchemaModel):
+    """Outcome of one item of a batch request, `index` is its position in the request"""
+    index: int
+    status_code: int
+    event: EventInResponse | None
+    detail: str | None
+
+
+class EventsInBatchRead(BaseSchemaModel):
+    """Events of a multi-get in the requested order, with the requested ids that could not be returned"""
+    events: list[EventInDetailedResponse]
+    missing_ids: list[int]
+    forbidden_ids: list[int]
+
+
+class EventOverrideInUpsert(BaseSchemaModel):
+    """Cancel or modify the occurrence of a recurring event starting at `original_start`"""
+    original_start: datetime.datetime
+    is_cancelled: bool = False
+    title: str | None
+    description: str | None
+    start_date: datetime.datetime | None
+    end_date: datetime.datetime | None
+
+
+class EventOverrideInResponse(EventOverrideInUpsert):
+    event_id: int
+
+
+class EventOccurrenceInResponse(BaseSchemaModel):
+    """One occurrence of an event, `original_start` identifies the occurrences of recurring events"""
+    event_id: int
+    created_by: int
+    event_type: int
+    title: str
+    description: str | None
+    start_date: datetime.datetime
+    end_date: datetime.datetime
+    original_start: datetime.datetime | None
+    is_override: bool
+
+
+class EventPeriod(BaseSchemaModel):
+    start_date: datetime.datetime
+    end_date: datetime.datetime
+
+
+class EventConflict(EventPeriod):
+    """Two events of an event type overlapping from `start_date` to `end_date`"""
+    event_id: int
+    other_event_id: int
+
+
+class EventTypeMonthSummary(BaseSchemaModel):
+    """Events of an event type starting in a month, and the share of the month its events book"""
+    event_type: int
+    month: datetime.date
+    event_count: int
+    booked_seconds: int
+    occupancy: float
+
+
+class EventTypeAvailability(BaseSchemaModel):
+    event_type: int
+    free_slots: list[EventPeriod]
+    conflicts: list[EventConflict]
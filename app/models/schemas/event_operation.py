@@ -5,6 +5,9 @@ class EventOperation(Enum):
     EVENT_CREATE = "event_create"
     EVENT_UPDATE = "event_update"
     EVENT_DELETE = "event_delete"
+    EVENT_BATCH_CREATE = "event_batch_create"
+    EVENT_BATCH_UPDATE = "event_batch_update"
+    EVENT_BATCH_DELETE = "event_batch_delete"
     EVENT_TYPE_CREATE = "event_type_create"
     EVENT_TYPE_UPDATE = "event_type_update"
     EVENT_TYPE_DELETE = "event_type_delete"
@@ -14,8 +17,11 @@ class EventOperation(Enum):
     USER_CREATE = "user_create"
     USER_UPDATE = "user_update"
     USER_DELETE = "user_delete"
+    USER_IMPORT = "user_import"
     USER_ROLE_ASSIGN = "user_role_assign"
     USER_ROLE_REMOVE = "user_role_remove"
+    USER_ROLE_BATCH_ASSIGN = "user_role_batch_assign"
     PERMISSION_CREATE = "permission_create"
     PERMISSION_UPDATE = "permission_update"
     PERMISSION_DELETE = "permission_delete"
+    PERMISSION_MATRIX_REPLACE = "permission_matrix_replace"
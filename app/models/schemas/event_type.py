@@ -11,7 +11,12 @@ class EventTypeInUpdate(BaseSchemaModel):
     description: str
 
 
+class EventTypeInExclusiveUpdate(BaseSchemaModel):
+    is_exclusive: bool
+
+
 class EventTypeInResponse(BaseSchemaModel):
     id: int
     name: str
     description: str
+    is_exclusive: bool
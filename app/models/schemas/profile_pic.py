@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ProfilePicSize(str, Enum):
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+
+class ProfilePicFormat(str, Enum):
+    ORIGINAL = "original"
+    WEBP = "webp"
@@ -23,3 +23,11 @@ class RoleEventTypeInResponse(BaseSchemaModel):
     can_edit: bool
     can_see: bool
     can_add: bool
+
+
+class RoleEventTypeInMatrix(BaseSchemaModel):
+    """Permissions of a role on one event type, within the full permission matrix of the role"""
+    event_type_id: int
+    can_edit: bool
+    can_see: bool
+    can_add: bool
@@ -30,3 +30,15 @@ class UserInResponse(BaseSchemaModel):
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
     profile_pic_url: str | None
+
+
+class UserInImport(UserInCreate):
+    roles: list[str] = []
+
+
+class UserInImportResult(BaseSchemaModel):
+    """Outcome of one user of an import, `index` is its position in the imported file"""
+    index: int
+    status_code: int
+    user: UserInResponse | None
+    detail: str | None
@@ -1,3 +1,5 @@
+import pydantic
+
 from app.models.schemas.base import BaseSchemaModel
 
 
@@ -9,3 +11,22 @@ class UserRoleInAssign(BaseSchemaModel):
 class UserRoleInRemove(BaseSchemaModel):
     username: str
     role_name: str
+
+
+class UserRolesInBatchAssign(BaseSchemaModel):
+    """Every role of `role_ids` is assigned to every user of `user_ids`"""
+    user_ids: list[int] = pydantic.Field(..., min_items=1, unique_items=True)
+    role_ids: list[int] = pydantic.Field(..., min_items=1, unique_items=True)
+
+
+class UserRoleInBatch(BaseSchemaModel):
+    user_id: int
+    role_id: int
+
+
+class UserRolesInBatchAssignResult(BaseSchemaModel):
+    """`assigned` lists the new assignments, the others between existing users and roles were already there"""
+    assigned: list[UserRoleInBatch]
+    already_assigned: int
+    missing_user_ids: list[int]
+    missing_role_ids: list[int]
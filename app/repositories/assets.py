@@ -1,30 +1,77 @@
+import mimetypes
 import os
+import posixpath
+import shutil
+import typing
+import uuid
 
+import sqlalchemy
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from app.repositories.base import BaseRepository
 from app.config.manager import settings
+from app.models.db.user import User
+from app.storage.backends.factory import storage_backend
+from app.storage.blobs import blob_key, incoming_root
+from app.storage.images import process_profile_pic
+from app.storage.uploads import save_image_upload
+from app.utilities.exceptions.assets import StorageError
+from app.utilities.executors.process_pool import process_pool
+
+# Key of the advisory lock that keeps the asset garbage collector to a single worker at a time
+ASSET_GC_LOCK_ID = 0x61737365
 
 
 class AssetsRepository(BaseRepository):
     """Assets repository"""
     @staticmethod
     async def upload_profile_pic(user_id: int, file: UploadFile) -> str:
-        """Upload new profile picture for current user"""
-
-        # Directory Creation: Ensuring the directory exists
-        directory = f"{settings.ASSETS_PATH}/{str(user_id)}"
-        os.makedirs(directory, exist_ok=True)
+        """Upload new profile picture for current user, returns its storage key"""
+        # The stored name comes from the content hash and sniffed format, never from the client supplied filename
+        staging = os.path.join(incoming_root(settings.ASSETS_PATH), f"{user_id}-{uuid.uuid4().hex}")
+        try:
+            upload_path, sha256 = await save_image_upload(
+                file=file, directory=staging, name="upload", max_bytes=settings.PROFILE_PIC_MAX_BYTES,
+            )
+            key = blob_key(sha256=sha256, extension=os.path.splitext(upload_path)[1])
+            # Same content was stored before, together with its derivatives
+            if await storage_backend.claim(key):
+                return key
 
-        # Move file to static assets directory
-        file_location = f"{directory}/{file.filename}"
+            # Decoding and resizing is CPU bound, keep it off the API worker
+            written = await process_pool.run(
+                process_profile_pic, source=upload_path, destination=os.path.join(staging, posixpath.basename(key)),
+            )
+            for path in written:
+                content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                await storage_backend.put(
+                    key=posixpath.join(posixpath.dirname(key), os.path.basename(path)),
+                    path=path,
+                    content_type=content_type,
+                )
 
-        # Error Handling: Handling potential errors in file I/O
-        try:
-            with open(file_location, "wb+") as file_object:
-                file_object.write(file.file.read())
-            file.file.close()  # Clearing the temporary file
-        except Exception as e:
+            return key
+        except (OSError, StorageError) as e:
             raise IOError("Failed to save the image.") from e
+        finally:
+            await run_in_threadpool(shutil.rmtree, staging, ignore_errors=True)
+
+    async def get_profile_pic_urls(self) -> typing.Sequence[str]:
+        """Get the profile picture URLs of all users"""
+        self.logger.debug("Fetching all profile picture URLs from database")
+
+        stmt = sqlalchemy.select(User.profile_pic_url).where(User.profile_pic_url.is_not(None))
+        query = await self.async_session.execute(statement=stmt)
+        urls = query.scalars().all()
+
+        self.logger.debug(f"Found {len(urls)} profile picture URLs")
+
+        return urls
+
+    async def try_lock_garbage_collection(self) -> bool:
+        """Take the asset garbage collection lock until the end of the transaction, False if another worker has it"""
+        stmt = sqlalchemy.select(sqlalchemy.func.pg_try_advisory_xact_lock(ASSET_GC_LOCK_ID))
+        query = await self.async_session.execute(statement=stmt)
 
-        return file_location
+        return bool(query.scalar())
@@ -1,15 +1,31 @@
+import datetime
 import typing
 
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import functions as sqlalchemy_functions
 
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
 from app.repositories.base import BaseRepository
-from app.models.db.event import Event
-from app.models.schemas.event import EventInCreate, EventInUpdate
-from app.repositories.role import RoleRepository
-from app.repositories.user import UserRepository
-from app.utilities.exceptions.database import EntityDoesNotExist
+from app.repositories.event_summary import EventSummaryRepository
+from app.models.db.event import Event, SEARCH_CONFIG
+from app.models.db.event_override import EventOverride
+from app.models.db.user_event_type_access import UserEventTypeAccess
+from app.models.schemas.event import EventInBatchUpdate, EventInCreate, EventInUpdate, EventOverrideInUpsert
+from app.utilities.exceptions.database import EntityConflict, EntityDoesNotExist
 from app.utilities.formatters.datetime_formatter import convert_to_utc
+from app.utilities.scheduling.months import EventSpan
+
+EXCLUSION_VIOLATION = "23P01"
+
+
+def as_booking_conflict(e: Exception) -> Exception:
+    """Turn the violation of the exclusion constraint of an event type into an `EntityConflict`"""
+    if isinstance(e, sqlalchemy.exc.IntegrityError) and getattr(e.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+        conflict = EntityConflict("Event overlaps another event of its exclusive event type!")
+        conflict.__cause__ = e
+        return conflict
+    return e
 
 
 class EventRepository(BaseRepository):
@@ -25,11 +41,15 @@ class EventRepository(BaseRepository):
 
         return events
 
-    async def get_events_by_ids(self, event_ids: typing.Sequence[int]) -> typing.Sequence[Event]:
-        """Get all events by IDs from database"""
+    async def get_events_by_ids(
+            self, event_ids: typing.Sequence[int], for_update: bool = False
+    ) -> typing.Sequence[Event]:
+        """Get all events by IDs from database, locked until the end of the transaction with `for_update`"""
         self.logger.debug(f"Fetching events with IDs {event_ids} from database")
 
         stmt = sqlalchemy.select(Event).where(Event.id.in_(event_ids))
+        if for_update:
+            stmt = stmt.with_for_update()
         query = await self.async_session.execute(statement=stmt)
         events = query.scalars().all()
 
@@ -68,23 +88,27 @@ class EventRepository(BaseRepository):
         """Get all events that a user has access to"""
         self.logger.debug(f"Fetching events for user with ID {user_id} from database")
 
-        user_repo = UserRepository(self.async_session)
-        user_roles = await user_repo.get_roles_for_user(user_id)
-
-        accessible_event_type_ids = []
-        for role in user_roles:
-            # Get all eventType IDs where the role has 'can_see' = True
-            role_repo = RoleRepository(self.async_session)
-            role_event_type_ids = await role_repo.get_event_type_ids_for_role(role.id)
-            accessible_event_type_ids.extend(role_event_type_ids)
-
-        accessible_event_type_ids = list(set(accessible_event_type_ids))
+        accessible_event_type_ids = await self.get_event_type_ids_for_user(user_id)
         accessible_events = await self.get_events_by_event_type_ids(accessible_event_type_ids)
 
         self.logger.debug(f"Found {len(accessible_events)} events for user with ID {user_id}")
 
         return accessible_events
 
+    async def get_event_type_ids_for_user(self, user_id: int) -> typing.Sequence[int]:
+        """Get the IDs of all eventTypes a user has access to"""
+        self.logger.debug(f"Fetching accessible eventType IDs for user with ID {user_id} from database")
+
+        stmt = sqlalchemy.select(UserEventTypeAccess.event_type_id)\
+            .where(UserEventTypeAccess.user_id == user_id)\
+            .where(UserEventTypeAccess.can_see)
+        query = await self.async_session.execute(statement=stmt)
+        accessible_event_type_ids = query.scalars().all()
+
+        self.logger.debug(f"Found {len(accessible_event_type_ids)} accessible eventTypes")
+
+        return accessible_event_type_ids
+
     async def create_event(self, event_create: EventInCreate) -> Event:
         """Create event"""
         self.logger.debug(f"Creating event with data {event_create}")
@@ -96,16 +120,19 @@ class EventRepository(BaseRepository):
             description=event_create.description,
             start_date=convert_to_utc(event_create.start_date),
             end_date=convert_to_utc(event_create.end_date),
+            recurrence_rule=event_create.recurrence_rule or None,
         )
         new_event.created_at = sqlalchemy_functions.now()
 
         self.async_session.add(instance=new_event)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, [new_event.event_type])
+            await self._update_summaries(added=[(new_event.event_type, new_event.start_date, new_event.end_date)])
             await self.async_session.commit()
             await self.async_session.refresh(instance=new_event)
         except Exception as e:
             await self.async_session.rollback()
-            raise e
+            raise as_booking_conflict(e)
 
         self.logger.debug(f"Created event with ID {new_event.id}")
 
@@ -130,19 +157,33 @@ class EventRepository(BaseRepository):
                 values_to_update[field] = value
 
         values_to_update['updated_at'] = sqlalchemy_functions.now()
+        if values_to_update.get("recurrence_rule") == "":
+            values_to_update["recurrence_rule"] = None
 
+        # Both the previous and the new event type lose or gain this event
+        affected_event_types = [values_to_update["event_type"]] if "event_type" in values_to_update else []
         update_stmt = (
             sqlalchemy.update(Event)
             .where(Event.id == event_id)
             .values(**values_to_update)
+            .returning(Event.event_type, Event.start_date, Event.end_date)
         )
 
         try:
-            await self.async_session.execute(update_stmt)
+            previous_stmt = sqlalchemy.select(Event.event_type, Event.start_date, Event.end_date)\
+                .where(Event.id == event_id)\
+                .with_for_update()
+            previous = (await self.async_session.execute(previous_stmt)).tuples().all()
+            affected_event_types.extend(event_type for event_type, _, _ in previous)
+            updated = (await self.async_session.execute(update_stmt)).tuples().all()
+            if "start_date" in values_to_update or "recurrence_rule" in values_to_update:
+                await self.async_session.execute(self._delete_overrides_stmt(event_ids=[event_id]))
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, affected_event_types)
+            await self._update_summaries(added=updated, removed=previous)
             await self.async_session.commit()
         except Exception as e:
             await self.async_session.rollback()
-            raise e
+            raise as_booking_conflict(e)
 
         # Fetch the updated event
         select_stmt = sqlalchemy.select(Event).where(Event.id == event_id)
@@ -168,10 +209,16 @@ class EventRepository(BaseRepository):
 
         self.logger.debug(f"Found event with ID {event_id}. Deleting...")
 
-        delete_stmt = sqlalchemy.delete(Event).where(Event.id == event_id)
+        delete_stmt = sqlalchemy.delete(Event)\
+            .where(Event.id == event_id)\
+            .returning(Event.event_type, Event.start_date, Event.end_date)
 
-        await self.async_session.execute(statement=delete_stmt)
+        deleted = (await self.async_session.execute(statement=delete_stmt)).tuples().all()
         try:
+            await invalidation_bus.publish(
+                self.async_session, InvalidationNamespace.EVENTS, [event_to_delete.event_type]
+            )
+            await self._update_summaries(removed=deleted)
             await self.async_session.commit()
             self.async_session.expunge(event_to_delete)
         except Exception as e:
@@ -181,3 +228,349 @@ class EventRepository(BaseRepository):
         self.logger.debug(f"Deleted event with ID {event_id}")
 
         return event_to_delete
+
+    async def create_events(self, event_creates: typing.Sequence[EventInCreate]) -> typing.Sequence[Event]:
+        """Create events with multi-row INSERT ... RETURNING, in the order given"""
+        self.logger.debug(f"Creating {len(event_creates)} events")
+
+        values = [
+            {
+                "created_by": event_create.created_by,
+                "event_type": event_create.event_type,
+                "title": event_create.title,
+                "description": event_create.description,
+                "start_date": convert_to_utc(event_create.start_date),
+                "end_date": convert_to_utc(event_create.end_date),
+                "recurrence_rule": event_create.recurrence_rule or None,
+            }
+            for event_create in event_creates
+        ]
+        stmt = (
+            sqlalchemy.insert(Event)
+            .values(created_at=sqlalchemy_functions.now())
+            .returning(Event, sort_by_parameter_order=True)
+        )
+
+        try:
+            query = await self.async_session.execute(statement=stmt, params=values)
+            new_events = query.scalars().all()
+            await invalidation_bus.publish(
+                self.async_session, InvalidationNamespace.EVENTS, {event.event_type for event in new_events}
+            )
+            await self._update_summaries(added=[
+                (event.event_type, event.start_date, event.end_date) for event in new_events
+            ])
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise as_booking_conflict(e)
+
+        self.logger.debug(f"Created events with IDs {[event.id for event in new_events]}")
+
+        return new_events
+
+    async def update_events(self, event_updates: typing.Sequence[EventInBatchUpdate]) -> typing.Sequence[Event]:
+        """Update events by ID with a single executemany, fields left to None keep their value"""
+        self.logger.debug(f"Updating {len(event_updates)} events")
+
+        table = Event.__table__
+        columns = {
+            "event_type": table.c.EVENT_TYPE,
+            "title": table.c.TITLE,
+            "description": table.c.DESCRIPTION,
+            "start_date": table.c.START_DATE,
+            "end_date": table.c.END_DATE,
+        }
+        # Same statement for every row, so asyncpg sends them all at once
+        update_stmt = (
+            sqlalchemy.update(table)
+            .where(table.c.ID == sqlalchemy.bindparam("b_id"))
+            .values({
+                column: sqlalchemy_functions.coalesce(sqlalchemy.bindparam(f"b_{field}", type_=column.type), column)
+                for field, column in columns.items()
+            })
+            # An empty rule clears it
+            .values(RECURRENCE_RULE=sqlalchemy.func.nullif(sqlalchemy_functions.coalesce(
+                sqlalchemy.bindparam("b_recurrence_rule", type_=table.c.RECURRENCE_RULE.type), table.c.RECURRENCE_RULE
+            ), ""))
+            .values(UPDATED_AT=sqlalchemy_functions.now())
+        )
+        params = [
+            {
+                "b_id": event_update.id,
+                "b_event_type": event_update.event_type,
+                "b_title": event_update.title,
+                "b_description": event_update.description,
+                "b_start_date": convert_to_utc(event_update.start_date) if event_update.start_date else None,
+                "b_end_date": convert_to_utc(event_update.end_date) if event_update.end_date else None,
+                "b_recurrence_rule": event_update.recurrence_rule,
+            }
+            for event_update in event_updates
+        ]
+        event_ids = [event_update.id for event_update in event_updates]
+        rescheduled_event_ids = [
+            event_update.id for event_update in event_updates
+            if event_update.start_date is not None or event_update.recurrence_rule is not None
+        ]
+
+        spans_stmt = sqlalchemy.select(Event.event_type, Event.start_date, Event.end_date)\
+            .where(Event.id.in_(event_ids))
+
+        try:
+            previous = (await self.async_session.execute(spans_stmt.with_for_update())).tuples().all()
+            affected_event_types = {event_type for event_type, _, _ in previous}
+            affected_event_types.update(
+                event_update.event_type for event_update in event_updates if event_update.event_type is not None
+            )
+            await self.async_session.execute(update_stmt, params)
+            if rescheduled_event_ids:
+                await self.async_session.execute(self._delete_overrides_stmt(event_ids=rescheduled_event_ids))
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, affected_event_types)
+            # The executemany cannot return rows, the events are read back before committing
+            updated = (await self.async_session.execute(spans_stmt)).tuples().all()
+            await self._update_summaries(added=updated, removed=previous)
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise as_booking_conflict(e)
+
+        # The core UPDATE bypassed the identity map, overwrite whatever it holds for these events
+        select_stmt = sqlalchemy.select(Event).where(Event.id.in_(event_ids)).execution_options(populate_existing=True)
+        result = await self.async_session.execute(select_stmt)
+        updated_events = result.scalars().all()
+
+        self.logger.debug(f"Updated events with IDs {event_ids}")
+
+        return updated_events
+
+    async def delete_events_by_ids(self, event_ids: typing.Sequence[int]) -> typing.Sequence[Event]:
+        """Delete events by ID with DELETE ... RETURNING, returns the deleted events"""
+        self.logger.debug(f"Deleting events with IDs {event_ids}")
+
+        stmt = sqlalchemy.delete(Event).where(Event.id.in_(event_ids)).returning(Event)
+
+        try:
+            query = await self.async_session.execute(statement=stmt)
+            deleted_events = query.scalars().all()
+            await invalidation_bus.publish(
+                self.async_session, InvalidationNamespace.EVENTS, {event.event_type for event in deleted_events}
+            )
+            await self._update_summaries(removed=[
+                (event.event_type, event.start_date, event.end_date) for event in deleted_events
+            ])
+            await self.async_session.commit()
+            for event in deleted_events:
+                self.async_session.expunge(event)
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Deleted events with IDs {[event.id for event in deleted_events]}")
+
+        return deleted_events
+
+    async def get_periods_in_window(
+            self,
+            event_type_id: int,
+            window_start: datetime.datetime,
+            window_end: datetime.datetime,
+    ) -> typing.Sequence[tuple[int, datetime.datetime, datetime.datetime]]:
+        """Get the `(id, start, end)` of the events of the eventType overlapping the window, by start"""
+        self.logger.debug(f"Fetching periods of eventType with ID {event_type_id} from {window_start} to {window_end}")
+
+        # Only reads columns of the period index, so postgres answers with an index-only scan
+        start, end = sqlalchemy.func.lower(Event.period), sqlalchemy.func.upper(Event.period)
+        # The bound on the partition key lets postgres skip the partitions of the years after the window
+        stmt = sqlalchemy.select(Event.id, start, end)\
+            .where(Event.event_type == event_type_id)\
+            .where(Event.start_date < window_end)\
+            .where(Event.period.overlaps(sqlalchemy.func.tstzrange(window_start, window_end, "[)")))\
+            .order_by(start, Event.id)
+        query = await self.async_session.execute(statement=stmt)
+        periods = [(event_id, start_date, end_date) for event_id, start_date, end_date in query.all()]
+
+        self.logger.debug(f"Found {len(periods)} periods")
+
+        return periods
+
+    async def search_events(
+            self,
+            text: str,
+            event_type_ids: typing.Sequence[int],
+            limit: int,
+            offset: int,
+    ) -> typing.Sequence[tuple[Event, float]]:
+        """Get the events of the eventTypes matching the text with their rank, best first"""
+        self.logger.debug(f"Searching events with eventType IDs {event_type_ids} for {text!r}")
+
+        # Web search syntax, such as `"summer camp" -cancelled`, never fails to parse
+        ts_query = sqlalchemy.func.websearch_to_tsquery(sqlalchemy.literal(SEARCH_CONFIG, postgresql.REGCONFIG), text)
+        rank = sqlalchemy.func.ts_rank_cd(Event.search_vector, ts_query).label("rank")
+        stmt = sqlalchemy.select(Event, rank)\
+            .where(Event.search_vector.bool_op("@@")(ts_query))\
+            .where(Event.event_type.in_(event_type_ids))\
+            .order_by(rank.desc(), Event.start_date.desc(), Event.id)\
+            .limit(limit)\
+            .offset(offset)
+        query = await self.async_session.execute(statement=stmt)
+        results = [(event, rank) for event, rank in query.all()]
+
+        self.logger.debug(f"Found {len(results)} events")
+
+        return results
+
+    async def get_upcoming_event_ids(
+            self, event_type_ids: typing.Sequence[int], after: datetime.datetime, limit: int
+    ) -> typing.Sequence[int]:
+        """Get the IDs of the first `limit` events of the eventTypes starting at or after `after`, by start"""
+        self.logger.debug(f"Fetching upcoming events with eventType IDs {event_type_ids} after {after}")
+
+        if not event_type_ids:
+            return []
+
+        # One range scan of the index per eventType, each stopping after `limit` entries, then merged
+        event_types = sqlalchemy.values(sqlalchemy.column("event_type", sqlalchemy.Integer), name="event_types")\
+            .data([(event_type_id,) for event_type_id in event_type_ids])
+        first_events = sqlalchemy.select(Event.id, Event.start_date)\
+            .where(Event.event_type == event_types.c.event_type)\
+            .where(Event.start_date >= after)\
+            .order_by(Event.start_date, Event.id)\
+            .limit(limit)\
+            .lateral("first_events")
+        stmt = sqlalchemy.select(first_events.c.id)\
+            .select_from(event_types)\
+            .join(first_events, sqlalchemy.true())\
+            .order_by(first_events.c.start_date, first_events.c.id)\
+            .limit(limit)
+        query = await self.async_session.execute(statement=stmt)
+        event_ids = query.scalars().all()
+
+        self.logger.debug(f"Found {len(event_ids)} upcoming events")
+
+        return event_ids
+
+    async def get_recurring_events_started_before(
+            self, event_type_ids: typing.Sequence[int], before: datetime.datetime
+    ) -> typing.Sequence[Event]:
+        """Get the recurring events of the eventTypes whose first occurrence starts before `before`"""
+        self.logger.debug(f"Fetching recurring events with eventType IDs {event_type_ids} started before {before}")
+
+        if not event_type_ids:
+            return []
+
+        stmt = sqlalchemy.select(Event)\
+            .where(Event.event_type.in_(event_type_ids))\
+            .where(Event.recurrence_rule.is_not(None))\
+            .where(Event.start_date < before)
+        query = await self.async_session.execute(statement=stmt)
+        events = query.scalars().all()
+
+        self.logger.debug(f"Found {len(events)} recurring events")
+
+        return events
+
+    async def get_event_ids_created_by(self, user_id: int, limit: int, offset: int) -> typing.Sequence[int]:
+        """Get a page of the IDs of the events created by the user, latest start first"""
+        self.logger.debug(f"Fetching events created by user with ID {user_id}")
+
+        stmt = sqlalchemy.select(Event.id)\
+            .where(Event.created_by == user_id)\
+            .order_by(Event.start_date.desc(), Event.id.desc())\
+            .limit(limit)\
+            .offset(offset)
+        query = await self.async_session.execute(statement=stmt)
+        event_ids = query.scalars().all()
+
+        self.logger.debug(f"Found {len(event_ids)} events created by user with ID {user_id}")
+
+        return event_ids
+
+    async def get_overrides_by_event_ids(self, event_ids: typing.Sequence[int]) -> typing.Sequence[EventOverride]:
+        """Get all occurrence overrides of the events from database"""
+        self.logger.debug(f"Fetching overrides of events with IDs {event_ids} from database")
+
+        stmt = sqlalchemy.select(EventOverride).where(EventOverride.event_id.in_(event_ids))
+        query = await self.async_session.execute(statement=stmt)
+        overrides = query.scalars().all()
+
+        self.logger.debug(f"Found {len(overrides)} overrides")
+
+        return overrides
+
+    async def upsert_event_override(self, event: Event, override: EventOverrideInUpsert) -> EventOverride:
+        """Create or replace the override of an occurrence of a recurring event"""
+        self.logger.debug(f"Overriding occurrence of event with ID {event.id} starting at {override.original_start}")
+
+        stmt = postgresql.insert(EventOverride).values(
+            event_id=event.id,
+            event_start_date=event.start_date,
+            original_start=convert_to_utc(override.original_start),
+            is_cancelled=override.is_cancelled,
+            title=override.title,
+            description=override.description,
+            start_date=convert_to_utc(override.start_date) if override.start_date else None,
+            end_date=convert_to_utc(override.end_date) if override.end_date else None,
+            created_at=sqlalchemy_functions.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventOverride.event_id, EventOverride.original_start],
+            set_={
+                "TITLE": stmt.excluded.TITLE,
+                "DESCRIPTION": stmt.excluded.DESCRIPTION,
+                "IS_CANCELLED": stmt.excluded.IS_CANCELLED,
+                "START_DATE": stmt.excluded.START_DATE,
+                "END_DATE": stmt.excluded.END_DATE,
+                "UPDATED_AT": sqlalchemy_functions.now(),
+            },
+        ).returning(EventOverride)
+
+        try:
+            query = await self.async_session.execute(
+                statement=stmt, execution_options={"populate_existing": True}
+            )
+            new_override = query.scalar_one()
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, [event.event_type])
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Overrode occurrence of event with ID {event.id}")
+
+        return new_override
+
+    async def delete_event_override(self, event: Event, original_start: datetime.datetime) -> EventOverride:
+        """Delete the override of an occurrence, which follows the recurrence rule again"""
+        self.logger.debug(f"Deleting override of event with ID {event.id} starting at {original_start}")
+
+        stmt = sqlalchemy.delete(EventOverride)\
+            .where(EventOverride.event_id == event.id)\
+            .where(EventOverride.original_start == convert_to_utc(original_start))\
+            .returning(EventOverride)
+
+        try:
+            query = await self.async_session.execute(statement=stmt)
+            deleted_override = query.scalar_one_or_none()
+            if deleted_override is None:
+                raise EntityDoesNotExist(f"Event with id {event.id} has no override at {original_start}!")
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, [event.event_type])
+            await self.async_session.commit()
+            self.async_session.expunge(deleted_override)
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Deleted override of event with ID {event.id}")
+
+        return deleted_override
+
+    async def _update_summaries(
+            self, added: typing.Iterable[EventSpan] = (), removed: typing.Iterable[EventSpan] = ()
+    ) -> None:
+        # In the transaction of the write, so the monthly summaries never disagree with the events
+        await EventSummaryRepository(self.async_session).apply_event_changes(added=added, removed=removed)
+
+    @staticmethod
+    def _delete_overrides_stmt(event_ids: typing.Sequence[int]) -> sqlalchemy.Delete:
+        # Overrides are keyed by the occurrences of the previous schedule, which may no longer exist
+        return sqlalchemy.delete(EventOverride).where(EventOverride.event_id.in_(event_ids))
@@ -0,0 +1,74 @@
+import datetime
+import typing
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import functions as sqlalchemy_functions
+
+from app.config.manager import settings
+from app.models.db.event_month_summary import EventMonthSummary
+from app.repositories.base import BaseRepository
+from app.utilities.scheduling.months import EventSpan, summary_deltas
+
+
+class EventSummaryRepository(BaseRepository):
+    async def apply_event_changes(
+            self, added: typing.Iterable[EventSpan] = (), removed: typing.Iterable[EventSpan] = ()
+    ) -> None:
+        """Add the `added` events to their months and take the `removed` ones out, does not commit"""
+        deltas = summary_deltas(added=added, removed=removed, timezone=settings.TIMEZONE)
+        if not deltas:
+            return
+
+        self.logger.debug(f"Updating {len(deltas)} monthly summaries")
+
+        # Increments commute, so concurrent writes to the same month need no lock, rows are sorted by key so
+        # they are locked in the same order
+        stmt = postgresql.insert(EventMonthSummary).values([
+            {
+                "event_type": event_type,
+                "month": month,
+                "event_count": count,
+                "booked_seconds": seconds,
+                "updated_at": sqlalchemy_functions.now(),
+            }
+            for (event_type, month), (count, seconds) in deltas.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventMonthSummary.event_type, EventMonthSummary.month],
+            set_={
+                "EVENT_COUNT": EventMonthSummary.event_count + stmt.excluded.EVENT_COUNT,
+                "BOOKED_SECONDS": EventMonthSummary.booked_seconds + stmt.excluded.BOOKED_SECONDS,
+                "UPDATED_AT": stmt.excluded.UPDATED_AT,
+            },
+        )
+        await self.async_session.execute(statement=stmt)
+
+    async def delete_empty_summaries(self) -> None:
+        """Delete the months left without events, such as the ones of archived events, does not commit"""
+        self.logger.debug("Deleting empty monthly summaries")
+
+        stmt = sqlalchemy.delete(EventMonthSummary)\
+            .where(EventMonthSummary.event_count == 0)\
+            .where(EventMonthSummary.booked_seconds == 0)
+        await self.async_session.execute(statement=stmt)
+
+    async def get_monthly_summaries(
+            self,
+            event_type_ids: typing.Sequence[int],
+            first_month: datetime.date,
+            last_month: datetime.date,
+    ) -> typing.Sequence[EventMonthSummary]:
+        """Get the summaries of the eventTypes from the first to the last month, months without events are left out"""
+        self.logger.debug(f"Fetching summaries of eventTypes {event_type_ids} from {first_month} to {last_month}")
+
+        stmt = sqlalchemy.select(EventMonthSummary)\
+            .where(EventMonthSummary.event_type.in_(event_type_ids))\
+            .where(EventMonthSummary.month.between(first_month, last_month))\
+            .order_by(EventMonthSummary.event_type, EventMonthSummary.month)
+        query = await self.async_session.execute(statement=stmt)
+        summaries = query.scalars().all()
+
+        self.logger.debug(f"Found {len(summaries)} summaries")
+
+        return summaries
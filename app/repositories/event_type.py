@@ -2,21 +2,24 @@ import typing
 
 import sqlalchemy
 from sqlalchemy import func as sqlalchemy_functions
+from sqlalchemy.orm import aliased as sqlalchemy_aliased
 
+from app.cache.catalog import catalog_cache
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.models.db.event import Event, EXCLUSIVE_LOCK_ID
 from app.models.db.event_type import EventType
 from app.models.schemas.event_type import EventTypeInCreate, EventTypeInUpdate
 from app.repositories.base import BaseRepository
-from app.utilities.exceptions.database import EntityDoesNotExist
+from app.utilities.exceptions.database import EntityConflict, EntityDoesNotExist
 
 
 class EventTypeRepository(BaseRepository):
     async def get_event_types(self) -> typing.Sequence[EventType]:
         """Get all eventTypes from database"""
-        self.logger.debug("Fetching all eventTypes from database")
+        self.logger.debug("Fetching all eventTypes from catalog")
 
-        stmt = sqlalchemy.select(EventType)
-        query = await self.async_session.execute(statement=stmt)
-        event_types = query.scalars().all()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        event_types = snapshot.event_types
 
         self.logger.debug(f"Found {len(event_types)} eventTypes")
 
@@ -24,11 +27,10 @@ class EventTypeRepository(BaseRepository):
 
     async def get_event_type_by_id(self, event_type_id: int) -> EventType:
         """Get eventType by ID from database"""
-        self.logger.debug(f"Fetching eventType with ID {event_type_id} from database")
+        self.logger.debug(f"Fetching eventType with ID {event_type_id} from catalog")
 
-        stmt = sqlalchemy.select(EventType).where(EventType.id == event_type_id)
-        query = await self.async_session.execute(statement=stmt)
-        event_type = query.scalar()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        event_type = snapshot.event_types_by_id.get(event_type_id)
 
         if not event_type:
             raise EntityDoesNotExist(f"Event type with id {event_type_id} does not exist!")
@@ -39,11 +41,10 @@ class EventTypeRepository(BaseRepository):
 
     async def get_event_type_by_name(self, event_type_name: str) -> EventType:
         """Get eventType by name from database"""
-        self.logger.debug(f"Fetching eventType with name {event_type_name} from database")
+        self.logger.debug(f"Fetching eventType with name {event_type_name} from catalog")
 
-        stmt = sqlalchemy.select(EventType).where(EventType.name == event_type_name)
-        query = await self.async_session.execute(statement=stmt)
-        event_type = query.scalar()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        event_type = snapshot.event_types_by_name.get(event_type_name)
 
         if not event_type:
             raise EntityDoesNotExist(f"Event type with name {event_type_name} does not exist!")
@@ -61,6 +62,8 @@ class EventTypeRepository(BaseRepository):
 
         self.async_session.add(instance=new_event_type)
         try:
+            await self.async_session.flush()
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENT_TYPES, [new_event_type.id])
             await self.async_session.commit()
             await self.async_session.refresh(instance=new_event_type)
         except Exception as e:
@@ -92,6 +95,7 @@ class EventTypeRepository(BaseRepository):
 
         await self.async_session.execute(statement=update_stmt)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENT_TYPES, [event_type_id])
             await self.async_session.commit()
             await self.async_session.refresh(instance=update_event_type)
         except Exception as e:
@@ -102,6 +106,48 @@ class EventTypeRepository(BaseRepository):
 
         return update_event_type
 
+    async def set_exclusive_by_id(self, event_type_id: int, is_exclusive: bool) -> EventType:
+        """Allow or forbid overlapping events of the eventType, forbidding fails while some overlap"""
+        self.logger.debug(f"Setting eventType with ID {event_type_id} exclusive: {is_exclusive}")
+
+        select_stmt = sqlalchemy.select(EventType).where(EventType.id == event_type_id)
+        query = await self.async_session.execute(statement=select_stmt)
+        event_type = query.scalar()
+
+        if not event_type:
+            raise EntityDoesNotExist(f"EventType with id {event_type_id} does not exist!")
+
+        # Same lock as the exclusivity trigger of EVENT, so no overlapping event is written while checking
+        lock_stmt = sqlalchemy.select(sqlalchemy_functions.pg_advisory_xact_lock(EXCLUSIVE_LOCK_ID, event_type_id))
+        other = sqlalchemy_aliased(Event)
+        overlapping_stmt = sqlalchemy.select(
+            sqlalchemy.exists()
+            .where(Event.event_type == event_type_id)
+            .where(other.event_type == event_type_id)
+            .where(Event.id < other.id)
+            .where(Event.period.overlaps(other.period))
+        )
+        update_stmt = sqlalchemy.update(EventType) \
+            .where(EventType.id == event_type_id) \
+            .values(is_exclusive=is_exclusive)
+
+        try:
+            if is_exclusive != event_type.is_exclusive:
+                await self.async_session.execute(statement=lock_stmt)
+                if is_exclusive and await self.async_session.scalar(statement=overlapping_stmt):
+                    raise EntityConflict(f"EventType with id {event_type_id} has overlapping events!")
+                await self.async_session.execute(statement=update_stmt)
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENT_TYPES, [event_type_id])
+            await self.async_session.commit()
+            await self.async_session.refresh(instance=event_type)
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Set eventType with ID {event_type_id} exclusive: {is_exclusive}")
+
+        return event_type
+
     async def delete_event_type_by_id(self, event_type_id: int) -> EventType:
         """Delete eventType by ID from database"""
         self.logger.debug(f"Deleting eventType with ID {event_type_id} from database")
@@ -119,6 +165,10 @@ class EventTypeRepository(BaseRepository):
 
         await self.async_session.execute(statement=stmt)
         try:
+            # Events and permissions of this event type are deleted by cascade
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENT_TYPES, [event_type_id])
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, [event_type_id])
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.PERMISSIONS)
             await self.async_session.commit()
             self.async_session.expunge(event_type_to_delete)
         except Exception as e:
@@ -0,0 +1,95 @@
+import asyncio
+import typing
+
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.cache.catalog import catalog_cache
+from app.models.db.event_type import EventType
+from app.models.db.role import Role
+from app.models.db.user import User
+from app.repositories.user import UserRepository
+
+K = typing.TypeVar("K", bound=typing.Hashable)
+V = typing.TypeVar("V")
+
+
+class DataLoader(typing.Generic[K, V]):
+    """
+    Batch the loads of one event loop tick into a single call of `batch_load`, and memoize their results.
+
+    `batch_load` gets distinct keys and returns the values it found by key, the others load as `None`. A loader
+    lives as long as one request, so the memoized values are never older than the request.
+    """
+
+    def __init__(
+            self,
+            batch_load: typing.Callable[[list[K]], typing.Awaitable[typing.Mapping[K, V]]],
+            lock: asyncio.Lock | None = None,
+    ):
+        self.batch_load = batch_load
+        # Shared by loaders of the same session, which can not run two queries at once
+        self.lock = lock or asyncio.Lock()
+        self._futures: dict[K, asyncio.Future] = {}
+        self._queue: list[K] = []
+        self._dispatches: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+            if not self._queue:
+                # Runs once every caller scheduled in the current tick has queued its keys
+                asyncio.get_running_loop().call_soon(self._schedule_dispatch)
+            self._queue.append(key)
+
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: typing.Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            async with self.lock:
+                values = await self.batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                # Not memoized, a later load tries again
+                self._futures.pop(key).set_exception(e)
+            return
+
+        for key in keys:
+            self._futures[key].set_result(values.get(key))
+
+
+class Loaders:
+    """The data loaders of one request, all reading through its session"""
+
+    def __init__(self, async_session: SQLAlchemyAsyncSession):
+        self.async_session = async_session
+        lock = asyncio.Lock()
+        self.users: DataLoader[int, User] = DataLoader(batch_load=self._load_users, lock=lock)
+        self.roles: DataLoader[int, Role] = DataLoader(batch_load=self._load_roles, lock=lock)
+        self.event_types: DataLoader[int, EventType] = DataLoader(batch_load=self._load_event_types, lock=lock)
+
+    async def _load_users(self, user_ids: list[int]) -> dict[int, User]:
+        users = await UserRepository(async_session=self.async_session).get_users_by_ids(user_ids)
+        return {user.id: user for user in users}
+
+    async def _load_roles(self, role_ids: list[int]) -> dict[int, Role]:
+        # Roles and event types are cached in memory already, a snapshot is only fetched once per batch
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        return {role_id: snapshot.roles_by_id[role_id] for role_id in role_ids if role_id in snapshot.roles_by_id}
+
+    async def _load_event_types(self, event_type_ids: list[int]) -> dict[int, EventType]:
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        return {
+            event_type_id: snapshot.event_types_by_id[event_type_id]
+            for event_type_id in event_type_ids if event_type_id in snapshot.event_types_by_id
+        }
@@ -3,6 +3,8 @@ import typing
 import sqlalchemy
 from sqlalchemy.sql import functions as sqlalchemy_functions
 
+from app.cache.catalog import catalog_cache
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
 from app.models.db.role_event_type import RoleEventType
 from app.repositories.base import BaseRepository
 from app.models.db.role import Role
@@ -13,11 +15,10 @@ from app.utilities.exceptions.database import EntityDoesNotExist
 class RoleRepository(BaseRepository):
     async def get_roles(self) -> typing.Sequence[Role]:
         """Get all roles from database"""
-        self.logger.debug("Fetching all roles from database")
+        self.logger.debug("Fetching all roles from catalog")
 
-        stmt = sqlalchemy.select(Role)
-        query = await self.async_session.execute(statement=stmt)
-        roles = query.scalars().all()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        roles = snapshot.roles
 
         self.logger.debug(f"Found {len(roles)} roles")
 
@@ -25,11 +26,10 @@ class RoleRepository(BaseRepository):
 
     async def get_role_by_id(self, role_id: int) -> Role:
         """Get role by ID from database"""
-        self.logger.debug(f"Fetching role with ID {role_id} from database")
+        self.logger.debug(f"Fetching role with ID {role_id} from catalog")
 
-        stmt = sqlalchemy.select(Role).where(Role.id == role_id)
-        query = await self.async_session.execute(statement=stmt)
-        role = query.scalar()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        role = snapshot.roles_by_id.get(role_id)
 
         if not role:
             raise EntityDoesNotExist(f"Role with id {role_id} does not exist!")
@@ -40,11 +40,10 @@ class RoleRepository(BaseRepository):
 
     async def get_role_by_name(self, role_name: str) -> Role:
         """Get role by name from database"""
-        self.logger.debug(f"Fetching role with name {role_name} from database")
+        self.logger.debug(f"Fetching role with name {role_name} from catalog")
 
-        stmt = sqlalchemy.select(Role).where(Role.name == role_name)
-        query = await self.async_session.execute(statement=stmt)
-        role = query.scalar()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        role = snapshot.roles_by_name.get(role_name)
 
         if not role:
             raise EntityDoesNotExist(f"Role with name {role_name} does not exist!")
@@ -62,6 +61,8 @@ class RoleRepository(BaseRepository):
 
         self.async_session.add(instance=new_role)
         try:
+            await self.async_session.flush()
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.ROLES, [new_role.id])
             await self.async_session.commit()
             await self.async_session.refresh(instance=new_role)
         except Exception as e:
@@ -93,6 +94,7 @@ class RoleRepository(BaseRepository):
 
         await self.async_session.execute(statement=update_stmt)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.ROLES, [role_id])
             await self.async_session.commit()
             await self.async_session.refresh(instance=update_role)
         except Exception as e:
@@ -120,6 +122,10 @@ class RoleRepository(BaseRepository):
 
         await self.async_session.execute(statement=stmt)
         try:
+            # Role assignments and permissions of this role are deleted by cascade
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.ROLES, [role_id])
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.PERMISSIONS, [role_id])
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USER_ROLES)
             await self.async_session.commit()
             self.async_session.expunge(role_to_delete)
         except Exception as e:
@@ -134,11 +140,9 @@ class RoleRepository(BaseRepository):
         """Get event type IDs for role from database"""
         self.logger.debug(f"Fetching event type IDs for role with ID {role_id} from database")
 
-        role_stmt = sqlalchemy.select(Role).where(Role.id == role_id)
-        role_query = await self.async_session.execute(role_stmt)
-        role = role_query.scalar()
+        snapshot = await catalog_cache.get(async_session=self.async_session)
 
-        if not role:
+        if role_id not in snapshot.roles_by_id:
             raise EntityDoesNotExist(f"Role with id {role_id} does not exist!")
 
         self.logger.debug(f"Found role with ID {role_id}. Fetching event type IDs...")
@@ -1,12 +1,15 @@
 import typing
 
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from sqlalchemy import func as sqlalchemy_functions
 
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
 from app.models.db.event_type import EventType
 from app.repositories.base import BaseRepository
-from app.models.db.role_event_type import RoleEventType
-from app.models.schemas.role_event_type import RoleEventTypeInCreate, RoleEventTypeInUpdate
+from app.models.db.role_event_type import Permission, RoleEventType
+from app.models.db.user_event_type_access import UserEventTypeAccess
+from app.models.schemas.role_event_type import RoleEventTypeInCreate, RoleEventTypeInMatrix, RoleEventTypeInUpdate
 from app.utilities.exceptions.database import EntityDoesNotExist
 
 
@@ -62,6 +65,33 @@ class RoleEventTypeRepository(BaseRepository):
 
         return permission
 
+    async def get_access_of_user(self, user_id: int, event_type_id: int) -> UserEventTypeAccess | None:
+        """Get the permissions of a user on an event type over all their roles from database"""
+        self.logger.debug(f"Fetching access of user with ID {user_id} to event type with ID {event_type_id}")
+
+        access = await self.async_session.get(UserEventTypeAccess, (user_id, event_type_id))
+
+        self.logger.debug(f"Found access: {access}")
+
+        return access
+
+    async def get_accesses_of_user(
+            self, user_id: int, event_type_ids: typing.Iterable[int]
+    ) -> typing.Sequence[UserEventTypeAccess]:
+        """Get the permissions of a user on any of the event types over all their roles from database"""
+        event_type_ids = list(event_type_ids)
+        self.logger.debug(f"Fetching access of user with ID {user_id} to event types with IDs {event_type_ids}")
+
+        stmt = sqlalchemy.select(UserEventTypeAccess)\
+            .where(UserEventTypeAccess.user_id == user_id)\
+            .where(UserEventTypeAccess.event_type_id.in_(event_type_ids))
+        query = await self.async_session.execute(statement=stmt)
+        accesses = query.scalars().all()
+
+        self.logger.debug(f"Found {len(accesses)} accesses")
+
+        return accesses
+
     async def create_permissions(self, permission_create: RoleEventTypeInCreate) -> RoleEventType:
         """Create new permissions in database"""
         self.logger.debug(f"Creating new permissions: {permission_create}")
@@ -71,6 +101,9 @@ class RoleEventTypeRepository(BaseRepository):
 
         self.async_session.add(instance=new_permissions)
         try:
+            await invalidation_bus.publish(
+                self.async_session, InvalidationNamespace.PERMISSIONS, [permission_create.role_id]
+            )
             await self.async_session.commit()
             await self.async_session.refresh(instance=new_permissions)
         except Exception as e:
@@ -99,15 +132,16 @@ class RoleEventTypeRepository(BaseRepository):
 
         self.logger.debug(f"Updating permissions: {update_permissions}. Updating...")
 
-        new_permissions_data = permission_update.dict()
+        new_permissions = Permission.from_flags(**permission_update.dict())
 
         update_stmt = sqlalchemy.update(RoleEventType) \
             .where(RoleEventType.role_id == role_id)\
             .where(RoleEventType.event_type_id == event_type_id)\
-            .values(updated_at=sqlalchemy_functions.now(), **new_permissions_data)
+            .values(permissions=new_permissions)
 
         await self.async_session.execute(statement=update_stmt)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.PERMISSIONS, [role_id])
             await self.async_session.commit()
             await self.async_session.refresh(instance=update_permissions)
         except Exception as e:
@@ -141,6 +175,7 @@ class RoleEventTypeRepository(BaseRepository):
 
         await self.async_session.execute(statement=stmt)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.PERMISSIONS, [role_id])
             await self.async_session.commit()
             self.async_session.expunge(permissions_to_delete)
         except Exception as e:
@@ -151,6 +186,54 @@ class RoleEventTypeRepository(BaseRepository):
 
         return permissions_to_delete
 
+    async def replace_permissions_of_role(
+            self,
+            role_id: int,
+            permissions: typing.Sequence[RoleEventTypeInMatrix],
+    ) -> typing.Sequence[RoleEventType]:
+        """Replace all permissions of a role with one statement, the event types left out lose their permissions"""
+        self.logger.debug(f"Replacing permissions of role with ID {role_id} on {len(permissions)} event types")
+
+        # The last permissions given for an event type win, ON CONFLICT can not update a row twice
+        rows = {
+            permission.event_type_id: {
+                "role_id": role_id,
+                "event_type_id": permission.event_type_id,
+                "permissions": Permission.from_flags(
+                    can_edit=permission.can_edit, can_see=permission.can_see, can_add=permission.can_add
+                ),
+            }
+            for permission in permissions
+        }
+        removed = sqlalchemy.delete(RoleEventType)\
+            .where(RoleEventType.role_id == role_id)\
+            .where(RoleEventType.event_type_id.not_in(list(rows)))
+
+        if rows:
+            upsert_stmt = postgresql.insert(RoleEventType).values(list(rows.values()))
+            # Data-modifying CTEs run even when not referenced, and touch other rows than the upsert
+            stmt = upsert_stmt.on_conflict_do_update(
+                index_elements=[RoleEventType.role_id, RoleEventType.event_type_id],
+                set_={"PERMISSIONS": upsert_stmt.excluded.PERMISSIONS},
+            ).returning(RoleEventType).add_cte(removed.cte("REMOVED"))
+        else:
+            stmt = removed
+
+        try:
+            query = await self.async_session.execute(
+                statement=stmt, execution_options={"populate_existing": True}
+            )
+            new_permissions = query.scalars().all() if rows else []
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.PERMISSIONS, [role_id])
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Replaced permissions of role with ID {role_id}")
+
+        return new_permissions
+
     async def get_event_types_for_role(
             self,
             role_id: int
@@ -1,19 +1,40 @@
 import typing
 
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.sql import functions as sqlalchemy_functions
 from sqlalchemy import and_, select
-from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove
+from app.cache.invalidation import invalidation_bus, InvalidationNamespace
+from app.models.schemas.user_role import UserRoleInAssign, UserRoleInBatch, UserRoleInRemove, \
+    UserRolesInBatchAssignResult
 from app.repositories.base import BaseRepository
+from app.repositories.event_summary import EventSummaryRepository
+from app.models.db.event import Event
 from app.models.db.role import Role
 from app.models.db.user import User
 from app.models.db.user_role import user_roles
-from app.models.schemas.user import UserInCreate, UserInLogin, UserInUpdate
+from app.models.schemas.user import UserInCreate, UserInImport, UserInLogin, UserInUpdate
 from app.security.hashing.password import pass_generator
 from app.security.verifications.credentials import credential_verifier
 from app.utilities.exceptions.database import EntityDoesNotExist, EntityAlreadyExists
 from app.utilities.exceptions.security import PasswordDoesNotMatch
 
+# Filled with COPY by a user import, and dropped with the transaction that created it
+user_import_staging = sqlalchemy.Table(
+    "USER_IMPORT",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("POSITION", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("USERNAME", sqlalchemy.String(length=50), nullable=False),
+    sqlalchemy.Column("FIRST_NAME", sqlalchemy.String(length=50)),
+    sqlalchemy.Column("LAST_NAME", sqlalchemy.String(length=50)),
+    sqlalchemy.Column("HASHED_PASSWORD", sqlalchemy.String(length=1024), nullable=False),
+    sqlalchemy.Column("HASH_SALT", sqlalchemy.String(length=1024), nullable=False),
+    sqlalchemy.Column("ROLE_NAMES", postgresql.ARRAY(sqlalchemy.String(length=1024)), nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
 
 class UserRepository(BaseRepository):
     async def get_users(self) -> typing.Sequence[User]:
@@ -45,6 +66,18 @@ class UserRepository(BaseRepository):
 
         return user
 
+    async def get_users_by_ids(self, user_ids: typing.Sequence[int]) -> typing.Sequence[User]:
+        """Get all users by IDs from database"""
+        self.logger.debug(f"Fetching users with IDs {user_ids} from database")
+
+        stmt = sqlalchemy.select(User).where(User.id.in_(user_ids))
+        query = await self.async_session.execute(statement=stmt)
+        users = query.scalars().all()
+
+        self.logger.debug(f"Found {len(users)} users")
+
+        return users
+
     async def get_user_by_username(self, username: str) -> User:
         """Get user by username from database"""
         self.logger.debug(f"Fetching user with username {username} from database")
@@ -108,6 +141,7 @@ class UserRepository(BaseRepository):
 
         self.async_session.add(instance=new_user)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USERNAMES, [new_user.username])
             await self.async_session.commit()
             await self.async_session.refresh(instance=new_user)
         except Exception as e:
@@ -140,6 +174,9 @@ class UserRepository(BaseRepository):
 
         try:
             await self.async_session.execute(update_stmt)
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USERS, [user_id])
+            if user_update.username is not None:
+                await invalidation_bus.publish(self.async_session, InvalidationNamespace.USERNAMES, [user_update.username])
             await self.async_session.commit()
         except Exception as e:
             await self.async_session.rollback()
@@ -169,9 +206,20 @@ class UserRepository(BaseRepository):
 
         self.logger.debug(f"Found user with ID {user_id}")
 
+        # The events of the user are deleted with it, by cascade
+        events_stmt = sqlalchemy.select(Event.event_type, Event.start_date, Event.end_date)\
+            .where(Event.created_by == delete_user.id)\
+            .with_for_update()
+        deleted_events = (await self.async_session.execute(statement=events_stmt)).tuples().all()
+
         stmt = sqlalchemy.delete(table=User).where(User.id == delete_user.id)
         await self.async_session.execute(statement=stmt)
         try:
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USERS, [user_id])
+            if deleted_events:
+                event_type_ids = {event_type for event_type, _, _ in deleted_events}
+                await invalidation_bus.publish(self.async_session, InvalidationNamespace.EVENTS, event_type_ids)
+                await EventSummaryRepository(self.async_session).apply_event_changes(removed=deleted_events)
             await self.async_session.commit()
             self.async_session.expunge(delete_user)
         except Exception as e:
@@ -220,6 +268,7 @@ class UserRepository(BaseRepository):
         stmt = user_roles.insert().values(USER_ID=user_id, ROLE_ID=role_id)
         try:
             await self.async_session.execute(stmt)
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USER_ROLES, [user_id])
             await self.async_session.commit()
         except Exception as e:
             await self.async_session.rollback()
@@ -229,6 +278,54 @@ class UserRepository(BaseRepository):
 
         return UserRoleInAssign(username=user.username, role_name=role.name)
 
+    async def assign_roles_to_users(
+            self, user_ids: typing.Sequence[int], role_ids: typing.Sequence[int]
+    ) -> UserRolesInBatchAssignResult:
+        """Assign every role to every user with one statement, unknown ids and existing assignments are skipped"""
+        self.logger.debug(f"Assigning roles with IDs {role_ids} to users with IDs {user_ids}")
+
+        batch_users = sqlalchemy.select(User.id.label("ID")).where(User.id.in_(user_ids)).cte("BATCH_USERS")
+        batch_roles = sqlalchemy.select(Role.id.label("ID")).where(Role.id.in_(role_ids)).cte("BATCH_ROLES")
+        assigned = postgresql.insert(user_roles)\
+            .from_select(["USER_ID", "ROLE_ID"], sqlalchemy.select(batch_users.c.ID, batch_roles.c.ID))\
+            .on_conflict_do_nothing()\
+            .returning(user_roles.c.USER_ID, user_roles.c.ROLE_ID)\
+            .cte("ASSIGNED")
+        # Existing users, existing roles and new assignments, told apart by their first column
+        stmt = sqlalchemy.union_all(
+            sqlalchemy.select(sqlalchemy.literal("user"), batch_users.c.ID, sqlalchemy.null()),
+            sqlalchemy.select(sqlalchemy.literal("role"), batch_roles.c.ID, sqlalchemy.null()),
+            sqlalchemy.select(sqlalchemy.literal("assigned"), assigned.c.USER_ID, assigned.c.ROLE_ID),
+        )
+
+        try:
+            rows = (await self.async_session.execute(stmt)).all()
+            found: dict[str, set[int]] = {"user": set(), "role": set()}
+            new_user_roles = []
+            for kind, _id, role_id in rows:
+                if kind == "assigned":
+                    new_user_roles.append(UserRoleInBatch(user_id=_id, role_id=role_id))
+                else:
+                    found[kind].add(_id)
+            if new_user_roles:
+                await invalidation_bus.publish(
+                    self.async_session, InvalidationNamespace.USER_ROLES,
+                    [user_role.user_id for user_role in new_user_roles],
+                )
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Assigned {len(new_user_roles)} roles to users")
+
+        return UserRolesInBatchAssignResult(
+            assigned=new_user_roles,
+            already_assigned=len(found["user"]) * len(found["role"]) - len(new_user_roles),
+            missing_user_ids=[user_id for user_id in user_ids if user_id not in found["user"]],
+            missing_role_ids=[role_id for role_id in role_ids if role_id not in found["role"]],
+        )
+
     async def remove_role_from_user(self, user_id: int, role_id: int) -> UserRoleInRemove:
         """Remove role from user"""
         self.logger.debug(f"Removing role with ID {role_id} from user with ID {user_id}")
@@ -251,6 +348,7 @@ class UserRepository(BaseRepository):
         stmt = user_roles.delete().where(user_roles.c.USER_ID == user_id, user_roles.c.ROLE_ID == role_id)
         try:
             await self.async_session.execute(stmt)
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USER_ROLES, [user_id])
             await self.async_session.commit()
         except Exception as e:
             await self.async_session.rollback()
@@ -296,10 +394,11 @@ class UserRepository(BaseRepository):
 
         self.logger.debug(f"Found user with ID {user_id}")
 
-        stmt = sqlalchemy.update(User).where(User.id == user_id).values(profile_pic=profile_pic)
+        stmt = sqlalchemy.update(User).where(User.id == user_id).values(profile_pic_url=profile_pic)
 
         try:
             await self.async_session.execute(stmt)
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USERS, [user_id])
             await self.async_session.commit()
         except Exception as e:
             await self.async_session.rollback()
@@ -308,3 +407,83 @@ class UserRepository(BaseRepository):
         self.logger.debug(f"Updated user with ID {user_id}")
 
         return update_user
+
+    async def get_taken_usernames(self, usernames: typing.Iterable[str]) -> set[str]:
+        """Get which of the usernames are already taken"""
+        usernames = list(usernames)
+        self.logger.debug(f"Checking which of {len(usernames)} usernames are taken")
+
+        stmt = sqlalchemy.select(User.username).where(User.username.in_(usernames))
+        query = await self.async_session.execute(statement=stmt)
+        taken = set(query.scalars().all())
+
+        self.logger.debug(f"Found {len(taken)} taken usernames")
+
+        return taken
+
+    async def import_users(
+            self, users: typing.Sequence[UserInImport], password_hashes: typing.Sequence[tuple[str, str]]
+    ) -> typing.Sequence[User]:
+        """
+        Create users and assign their roles in one transaction, from `(salt, hashed password)` already generated.
+
+        The rows are loaded with COPY into a temporary table, then inserted and given their roles by name with
+        two set based statements. Usernames taken in the meantime are skipped, so the returned users may be
+        fewer than the imported ones.
+        """
+        self.logger.debug(f"Importing {len(users)} users")
+
+        connection = await self.async_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        records = [
+            (position, user.username, user.first_name, user.last_name, hashed_password, salt, user.roles)
+            for position, (user, (salt, hashed_password)) in enumerate(zip(users, password_hashes))
+        ]
+        staging = user_import_staging.c
+
+        insert_stmt = (
+            postgresql.insert(User)
+            .from_select(
+                [
+                    User.username, User.first_name, User.last_name, User._hashed_password, User._hash_salt,
+                    User.created_at,
+                ],
+                sqlalchemy.select(
+                    staging.USERNAME, staging.FIRST_NAME, staging.LAST_NAME, staging.HASHED_PASSWORD,
+                    staging.HASH_SALT, sqlalchemy_functions.now(),
+                ).order_by(staging.POSITION),
+            )
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User)
+        )
+
+        try:
+            await self.async_session.execute(CreateTable(user_import_staging))
+            await raw_connection.driver_connection.copy_records_to_table(
+                user_import_staging.name, records=records, columns=[column.name for column in staging],
+            )
+            query = await self.async_session.execute(insert_stmt)
+            new_users = query.scalars().all()
+
+            new_user_ids = [user.id for user in new_users]
+            roles_stmt = user_roles.insert().from_select(
+                ["USER_ID", "ROLE_ID"],
+                sqlalchemy.select(User.id, Role.id)
+                .join(user_import_staging, staging.USERNAME == User.username)
+                .join(Role, Role.name == sqlalchemy.any_(staging.ROLE_NAMES))
+                .where(User.id.in_(new_user_ids)),
+            )
+            await self.async_session.execute(roles_stmt)
+
+            await invalidation_bus.publish(
+                self.async_session, InvalidationNamespace.USERNAMES, [user.username for user in new_users]
+            )
+            await invalidation_bus.publish(self.async_session, InvalidationNamespace.USER_ROLES, new_user_ids)
+            await self.async_session.commit()
+        except Exception as e:
+            await self.async_session.rollback()
+            raise e
+
+        self.logger.debug(f"Imported {len(new_users)} users")
+
+        return new_users
@@ -20,3 +20,12 @@ def get_pwd_generator() -> PasswordGenerator:
 
 
 pass_generator: PasswordGenerator = get_pwd_generator()
+
+
+def generate_salted_password_hashes(passwords: list[str]) -> list[tuple[str, str]]:
+    """Generate a salt and the salted hash of each password, CPU bound, so meant to run in a worker process"""
+    hashes = []
+    for password in passwords:
+        salt = pass_generator.generate_salt
+        hashes.append((salt, pass_generator.generate_hashed_password(salt=salt, password=password)))
+    return hashes
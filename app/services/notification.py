@@ -4,7 +4,7 @@ from app.models.schemas.event_type import EventTypeInResponse
 from app.models.schemas.role import RoleInResponse
 from app.models.schemas.role_event_type import RoleEventTypeInResponse
 from app.models.schemas.user import UserInResponse
-from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove
+from app.models.schemas.user_role import UserRoleInAssign, UserRoleInRemove, UserRolesInBatchAssignResult
 from app.services.base import BaseService
 from app.config.manager import settings
 from app.models.schemas.event import EventInResponse
@@ -35,6 +35,18 @@ class NotificationService(BaseService):
 
         await self.send_notification(settings.DISCORD_URL, payload)
 
+    async def send_event_batch_notification(
+            self,
+            events: list[EventInResponse],
+            event_operation: EventOperation
+    ) -> None:
+        payload = {
+            "event_operation": event_operation.value,
+            "events": [event.json() for event in events]
+        }
+
+        await self.send_notification(settings.DISCORD_URL, payload)
+
     async def send_event_type_notification(
             self,
             event_type: EventTypeInResponse,
@@ -57,6 +69,17 @@ class NotificationService(BaseService):
         }
         await self.send_notification(settings.DISCORD_URL, payload)
 
+    async def send_user_batch_notification(
+            self,
+            users: list[UserInResponse],
+            event_operation: EventOperation
+    ) -> None:
+        payload = {
+            "event_operation": event_operation.value,
+            "events": [user.json() for user in users]
+        }
+        await self.send_notification(settings.DISCORD_URL, payload)
+
     async def send_role_notification(
             self,
             role: RoleInResponse,
@@ -79,6 +102,17 @@ class NotificationService(BaseService):
         }
         await self.send_notification(settings.DISCORD_URL, payload)
 
+    async def send_user_role_batch_notification(
+            self,
+            user_roles: UserRolesInBatchAssignResult,
+            event_operation: EventOperation
+    ) -> None:
+        payload = {
+            "event_operation": event_operation.value,
+            "event": user_roles.json()
+        }
+        await self.send_notification(settings.DISCORD_URL, payload)
+
     async def send_permission_notification(
             self,
             permission: RoleEventTypeInResponse,
@@ -89,3 +123,14 @@ class NotificationService(BaseService):
             "event": permission.json()
         }
         await self.send_notification(settings.DISCORD_URL, payload)
+
+    async def send_permission_batch_notification(
+            self,
+            permissions: list[RoleEventTypeInResponse],
+            event_operation: EventOperation
+    ) -> None:
+        payload = {
+            "event_operation": event_operation.value,
+            "events": [permission.json() for permission in permissions]
+        }
+        await self.send_notification(settings.DISCORD_URL, payload)
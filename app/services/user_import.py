@@ -0,0 +1,148 @@
+import asyncio
+import csv
+import io
+import json
+import math
+import typing
+
+import fastapi
+import pydantic
+
+from app.cache.catalog import catalog_cache
+from app.config.manager import settings
+from app.models.schemas.user import UserInImport, UserInImportResult, UserInResponse
+from app.repositories.user import UserRepository
+from app.security.hashing.password import generate_salted_password_hashes
+from app.services.base import BaseService
+from app.utilities.exceptions.upload import InvalidImportFile
+from app.utilities.executors.process_pool import process_pool
+from app.utilities.messages.exc_details import http_400_username_details, http_404_role_names_details
+
+# Separator of the role names in the `roles` column of a CSV import
+CSV_ROLES_SEPARATOR = ";"
+
+
+def parse_user_import(content: bytes, filename: str | None = None, content_type: str | None = None) -> list[dict]:
+    """
+    Read the records of a user import, a JSON array of objects or a CSV file with a header row.
+
+    CSV columns are named like the fields of `UserInImport`, with the role names of a user separated by `;`.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise InvalidImportFile("The file is not UTF-8 encoded.")
+
+    is_json = (content_type or "").endswith("json") or (filename or "").lower().endswith(".json")
+    if is_json:
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise InvalidImportFile(f"Invalid JSON: {e}")
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise InvalidImportFile("The JSON document must be an array of objects.")
+    else:
+        try:
+            records = [
+                # Empty cells are missing values, not empty strings
+                {field: value or None for field, value in row.items() if field}
+                for row in csv.DictReader(io.StringIO(text))
+            ]
+        except csv.Error as e:
+            raise InvalidImportFile(f"Invalid CSV: {e}")
+        for record in records:
+            roles = record.get("roles")
+            record["roles"] = [role.strip() for role in roles.split(CSV_ROLES_SEPARATOR) if role.strip()] \
+                if isinstance(roles, str) else []
+
+    if len(records) > settings.USER_IMPORT_MAX_ROWS:
+        raise InvalidImportFile(f"At most {settings.USER_IMPORT_MAX_ROWS} users can be imported at once.")
+
+    return records
+
+
+async def hash_passwords(passwords: list[str]) -> list[tuple[str, str]]:
+    """Get the `(salt, hashed password)` of each password, hashed in parallel across the process pool"""
+    if not passwords:
+        return []
+
+    # A few chunks per worker, so a slow one does not hold back the whole import
+    chunk_size = math.ceil(len(passwords) / (process_pool.max_workers * 4))
+    chunks = await asyncio.gather(*(
+        process_pool.run(generate_salted_password_hashes, passwords[start:start + chunk_size])
+        for start in range(0, len(passwords), chunk_size)
+    ))
+    return [password_hash for chunk in chunks for password_hash in chunk]
+
+
+class UserImportService(BaseService):
+    async def import_users(self, records: typing.Sequence[dict]) -> list[UserInImportResult]:
+        """Create users from import records in one transaction, returns the outcome of each of them"""
+        self.logger.info(f"Importing {len(records)} users")
+
+        results: dict[int, UserInImportResult] = {}
+        to_import: dict[int, UserInImport] = {}
+        usernames: set[str] = set()
+        for index, record in enumerate(records):
+            try:
+                user = UserInImport.parse_obj(record)
+            except pydantic.ValidationError as e:
+                results[index] = self._failed(index, fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY, str(e))
+                continue
+
+            if (user.first_name is None) != (user.last_name is None):
+                results[index] = self._failed(
+                    index, fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    "User has to have both first and last name or neither",
+                )
+            elif user.username in usernames:
+                results[index] = self._failed(
+                    index, fastapi.status.HTTP_400_BAD_REQUEST, http_400_username_details(username=user.username)
+                )
+            else:
+                to_import[index] = user
+                usernames.add(user.username)
+
+        user_repo = UserRepository(async_session=self.async_session)
+        taken = await user_repo.get_taken_usernames(usernames)
+        snapshot = await catalog_cache.get(async_session=self.async_session)
+        for index, user in list(to_import.items()):
+            unknown_roles = [role for role in user.roles if role not in snapshot.roles_by_name]
+            if user.username in taken:
+                results[index] = self._failed(
+                    index, fastapi.status.HTTP_400_BAD_REQUEST, http_400_username_details(username=user.username)
+                )
+            elif unknown_roles:
+                results[index] = self._failed(
+                    index, fastapi.status.HTTP_404_NOT_FOUND, http_404_role_names_details(role_names=unknown_roles)
+                )
+            else:
+                continue
+            del to_import[index]
+
+        if to_import:
+            password_hashes = await hash_passwords([user.password for user in to_import.values()])
+            new_users = {
+                new_user.username: UserInResponse.from_orm(new_user)
+                for new_user in await user_repo.import_users(
+                    users=list(to_import.values()), password_hashes=password_hashes
+                )
+            }
+            for index, user in to_import.items():
+                if user.username in new_users:
+                    results[index] = UserInImportResult(
+                        index=index, status_code=fastapi.status.HTTP_201_CREATED, user=new_users[user.username]
+                    )
+                else:
+                    # Taken by a concurrent signup after it was checked
+                    results[index] = self._failed(
+                        index, fastapi.status.HTTP_400_BAD_REQUEST, http_400_username_details(username=user.username)
+                    )
+
+        self.logger.info(f"Imported {sum(result.user is not None for result in results.values())} users")
+
+        return [results[index] for index in range(len(records))]
+
+    @staticmethod
+    def _failed(index: int, status_code: int, detail: str) -> UserInImportResult:
+        return UserInImportResult(index=index, status_code=status_code, detail=detail)
@@ -0,0 +1,45 @@
+import abc
+import typing
+
+# Cache-Control stored with every blob, blobs are addressed by content and never change
+BLOB_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+class StorageBackend(abc.ABC):
+    """
+    Where assets are stored, addressed by `/` separated keys such as `blobs/ab/cd/<sha256>.jpg`.
+
+    Uploads are always staged and processed on local disk first, backends only ever receive finished files.
+    """
+
+    @abc.abstractmethod
+    async def claim(self, key: str) -> bool:
+        """Whether the object exists, in which case its modification time is refreshed for the garbage collector"""
+
+    @abc.abstractmethod
+    async def put(self, key: str, path: str, content_type: str) -> None:
+        """Store the local file at `path` under `key`, the local file may be moved or consumed"""
+
+    @abc.abstractmethod
+    async def list_objects(self, prefix: str) -> typing.Sequence[tuple[str, float]]:
+        """List the `(key, modification timestamp)` of all objects under `prefix`"""
+
+    @abc.abstractmethod
+    async def delete_objects(self, keys: typing.Sequence[str], unmodified_since: float) -> int:
+        """
+        Delete objects, returns how many were deleted.
+
+        The objects of one blob are passed in the same call, a backend that can check `unmodified_since` keeps
+        all of them as soon as one of them was modified since.
+        """
+
+    async def download_url(self, key: str) -> tuple[str, int] | None:
+        """
+        Get a URL clients download the object from directly, and for how many seconds it may be reused.
+
+        None means the API serves the object itself.
+        """
+        return None
+
+    async def close(self) -> None:
+        """Release connections held by the backend"""
@@ -0,0 +1,23 @@
+from app.config.manager import settings
+from app.storage.backends.base import StorageBackend
+from app.storage.backends.local import LocalStorageBackend
+from app.storage.backends.s3 import S3StorageBackend
+
+
+def get_storage_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(root=settings.ASSETS_PATH)
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageBackend(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            part_size=settings.S3_MULTIPART_PART_SIZE,
+            presign_expires=settings.S3_PRESIGN_EXPIRES,
+        )
+    raise ValueError(f"Unknown storage backend {settings.STORAGE_BACKEND!r}, expected 'local' or 's3'")
+
+
+storage_backend: StorageBackend = get_storage_backend()
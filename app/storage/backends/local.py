@@ -0,0 +1,98 @@
+import collections
+import os
+import typing
+
+from starlette.concurrency import run_in_threadpool
+
+from app.storage.backends.base import StorageBackend
+from app.storage.blobs import blob_hash
+
+
+def _claim(path: str) -> bool:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _put(path: str, destination: str) -> None:
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(path, destination)
+
+
+def _list_objects(root: str, prefix: str) -> list[tuple[str, float]]:
+    objects = []
+    for directory, directories, files in os.walk(os.path.join(root, *prefix.split("/"))):
+        # Uploads in progress and other hidden entries are not objects
+        directories[:] = [name for name in directories if not name.startswith(".")]
+        for name in files:
+            if name.startswith("."):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            objects.append((os.path.relpath(path, root).replace(os.sep, "/"), mtime))
+    return objects
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _delete_group(paths: typing.Sequence[str], unmodified_since: float) -> int:
+    # Checked again right before deleting, a blob may have been claimed since it was listed. Only the original is
+    # claimed, so a recent original keeps its whole group, and it goes first: once it is gone, a claim fails and
+    # the upload writes the derivatives again
+    if any(mtime is not None and mtime >= unmodified_since for mtime in map(_mtime, paths)):
+        return 0
+
+    deleted = 0
+    for path in paths:
+        mtime = _mtime(path)
+        if mtime is not None and mtime < unmodified_since:
+            try:
+                os.unlink(path)
+                deleted += 1
+            except FileNotFoundError:
+                pass
+    return deleted
+
+
+def _delete_files(paths: typing.Sequence[str], unmodified_since: float) -> int:
+    groups: dict[str, list[str]] = collections.defaultdict(list)
+    for path in paths:
+        groups[blob_hash(path) or path].append(path)
+
+    deleted = 0
+    for sha256, group in groups.items():
+        group.sort(key=lambda path: os.path.splitext(os.path.basename(path))[0] != sha256)
+        deleted += _delete_group(group, unmodified_since)
+    return deleted
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects stored as files under `root`, served by the API itself"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def claim(self, key: str) -> bool:
+        return await run_in_threadpool(_claim, self.path(key))
+
+    async def put(self, key: str, path: str, content_type: str) -> None:
+        await run_in_threadpool(_put, path, self.path(key))
+
+    async def list_objects(self, prefix: str) -> typing.Sequence[tuple[str, float]]:
+        return await run_in_threadpool(_list_objects, self.root, prefix)
+
+    async def delete_objects(self, keys: typing.Sequence[str], unmodified_since: float) -> int:
+        return await run_in_threadpool(_delete_files, [self.path(key) for key in keys], unmodified_since)
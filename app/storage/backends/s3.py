@@ -0,0 +1,324 @@
+import base64
+import datetime
+import hashlib
+import hmac
+import os
+import time
+import typing
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+import xml.sax.saxutils
+
+import aiohttp
+import yarl
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+from app.storage.backends.base import BLOB_CACHE_CONTROL, StorageBackend
+from app.utilities.exceptions.assets import StorageError
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+# Largest batch accepted by DeleteObjects
+MAX_DELETE_KEYS = 1000
+# Smallest part accepted by UploadPart, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+# Shortest validity of presigned URLs, they are signed for windows of half of it
+MIN_PRESIGN_EXPIRES = 2
+
+
+def _uri_encode(value: str, safe: str = "") -> str:
+    return urllib.parse.quote(value, safe="-_.~" + safe)
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hmac_sha256(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def _canonical_query(query: str) -> str:
+    pairs = urllib.parse.parse_qsl(query, keep_blank_values=True)
+    return "&".join(f"{_uri_encode(name)}={_uri_encode(value)}" for name, value in sorted(pairs))
+
+
+class S3Signer:
+    """AWS Signature Version 4 for S3 requests and presigned URLs"""
+
+    def __init__(self, access_key_id: str, secret_access_key: str, region: str, service: str = "s3"):
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+        self.service = service
+
+    def _scope(self, now: datetime.datetime) -> str:
+        return f"{now:%Y%m%d}/{self.region}/{self.service}/aws4_request"
+
+    def _signature(self, now: datetime.datetime, canonical_request: str) -> str:
+        string_to_sign = "\n".join([
+            ALGORITHM, f"{now:%Y%m%dT%H%M%SZ}", self._scope(now), _sha256_hex(canonical_request.encode()),
+        ])
+
+        signing_key = _hmac_sha256(f"AWS4{self.secret_access_key}".encode(), f"{now:%Y%m%d}")
+        for part in (self.region, self.service, "aws4_request"):
+            signing_key = _hmac_sha256(signing_key, part)
+
+        return hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    def sign(
+            self, method: str, url: str, headers: typing.Mapping[str, str], payload_hash: str, now: datetime.datetime
+    ) -> dict[str, str]:
+        """
+        Get the headers to send with a request, including its `Authorization`.
+
+        `url` must already be URI encoded as S3 expects it, it is signed exactly as given.
+        """
+        parts = urllib.parse.urlsplit(url)
+        signed = {name.lower(): " ".join(str(value).split()) for name, value in headers.items()}
+        signed.update({
+            "host": parts.netloc,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": f"{now:%Y%m%dT%H%M%SZ}",
+        })
+
+        signed_headers = ";".join(sorted(signed))
+        canonical_request = "\n".join([
+            method,
+            parts.path or "/",
+            _canonical_query(parts.query),
+            "".join(f"{name}:{signed[name]}\n" for name in sorted(signed)),
+            signed_headers,
+            payload_hash,
+        ])
+
+        signed["authorization"] = (
+            f"{ALGORITHM} Credential={self.access_key_id}/{self._scope(now)},"
+            f"SignedHeaders={signed_headers},Signature={self._signature(now, canonical_request)}"
+        )
+        # Set by the HTTP client from the URL
+        del signed["host"]
+
+        return signed
+
+    def presign(self, method: str, url: str, expires: int, now: datetime.datetime) -> str:
+        """Get a URL that allows `method` on `url` to anyone holding it, for `expires` seconds from `now`"""
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.urlencode({
+            "X-Amz-Algorithm": ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key_id}/{self._scope(now)}",
+            "X-Amz-Date": f"{now:%Y%m%dT%H%M%SZ}",
+            "X-Amz-Expires": str(expires),
+            "X-Amz-SignedHeaders": "host",
+        })
+        canonical_query = _canonical_query(f"{parts.query}&{query}" if parts.query else query)
+        canonical_request = "\n".join([
+            method, parts.path or "/", canonical_query, f"host:{parts.netloc}\n", "host", UNSIGNED_PAYLOAD,
+        ])
+
+        signature = self._signature(now, canonical_request)
+        return f"{parts.scheme}://{parts.netloc}{parts.path}?{canonical_query}&X-Amz-Signature={signature}"
+
+
+def _xml_children(element: ElementTree.Element, name: str) -> list[ElementTree.Element]:
+    # S3 responses are namespaced, match on the local name only
+    return [child for child in element if child.tag.rsplit("}", 1)[-1] == name]
+
+
+def _xml_text(element: ElementTree.Element, name: str) -> str | None:
+    children = _xml_children(element, name)
+    return children[0].text if children else None
+
+
+def _read_part(path: str, offset: int, size: int) -> tuple[bytes, str]:
+    with open(path, "rb") as file_object:
+        file_object.seek(offset)
+        data = file_object.read(size)
+    return data, _sha256_hex(data)
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Objects stored in an S3 compatible object store, addressed path-style as `<endpoint>/<bucket>/<key>`.
+
+    Files larger than one part are sent with a multipart upload, one part in memory at a time. Clients are
+    redirected to presigned URLs and download objects from the store directly. Presigned URLs are signed for
+    fixed time windows, so the URL of an object, and the browser cache entry behind it, stay the same within a
+    window. Unlike on local disk, deletes are not conditional: an object claimed between listing and deleting
+    is still deleted, which the garbage collector's grace period makes unlikely.
+    """
+
+    def __init__(
+            self,
+            endpoint_url: str,
+            bucket: str,
+            region: str,
+            access_key_id: str,
+            secret_access_key: str,
+            part_size: int,
+            presign_expires: int,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.presign_expires = max(presign_expires, MIN_PRESIGN_EXPIRES)
+        self.signer = S3Signer(access_key_id=access_key_id, secret_access_key=secret_access_key, region=region)
+        self.logger = logger.bind(name="stdout")
+        self._session: aiohttp.ClientSession | None = None
+
+    def _url(self, key: str = "", query: typing.Mapping[str, str] | None = None) -> str:
+        path = _uri_encode(f"/{self.bucket}/{key}" if key else f"/{self.bucket}", safe="/")
+        if not query:
+            return f"{self.endpoint_url}{path}"
+        return f"{self.endpoint_url}{path}?{urllib.parse.urlencode(query, quote_via=urllib.parse.quote)}"
+
+    async def _request(
+            self,
+            method: str,
+            key: str = "",
+            query: typing.Mapping[str, str] | None = None,
+            headers: typing.Mapping[str, str] | None = None,
+            body: bytes = b"",
+            payload_hash: str | None = None,
+            expected: typing.Collection[int] = (200,),
+    ) -> tuple[int, typing.Mapping[str, str], bytes]:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        url = self._url(key=key, query=query)
+        if payload_hash is None:
+            payload_hash = _sha256_hex(body)
+        signed_headers = self.signer.sign(
+            method=method, url=url, headers=headers or {}, payload_hash=payload_hash,
+            now=datetime.datetime.now(datetime.timezone.utc),
+        )
+
+        try:
+            async with self._session.request(
+                    method, yarl.URL(url, encoded=True), headers=signed_headers, data=body
+            ) as response:
+                data = await response.read()
+                status, response_headers = response.status, response.headers
+        except aiohttp.ClientError as e:
+            raise StorageError(f"S3 {method} {key} failed: {e}") from e
+
+        if status not in expected:
+            raise StorageError(f"S3 {method} {key} failed with {status}: {data[:500]!r}")
+
+        return status, response_headers, data
+
+    async def claim(self, key: str) -> bool:
+        status, headers, _ = await self._request("HEAD", key=key, expected=(200, 404))
+        if status == 404:
+            return False
+
+        # Copying an object onto itself is the only way to refresh its LastModified
+        await self._request("PUT", key=key, headers={
+            "x-amz-copy-source": _uri_encode(f"/{self.bucket}/{key}", safe="/"),
+            "x-amz-metadata-directive": "REPLACE",
+            "content-type": headers.get("Content-Type", "application/octet-stream"),
+            "cache-control": BLOB_CACHE_CONTROL,
+        })
+        return True
+
+    async def put(self, key: str, path: str, content_type: str) -> None:
+        size = (await run_in_threadpool(os.stat, path)).st_size
+        headers = {"content-type": content_type, "cache-control": BLOB_CACHE_CONTROL}
+
+        if size <= self.part_size:
+            body, payload_hash = await run_in_threadpool(_read_part, path, 0, size)
+            await self._request("PUT", key=key, headers=headers, body=body, payload_hash=payload_hash)
+        else:
+            await self._put_multipart(key=key, path=path, size=size, headers=headers)
+
+        await run_in_threadpool(os.unlink, path)
+
+    async def _put_multipart(self, key: str, path: str, size: int, headers: typing.Mapping[str, str]) -> None:
+        _, _, data = await self._request("POST", key=key, query={"uploads": ""}, headers=headers)
+        upload_id = _xml_text(ElementTree.fromstring(data), "UploadId")
+        if not upload_id:
+            raise StorageError(f"S3 CreateMultipartUpload of {key} returned no UploadId")
+
+        try:
+            etags = []
+            for part_number, offset in enumerate(range(0, size, self.part_size), start=1):
+                body, payload_hash = await run_in_threadpool(_read_part, path, offset, self.part_size)
+                _, part_headers, _ = await self._request(
+                    "PUT", key=key, query={"partNumber": str(part_number), "uploadId": upload_id},
+                    body=body, payload_hash=payload_hash,
+                )
+                etags.append(part_headers["ETag"])
+
+            complete = "".join(
+                f"<Part><PartNumber>{part_number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for part_number, etag in enumerate(etags, start=1)
+            )
+            _, _, data = await self._request(
+                "POST", key=key, query={"uploadId": upload_id},
+                body=f"<CompleteMultipartUpload>{complete}</CompleteMultipartUpload>".encode(),
+            )
+            # Errors of CompleteMultipartUpload can come with a 200 status
+            if ElementTree.fromstring(data).tag.rsplit("}", 1)[-1] == "Error":
+                raise StorageError(f"S3 CompleteMultipartUpload of {key} failed: {data[:500]!r}")
+        except BaseException:
+            try:
+                await self._request("DELETE", key=key, query={"uploadId": upload_id}, expected=(204, 404))
+            except StorageError as e:
+                self.logger.warning(f"Failed to abort multipart upload of {key}: {e}")
+            raise
+
+    async def list_objects(self, prefix: str) -> typing.Sequence[tuple[str, float]]:
+        objects = []
+        continuation_token = None
+        while True:
+            query = {"list-type": "2", "prefix": prefix}
+            if continuation_token is not None:
+                query["continuation-token"] = continuation_token
+            _, _, data = await self._request("GET", query=query)
+
+            result = ElementTree.fromstring(data)
+            for content in _xml_children(result, "Contents"):
+                last_modified = _xml_text(content, "LastModified") or ""
+                timestamp = datetime.datetime.fromisoformat(last_modified.replace("Z", "+00:00")).timestamp()
+                objects.append((_xml_text(content, "Key"), timestamp))
+
+            continuation_token = _xml_text(result, "NextContinuationToken")
+            if _xml_text(result, "IsTruncated") != "true" or not continuation_token:
+                return objects  # type: ignore
+
+    async def delete_objects(self, keys: typing.Sequence[str], unmodified_since: float) -> int:
+        deleted = 0
+        for start in range(0, len(keys), MAX_DELETE_KEYS):
+            batch = keys[start:start + MAX_DELETE_KEYS]
+            objects = "".join(f"<Object><Key>{xml.sax.saxutils.escape(key)}</Key></Object>" for key in batch)
+            body = f"<Delete><Quiet>true</Quiet>{objects}</Delete>".encode()
+            _, _, data = await self._request("POST", query={"delete": ""}, body=body, headers={
+                "content-md5": base64.b64encode(hashlib.md5(body).digest()).decode(),
+                "content-type": "application/xml",
+            })
+
+            errors = _xml_children(ElementTree.fromstring(data), "Error")
+            for error in errors:
+                self.logger.warning(f"Failed to delete {_xml_text(error, 'Key')}: {_xml_text(error, 'Message')}")
+            deleted += len(batch) - len(errors)
+
+        return deleted
+
+    async def download_url(self, key: str) -> tuple[str, int] | None:
+        # Signed at the start of the current window, so the URL only changes once per window
+        window = self.presign_expires // 2
+        now = int(time.time())
+        signed_at = now - now % window
+        url = self.signer.presign(
+            method="GET", url=self._url(key=key), expires=self.presign_expires,
+            now=datetime.datetime.fromtimestamp(signed_at, tz=datetime.timezone.utc),
+        )
+
+        # Valid for at least another window once the cached redirect expires
+        return url, signed_at + window - now
+
+    async def close(self) -> None:
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
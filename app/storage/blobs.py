@@ -0,0 +1,66 @@
+import os
+import posixpath
+import re
+import urllib.parse
+
+from app.models.schemas.profile_pic import ProfilePicFormat, ProfilePicSize
+
+BLOBS_DIRECTORY = "blobs"
+INCOMING_DIRECTORY = ".incoming"
+BLOB_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def blobs_root(root: str) -> str:
+    return os.path.join(root, BLOBS_DIRECTORY)
+
+
+def incoming_root(root: str) -> str:
+    """Local directory of uploads in progress, never served since it starts with a dot"""
+    return os.path.join(blobs_root(root), INCOMING_DIRECTORY)
+
+
+def blob_key(sha256: str, extension: str) -> str:
+    """
+    Get the storage key of the blob with the given content hash.
+
+    Blobs are sharded on the first two bytes of their hash, `blobs/ab/cd/abcd….jpg`, so no directory grows past
+    a few entries per shard. Derivatives of a blob live next to it, suffixed with their variant.
+    """
+    return f"{BLOBS_DIRECTORY}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def blob_hash(path_or_url: str | None) -> str | None:
+    """Get the content hash of the blob a path or URL refers to, None if it is not a blob"""
+    if not path_or_url:
+        return None
+
+    filename = path_or_url.split("?", 1)[0].rsplit("/", 1)[-1]
+    match = BLOB_HASH_PATTERN.match(filename)
+    return match.group(0) if match is not None else None
+
+
+def profile_pic_variant_url(
+        url: str | None, size: ProfilePicSize | None, image_format: ProfilePicFormat | None
+) -> str | None:
+    """
+    Get the URL of a derivative of the profile picture stored at `url`.
+
+    Without a size, the original upload is returned, unless a WebP is asked for, which resolves to the largest
+    WebP variant since the original is never re-encoded.
+    """
+    if url is None:
+        return None
+
+    if image_format == ProfilePicFormat.WEBP:
+        size = size or ProfilePicSize.LARGE
+    if size is None:
+        return url
+
+    # The version query of the original also identifies its derivatives, they are always written together
+    parts = urllib.parse.urlsplit(url)
+    directory, filename = posixpath.split(parts.path)
+    stem, extension = posixpath.splitext(filename)
+    if image_format == ProfilePicFormat.WEBP:
+        extension = ".webp"
+
+    return parts._replace(path=posixpath.join(directory, f"{stem}_{size.value}{extension}")).geturl()
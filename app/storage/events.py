@@ -0,0 +1,28 @@
+import fastapi
+from loguru import logger
+
+from app.storage.backends.factory import storage_backend
+from app.storage.gc import asset_garbage_collector
+
+
+async def init_storage(app: fastapi.FastAPI) -> None:
+    logger.info("Asset Garbage Collector --- Starting . . .")
+
+    asset_garbage_collector.start(session_factory=app.state.db.get_session)  # type: ignore
+    app.state.asset_garbage_collector = asset_garbage_collector  # type: ignore
+
+    logger.info(f"Asset Garbage Collector --- Started, collecting every {asset_garbage_collector.interval}s!")
+
+
+async def close_storage(app: fastapi.FastAPI) -> None:
+    logger.info("Asset Garbage Collector --- Stopping . . .")
+
+    await app.state.asset_garbage_collector.stop()  # type: ignore
+
+    logger.info("Asset Garbage Collector --- Stopped!")
+
+    logger.info("Storage Backend --- Closing . . .")
+
+    await storage_backend.close()
+
+    logger.info("Storage Backend --- Closed!")
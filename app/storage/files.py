@@ -0,0 +1,171 @@
+import collections
+import hashlib
+import mimetypes
+import os
+import typing
+
+import anyio
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.utilities.exceptions.assets import AssetNotFound, RangeNotSatisfiable
+
+FILE_CHUNK_SIZE = 64 * 1024
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+
+
+def resolve_asset_path(root: str, relative_path: str) -> str:
+    """Get the absolute path of an asset, refusing anything outside of `root` and temporary upload files"""
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, relative_path))
+
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise AssetNotFound(relative_path)
+    if any(part.startswith(".") for part in os.path.relpath(path, root).split(os.sep)):
+        raise AssetNotFound(relative_path)
+
+    return path
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_object:
+        for chunk in iter(lambda: file_object.read(FILE_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetETagCache:
+    """
+    Strong ETags of assets, i.e. the sha256 of their content.
+
+    Hashes are kept per path for as long as the inode, size and modification time of the file are unchanged,
+    so a file is only read again once it has been replaced.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: collections.OrderedDict[str, tuple[tuple[int, int, int], str]] = collections.OrderedDict()
+
+    async def get(self, path: str, stat: os.stat_result) -> str:
+        """Get the quoted ETag of the file at `path`, `stat` being its current status"""
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            self._entries.move_to_end(path)
+            return entry[1]
+
+        etag = f'"{await run_in_threadpool(_hash_file, path)}"'
+        self._entries[path] = (signature, etag)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return etag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches the ETag, in which case the client copy is still valid"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison, as required for If-None-Match
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return etag in candidates
+
+
+def parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Get the `(offset, count)` of a single `Range: bytes=...` request, None to send the whole file.
+
+    Multiple ranges and malformed headers are answered with the whole file, which RFC 9110 allows.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    if size == 0:
+        raise RangeNotSatisfiable(range_header)
+
+    start, _, end = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if not start:
+            suffix = int(end)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(range_header)
+            return max(size - suffix, 0), min(suffix, size)
+
+        first = int(start)
+        last = int(end) if end else size - 1
+    except ValueError:
+        return None
+
+    if first >= size:
+        raise RangeNotSatisfiable(range_header)
+    if first > last:
+        return None
+
+    last = min(last, size - 1)
+    return first, last - first + 1
+
+
+class AssetFileResponse(Response):
+    """
+    Send `count` bytes of a file from `offset`.
+
+    When the ASGI server offers the zerocopy extension, the file descriptor is handed to it so the kernel copies
+    the file straight to the socket with `sendfile`. Otherwise the file is streamed in chunks read from the
+    threadpool.
+    """
+
+    media_type = "application/octet-stream"
+
+    def __init__(
+            self,
+            path: str,
+            offset: int,
+            count: int,
+            status_code: int = 200,
+            headers: typing.Mapping[str, str] | None = None,
+    ):
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.status_code = status_code
+        self.media_type = mimetypes.guess_type(path)[0] or self.media_type
+        self.background = None
+        self.init_headers({**(headers or {}), "content-length": str(count)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        async with await anyio.open_file(self.path, mode="rb") as file_object:
+            if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file_object.wrapped,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+                return
+
+            await file_object.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file_object.read(min(FILE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    # Truncated while sending, end the body rather than leave the client waiting
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def get_asset_etag_cache() -> AssetETagCache:
+    return AssetETagCache(max_size=4096)
+
+
+asset_etag_cache: AssetETagCache = get_asset_etag_cache()
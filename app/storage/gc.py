@@ -0,0 +1,157 @@
+import asyncio
+import collections
+import os
+import shutil
+import time
+import typing
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config.manager import settings
+from app.repositories.assets import AssetsRepository
+from app.storage.backends.base import StorageBackend
+from app.storage.backends.factory import storage_backend
+from app.storage.blobs import BLOBS_DIRECTORY, blob_hash, incoming_root
+
+SessionFactory = typing.Callable[[], typing.AsyncContextManager[SQLAlchemyAsyncSession]]
+
+
+def find_garbage(
+        objects: typing.Iterable[tuple[str, float]], referenced: set[str], older_than: float
+) -> list[str]:
+    """List the keys of unreferenced blobs last modified before `older_than`, from `(key, mtime)` pairs"""
+    blobs: dict[str, list[tuple[str, float]]] = collections.defaultdict(list)
+    for key, mtime in objects:
+        sha256 = blob_hash(key)
+        if sha256 is not None and sha256 not in referenced:
+            blobs[sha256].append((key, mtime))
+
+    garbage = []
+    for blob_objects in blobs.values():
+        # A blob goes with its derivatives, and is kept as a whole as long as any of its objects is recent
+        if all(mtime < older_than for _, mtime in blob_objects):
+            garbage.extend(key for key, _ in blob_objects)
+
+    return garbage
+
+
+def garbage_batches(garbage: typing.Sequence[str], batch_size: int) -> list[list[str]]:
+    """
+    Split the keys of `find_garbage` into batches of about `batch_size` keys, never splitting the objects of a
+    blob between batches, as the backend checks a blob and its derivatives together before deleting them
+    """
+    groups: dict[str, list[str]] = collections.defaultdict(list)
+    for key in garbage:
+        groups[blob_hash(key) or key].append(key)
+
+    batches: list[list[str]] = []
+    for group in groups.values():
+        if batches and len(batches[-1]) + len(group) <= batch_size:
+            batches[-1].extend(group)
+        else:
+            batches.append(list(group))
+    return batches
+
+
+def _clean_incoming(directory: str, older_than: float) -> int:
+    removed = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime >= older_than:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    except FileNotFoundError:
+        pass
+    return removed
+
+
+class AssetGarbageCollector:
+    """
+    Periodically delete blobs that no user references anymore.
+
+    A blob is referenced when its content hash appears in a `USER.PROFILE_PIC_URL`, and deleted together with
+    its derivatives. Blobs younger than the grace period are kept, as an upload stores its blob before the user
+    row points to it. Deletions go to the storage backend in batches, and an advisory lock keeps the collection
+    to a single worker at a time. Uploads abandoned in the local staging directory are removed as well.
+    """
+
+    def __init__(self, backend: StorageBackend, root: str, interval: int, grace_period: int, batch_size: int):
+        self.backend = backend
+        self.root = root
+        self.interval = interval
+        self.grace_period = grace_period
+        self.batch_size = batch_size
+        self.logger = logger.bind(name="stdout")
+        self._task: asyncio.Task | None = None
+
+    async def collect(self, async_session: SQLAlchemyAsyncSession) -> int:
+        """Run one collection, returns the number of deleted blob objects"""
+        older_than = time.time() - self.grace_period
+        # Staging is local to this host, not shared between workers through the lock
+        removed = await run_in_threadpool(_clean_incoming, incoming_root(self.root), older_than)
+        if removed:
+            self.logger.info(f"Removed {removed} abandoned uploads")
+
+        assets_repo = AssetsRepository(async_session=async_session)
+        if not await assets_repo.try_lock_garbage_collection():
+            self.logger.debug("Asset garbage collection is running in another worker")
+            return 0
+
+        referenced = {sha256 for sha256 in map(blob_hash, await assets_repo.get_profile_pic_urls()) if sha256}
+        objects = await self.backend.list_objects(prefix=f"{BLOBS_DIRECTORY}/")
+        garbage = find_garbage(objects=objects, referenced=referenced, older_than=older_than)
+
+        deleted = 0
+        for batch in garbage_batches(garbage=garbage, batch_size=self.batch_size):
+            deleted += await self.backend.delete_objects(keys=batch, unmodified_since=older_than)
+
+        self.logger.info(f"Asset garbage collection deleted {deleted} objects, {len(referenced)} blobs referenced")
+
+        return deleted
+
+    async def _run(self, session_factory: SessionFactory) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with session_factory() as async_session:
+                    await self.collect(async_session=async_session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Asset garbage collection failed: {e}")
+
+    def start(self, session_factory: SessionFactory) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run(session_factory=session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+def get_asset_garbage_collector() -> AssetGarbageCollector:
+    return AssetGarbageCollector(
+        backend=storage_backend,
+        root=settings.ASSETS_PATH,
+        interval=settings.ASSET_GC_INTERVAL,
+        grace_period=settings.ASSET_GC_GRACE_PERIOD,
+        batch_size=settings.ASSET_GC_BATCH_SIZE,
+    )
+
+
+asset_garbage_collector: AssetGarbageCollector = get_asset_garbage_collector()
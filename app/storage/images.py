@@ -0,0 +1,80 @@
+import os
+
+from PIL import Image, ImageOps
+
+from app.models.schemas.profile_pic import ProfilePicSize
+from app.utilities.exceptions.upload import UnsupportedMediaType
+
+PROFILE_PIC_PIXELS: dict[ProfilePicSize, int] = {
+    ProfilePicSize.SMALL: 64,
+    ProfilePicSize.MEDIUM: 256,
+    ProfilePicSize.LARGE: 512,
+}
+# Refuse to decode anything larger, e.g. a tiny file declaring huge dimensions
+MAX_IMAGE_PIXELS = 50_000_000
+
+SAVE_OPTIONS: dict[str, dict[str, int | bool]] = {
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80, "method": 4},
+}
+
+
+def _save_atomically(image: Image.Image, path: str, image_format: str) -> None:
+    partial_path = f"{path}.part"
+    # No exif, xmp or icc_profile is passed, so the saved image carries no metadata
+    image.save(partial_path, format=image_format, **SAVE_OPTIONS[image_format])
+    os.replace(partial_path, path)
+
+
+def _decode(source: str) -> tuple[Image.Image, str]:
+    try:
+        with Image.open(source) as image:
+            if image.format not in SAVE_OPTIONS or image.format == "WEBP":
+                raise UnsupportedMediaType(f"Unsupported image format {image.format}")
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                raise UnsupportedMediaType(f"Image of {image.width}x{image.height} pixels is too large")
+
+            image_format = image.format
+            image = ImageOps.exif_transpose(image)
+            return image.convert("RGBA" if image_format == "PNG" else "RGB"), image_format
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        raise UnsupportedMediaType(f"Image could not be decoded: {e}") from None
+
+
+def process_profile_pic(source: str, destination: str) -> list[str]:
+    """
+    Decode the uploaded profile picture at `source` once, write its thumbnails in every size, in its own format
+    and as WebP, next to `destination`, and finally re-encode it to `destination`.
+
+    The original is served publicly like its thumbnails, so it is re-encoded too and none of them keep the EXIF,
+    XMP or ICC metadata of the upload, such as the location of a phone picture.
+
+    Runs in a worker process, on local disk only. Returns the written files, the original last, in the order
+    they should be stored so an existing original always comes with all of its derivatives. On invalid content
+    `source` is removed and nothing else is touched.
+    """
+    try:
+        image, image_format = _decode(source=source)
+    except UnsupportedMediaType:
+        os.unlink(source)
+        raise
+
+    # Cheap integer downscale first, still at least as large as the largest thumbnail
+    reduced = image.reduce(max(1, min(image.size) // max(PROFILE_PIC_PIXELS.values())))
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    stem, extension = os.path.splitext(destination)
+    written = []
+    for size, pixels in PROFILE_PIC_PIXELS.items():
+        thumbnail = ImageOps.fit(reduced, (pixels, pixels), method=Image.Resampling.LANCZOS)
+        for path, variant_format in ((f"{stem}_{size.value}{extension}", image_format),
+                                     (f"{stem}_{size.value}.webp", "WEBP")):
+            _save_atomically(thumbnail, path, variant_format)
+            written.append(path)
+
+    _save_atomically(image, destination, image_format)
+    os.unlink(source)
+    written.append(destination)
+
+    return written
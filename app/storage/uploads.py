@@ -0,0 +1,101 @@
+import hashlib
+import os
+import tempfile
+import typing
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.utilities.exceptions.upload import UnsupportedMediaType, UploadTooLarge
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Magic bytes of the accepted image formats and the extension they are stored with
+IMAGE_SIGNATURES: dict[bytes, str] = {
+    b"\xff\xd8\xff": "jpg",
+    b"\x89PNG\r\n\x1a\n": "png",
+}
+IMAGE_CONTENT_TYPES: dict[str, str] = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+}
+
+
+def sniff_image_extension(header: bytes) -> str | None:
+    """Get the extension of the image format `header` starts with, None if it is not an accepted image"""
+    for signature, extension in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            return extension
+    return None
+
+
+def _open_temporary_file(directory: str) -> tuple[typing.BinaryIO, str]:
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    return os.fdopen(fd, "wb"), path
+
+
+def _write_chunk(file_object: typing.BinaryIO, digest: typing.Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    file_object.write(chunk)
+
+
+def _commit_temporary_file(file_object: typing.BinaryIO, path: str, destination: str) -> None:
+    file_object.flush()
+    os.fsync(file_object.fileno())
+    file_object.close()
+    os.replace(path, destination)
+
+
+def _discard_temporary_file(file_object: typing.BinaryIO, path: str) -> None:
+    file_object.close()
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_image_upload(file: UploadFile, directory: str, name: str, max_bytes: int) -> tuple[str, str]:
+    """
+    Stream an uploaded image to `directory`/`name`.<extension> and return its path and sha256 hex digest.
+
+    The upload is read in chunks and written from the threadpool, so neither memory nor the event loop is held
+    by the size of the file. The format is sniffed from the content, and the file only appears at its final
+    path once it is completely written.
+    """
+    try:
+        if file.size is not None and file.size > max_bytes:
+            raise UploadTooLarge(f"Upload of {file.size} bytes exceeds the limit of {max_bytes} bytes")
+
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        extension = sniff_image_extension(chunk)
+        if extension is None:
+            raise UnsupportedMediaType("Upload is neither a JPEG nor a PNG image")
+
+        destination = os.path.join(directory, f"{name}.{extension}")
+        digest = await _stream_to_file(file=file, first_chunk=chunk, destination=destination, max_bytes=max_bytes)
+    finally:
+        await file.close()
+
+    return destination, digest
+
+
+async def _stream_to_file(file: UploadFile, first_chunk: bytes, destination: str, max_bytes: int) -> str:
+    file_object, path = await run_in_threadpool(_open_temporary_file, os.path.dirname(destination))
+    digest = hashlib.sha256()
+    try:
+        chunk, size = first_chunk, 0
+        while chunk:
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds the limit of {max_bytes} bytes")
+
+            await run_in_threadpool(_write_chunk, file_object, digest, chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+
+        await run_in_threadpool(_commit_temporary_file, file_object, path, destination)
+    except BaseException:
+        await run_in_threadpool(_discard_temporary_file, file_object, path)
+        raise
+
+    return digest.hexdigest()
@@ -0,0 +1,16 @@
+class AssetNotFound(Exception):
+    """
+    Throw an exception when a requested asset does not exist or lies outside of the assets directory.
+    """
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    Throw an exception when a requested byte range lies outside of the file.
+    """
+
+
+class StorageError(Exception):
+    """
+    Throw an exception when the storage backend fails to complete an operation.
+    """
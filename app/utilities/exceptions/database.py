@@ -7,4 +7,10 @@ class EntityDoesNotExist(Exception):
 class EntityAlreadyExists(Exception):
     """
     Throw an exception when the data already exist in the database.
-    """
\ No newline at end of file
+    """
+
+
+class EntityConflict(Exception):
+    """
+    Throw an exception when the data conflicts with data already in the database.
+    """
@@ -1,8 +1,9 @@
 import fastapi
 
 from app.utilities.messages.exc_details import (
-    http_404_id_details,
+    http_404_id_details, http_404_ids_details,
     http_404_username_details, http_404_user_role_relation_details, http_404_user_role_details,
+    http_404_asset_details, http_404_override_details,
 )
 
 
@@ -13,6 +14,20 @@ async def http_404_exc_event_id_not_found_request(_id: int) -> Exception:
     )
 
 
+async def http_404_exc_override_not_found_request(event_id: int, start: str) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_404_NOT_FOUND,
+        detail=http_404_override_details(event_id=event_id, start=start),
+    )
+
+
+async def http_404_exc_ids_not_found_request(_object: str, ids: list[int]) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_404_NOT_FOUND,
+        detail=http_404_ids_details(_object=_object, ids=ids),
+    )
+
+
 async def http_404_exc_role_id_not_found_request(_id: int) -> Exception:
     return fastapi.HTTPException(
         status_code=fastapi.status.HTTP_404_NOT_FOUND,
@@ -46,3 +61,17 @@ async def http_404_exc_user_role_relation_not_found_request(user_id: int, role_i
         status_code=fastapi.status.HTTP_404_NOT_FOUND,
         detail=http_404_user_role_relation_details(user_id=user_id, role_id=role_id),
     )
+
+
+async def http_404_exc_asset_not_found_request(path: str) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_404_NOT_FOUND,
+        detail=http_404_asset_details(path=path),
+    )
+
+
+async def http_404_exc_event_type_id_not_found_request(_id: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_404_NOT_FOUND,
+        detail=http_404_id_details(_object="event type", _id=_id),
+    )
@@ -0,0 +1,17 @@
+import fastapi
+
+from app.utilities.messages.exc_details import http_409_booking_conflict_details, http_409_exclusive_event_type_details
+
+
+async def http_409_exc_booking_conflict_request() -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_409_CONFLICT,
+        detail=http_409_booking_conflict_details(),
+    )
+
+
+async def http_409_exc_exclusive_event_type_request(event_type_id: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_409_CONFLICT,
+        detail=http_409_exclusive_event_type_details(event_type_id=event_type_id),
+    )
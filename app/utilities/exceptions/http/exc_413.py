@@ -0,0 +1,10 @@
+import fastapi
+
+from app.utilities.messages.exc_details import http_413_upload_too_large_details
+
+
+async def http_413_exc_upload_too_large_request(max_bytes: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=http_413_upload_too_large_details(max_bytes=max_bytes),
+    )
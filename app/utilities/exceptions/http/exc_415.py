@@ -0,0 +1,10 @@
+import fastapi
+
+from app.utilities.messages.exc_details import http_415_unsupported_media_type_details
+
+
+async def http_415_exc_unsupported_media_type_request(allowed_types: list[str]) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=http_415_unsupported_media_type_details(allowed_types=allowed_types),
+    )
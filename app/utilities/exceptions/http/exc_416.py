@@ -0,0 +1,11 @@
+import fastapi
+
+from app.utilities.messages.exc_details import http_416_range_not_satisfiable_details
+
+
+async def http_416_exc_range_not_satisfiable_request(size: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail=http_416_range_not_satisfiable_details(size=size),
+        headers={"Content-Range": f"bytes */{size}"},
+    )
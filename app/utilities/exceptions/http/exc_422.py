@@ -0,0 +1,36 @@
+import fastapi
+
+from app.utilities.messages.exc_details import (
+    http_422_invalid_import_file_details,
+    http_422_invalid_month_range_details,
+    http_422_invalid_window_details,
+    http_422_not_an_occurrence_details,
+)
+
+
+async def http_422_exc_invalid_import_file_request(reason: str) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=http_422_invalid_import_file_details(reason=reason),
+    )
+
+
+async def http_422_exc_invalid_window_request(max_days: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=http_422_invalid_window_details(max_days=max_days),
+    )
+
+
+async def http_422_exc_invalid_month_range_request(max_months: int) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=http_422_invalid_month_range_details(max_months=max_months),
+    )
+
+
+async def http_422_exc_not_an_occurrence_request(event_id: int, start: str) -> Exception:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=http_422_not_an_occurrence_details(event_id=event_id, start=start),
+    )
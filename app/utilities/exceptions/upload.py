@@ -0,0 +1,16 @@
+class UploadTooLarge(Exception):
+    """
+    Throw an exception when an uploaded file exceeds the maximum allowed size.
+    """
+
+
+class UnsupportedMediaType(Exception):
+    """
+    Throw an exception when the content of an uploaded file is not of an allowed type.
+    """
+
+
+class InvalidImportFile(Exception):
+    """
+    Throw an exception when an uploaded import file cannot be read as a list of records.
+    """
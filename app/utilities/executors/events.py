@@ -0,0 +1,21 @@
+import fastapi
+from loguru import logger
+
+from app.utilities.executors.process_pool import process_pool
+
+
+async def init_process_pool(app: fastapi.FastAPI) -> None:
+    logger.info("Process Pool --- Starting . . .")
+
+    process_pool.start()
+    app.state.process_pool = process_pool  # type: ignore
+
+    logger.info(f"Process Pool --- Started with {process_pool.max_workers} workers!")
+
+
+async def close_process_pool(app: fastapi.FastAPI) -> None:
+    logger.info("Process Pool --- Shutting down . . .")
+
+    await app.state.process_pool.shutdown()  # type: ignore
+
+    logger.info("Process Pool --- Shut down!")
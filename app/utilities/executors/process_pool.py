@@ -0,0 +1,49 @@
+import asyncio
+import concurrent.futures
+import functools
+import multiprocessing
+import typing
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.manager import settings
+
+T = typing.TypeVar("T")
+
+
+class ProcessPool:
+    """
+    Shared `ProcessPoolExecutor` for CPU bound work, e.g. image processing or password hashing, that would
+    otherwise hold the event loop of an API worker.
+
+    Worker processes are spawned rather than forked, so they do not inherit the event loop, the database pool
+    or any other state of the API worker.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def run(self, fn: typing.Callable[..., T], *args: typing.Any, **kwargs: typing.Any) -> T:
+        """Run `fn`, which must be a picklable module level function, in a worker process"""
+        self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+
+def get_process_pool() -> ProcessPool:
+    return ProcessPool(max_workers=settings.PROCESS_POOL_MAX_WORKERS)
+
+
+process_pool: ProcessPool = get_process_pool()
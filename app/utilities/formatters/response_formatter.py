@@ -0,0 +1,15 @@
+import json
+import typing
+
+from fastapi.encoders import jsonable_encoder
+
+
+def serialize_response(content: typing.Any) -> bytes:
+    """Serialize response models exactly like `fastapi.responses.JSONResponse` does"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
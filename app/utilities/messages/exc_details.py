@@ -48,3 +48,55 @@ def http_404_user_role_details(user_id: int, role_id: int) -> str:
 
 def http_404_user_role_relation_details(user_id: int, role_id: int) -> str:
     return f"User with id {user_id} does not have a role with id {role_id}"
+
+
+def http_404_ids_details(_object: str, ids: list[int]) -> str:
+    return f"The {_object}s with ids {ids} don't exist!"
+
+
+def http_404_role_names_details(role_names: list[str]) -> str:
+    return f"The roles {role_names} don't exist!"
+
+
+def http_404_asset_details(path: str) -> str:
+    return f"The asset `{path}` doesn't exist or has been deleted!"
+
+
+def http_413_upload_too_large_details(max_bytes: int) -> str:
+    return f"The uploaded file is too large! The maximum allowed size is {max_bytes} bytes."
+
+
+def http_415_unsupported_media_type_details(allowed_types: list[str]) -> str:
+    return f"The uploaded file is not a supported image! Allowed types: {allowed_types}"
+
+
+def http_416_range_not_satisfiable_details(size: int) -> str:
+    return f"The requested range is not satisfiable! The file is {size} bytes long."
+
+
+def http_422_invalid_import_file_details(reason: str) -> str:
+    return f"The import file could not be read! {reason}"
+
+
+def http_422_invalid_window_details(max_days: int) -> str:
+    return f"The window must end after it starts and last at most {max_days} days!"
+
+
+def http_422_invalid_month_range_details(max_months: int) -> str:
+    return f"The last month must not be before the first one and the range must span at most {max_months} months!"
+
+
+def http_422_not_an_occurrence_details(event_id: int, start: str) -> str:
+    return f"Event with id {event_id} has no occurrence starting at {start}!"
+
+
+def http_404_override_details(event_id: int, start: str) -> str:
+    return f"Event with id {event_id} has no override of the occurrence starting at {start}!"
+
+
+def http_409_booking_conflict_details() -> str:
+    return "The event overlaps another event of its event type, which does not allow double bookings!"
+
+
+def http_409_exclusive_event_type_details(event_type_id: int) -> str:
+    return f"Events of the event type with id {event_type_id} overlap, resolve their conflicts first!"
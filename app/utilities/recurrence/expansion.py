@@ -0,0 +1,97 @@
+import datetime
+import typing
+
+from app.models.db.event import Event
+from app.models.db.event_override import EventOverride
+from app.models.schemas.event import EventOccurrenceInResponse
+from app.utilities.formatters.datetime_formatter import convert_to_utc
+from app.utilities.recurrence.rules import parse_recurrence_rule
+
+
+def is_occurrence(event: Event, start: datetime.datetime) -> bool:
+    """Whether the recurrence rule of the event generates an occurrence starting at `start`"""
+    if not event.recurrence_rule:
+        return start == event.start_date
+
+    rule = parse_recurrence_rule(rule=event.recurrence_rule, dtstart=event.start_date)
+    return bool(rule.between(start, start, inc=True))
+
+
+def next_occurrence_start(event: Event, after: datetime.datetime) -> datetime.datetime | None:
+    """Start of the first occurrence generated by the rule of the event at or after `after`, if the series goes on"""
+    if not event.recurrence_rule:
+        return event.start_date if event.start_date >= after else None
+
+    rule = parse_recurrence_rule(rule=event.recurrence_rule, dtstart=event.start_date)
+    start = rule.after(after, inc=True)
+    return convert_to_utc(start) if start else None
+
+
+def overlaps(
+        start: datetime.datetime,
+        end: datetime.datetime,
+        window_start: datetime.datetime,
+        window_end: datetime.datetime,
+) -> bool:
+    # Events without a duration belong to the window they start in
+    return start < window_end and (end > window_start or start >= window_start)
+
+
+def expand_event(
+        event: Event,
+        overrides: typing.Iterable[EventOverride],
+        window_start: datetime.datetime,
+        window_end: datetime.datetime,
+) -> list[EventOccurrenceInResponse]:
+    """
+    Get the occurrences of an event overlapping the window, with its overrides applied.
+
+    Only the occurrences of the window are generated, whatever the length of the series.
+    """
+    if not event.recurrence_rule:
+        if not overlaps(event.start_date, event.end_date, window_start, window_end):
+            return []
+        return [_occurrence(event=event, start=event.start_date, end=event.end_date)]
+
+    duration = event.end_date - event.start_date
+    overrides_by_start = {convert_to_utc(override.original_start): override for override in overrides}
+    rule = parse_recurrence_rule(rule=event.recurrence_rule, dtstart=event.start_date)
+
+    occurrences = []
+    for local_start in rule.between(window_start - duration, window_end, inc=True):
+        start = convert_to_utc(local_start)
+        if start not in overrides_by_start and overlaps(start, start + duration, window_start, window_end):
+            occurrences.append(_occurrence(event=event, start=start, end=start + duration, original_start=start))
+
+    # An overridden occurrence may have been moved into the window from outside of it
+    for original_start, override in overrides_by_start.items():
+        if override.is_cancelled:
+            continue
+        start = override.start_date or original_start
+        end = override.end_date or start + duration
+        if overlaps(start, end, window_start, window_end):
+            occurrences.append(
+                _occurrence(event=event, start=start, end=end, original_start=original_start, override=override)
+            )
+
+    return occurrences
+
+
+def _occurrence(
+        event: Event,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        original_start: datetime.datetime | None = None,
+        override: EventOverride | None = None,
+) -> EventOccurrenceInResponse:
+    return EventOccurrenceInResponse(
+        event_id=event.id,
+        created_by=event.created_by,
+        event_type=event.event_type,
+        title=override.title if override and override.title is not None else event.title,
+        description=override.description if override and override.description is not None else event.description,
+        start_date=start,
+        end_date=end,
+        original_start=original_start,
+        is_override=override is not None,
+    )
@@ -0,0 +1,41 @@
+import datetime
+import re
+import zoneinfo
+
+from dateutil import rrule as dateutil_rrule
+
+from app.config.manager import settings
+
+# Exceptions to a rule are stored as overrides, so a rule is a single RRULE
+UNSUPPORTED_PROPERTIES = re.compile(r"\b(DTSTART|RDATE|EXDATE|EXRULE)\b", re.IGNORECASE)
+# Finer rules could generate a huge number of occurrences in a single window
+UNSUPPORTED_FREQUENCIES = re.compile(r"\bFREQ=(SECONDLY|MINUTELY)\b", re.IGNORECASE)
+
+
+def parse_recurrence_rule(rule: str, dtstart: datetime.datetime) -> dateutil_rrule.rrule:
+    """
+    Parse an RRULE starting at `dtstart`, raises ValueError when it is not supported.
+
+    The rule runs in the configured timezone, so a weekly event keeps its local time across daylight saving time
+    changes.
+    """
+    if UNSUPPORTED_PROPERTIES.search(rule):
+        raise ValueError("Only RRULE is supported, exceptions to a rule are overrides of its occurrences")
+    if UNSUPPORTED_FREQUENCIES.search(rule):
+        raise ValueError("Events can recur at most hourly")
+
+    try:
+        parsed = dateutil_rrule.rrulestr(rule, dtstart=dtstart.astimezone(zoneinfo.ZoneInfo(settings.TIMEZONE)))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}")
+
+    if not isinstance(parsed, dateutil_rrule.rrule):
+        raise ValueError("Only a single RRULE is supported")
+
+    return parsed
+
+
+def validate_recurrence_rule(rule: str) -> str:
+    # Any start does, timezone-aware like the ones of events, so UNTIL has to be given in UTC
+    parse_recurrence_rule(rule=rule, dtstart=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+    return rule
@@ -0,0 +1,40 @@
+import datetime
+import typing
+
+from app.models.schemas.event import EventConflict, EventPeriod
+
+Period = tuple[int, datetime.datetime, datetime.datetime]
+
+
+def find_availability(
+        periods: typing.Iterable[Period],
+        window_start: datetime.datetime,
+        window_end: datetime.datetime,
+) -> tuple[list[EventPeriod], list[EventConflict]]:
+    """
+    Get the free slots of the window between the `(event_id, start, end)` periods, and the periods overlapping.
+
+    Periods are half-open, so an event ending when the next one starts leaves no slot and makes no conflict.
+    """
+    free_slots: list[EventPeriod] = []
+    conflicts: list[EventConflict] = []
+    # Periods started before the current one and not ended yet, as (event_id, end)
+    active: list[tuple[int, datetime.datetime]] = []
+    cursor = window_start
+
+    for event_id, start, end in sorted(periods, key=lambda period: (period[1], period[0])):
+        active = [(other_id, other_end) for other_id, other_end in active if other_end > start]
+        conflicts.extend(
+            EventConflict(event_id=other_id, other_event_id=event_id, start_date=start, end_date=min(end, other_end))
+            for other_id, other_end in active
+        )
+        active.append((event_id, end))
+
+        if start > cursor:
+            free_slots.append(EventPeriod(start_date=cursor, end_date=min(start, window_end)))
+        cursor = max(cursor, end)
+
+    if cursor < window_end:
+        free_slots.append(EventPeriod(start_date=cursor, end_date=window_end))
+
+    return free_slots, conflicts
@@ -0,0 +1,78 @@
+import collections
+import datetime
+import typing
+import zoneinfo
+
+# (event_type, start, end) of an event
+EventSpan = tuple[int, datetime.datetime, datetime.datetime]
+# (event_type, first day of the month) to (events starting, seconds booked)
+SummaryDeltas = dict[tuple[int, datetime.date], tuple[int, int]]
+
+
+def month_of(moment: datetime.datetime, timezone: str) -> datetime.date:
+    """First day of the month of `moment` in the timezone"""
+    return moment.astimezone(zoneinfo.ZoneInfo(timezone)).date().replace(day=1)
+
+
+def next_month(month: datetime.date) -> datetime.date:
+    return datetime.date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_bounds(month: datetime.date, timezone: str) -> tuple[datetime.datetime, datetime.datetime]:
+    """Start and end of the month in the timezone, in UTC so that durations across DST changes are exact"""
+    zone = zoneinfo.ZoneInfo(timezone)
+    following = next_month(month)
+    return (
+        datetime.datetime(month.year, month.month, 1, tzinfo=zone).astimezone(datetime.timezone.utc),
+        datetime.datetime(following.year, following.month, 1, tzinfo=zone).astimezone(datetime.timezone.utc),
+    )
+
+
+def month_contributions(
+        start: datetime.datetime, end: datetime.datetime, timezone: str
+) -> dict[datetime.date, tuple[int, int]]:
+    """
+    What an event adds to each month it spans, as `(events starting, seconds booked)`.
+
+    An event counts in the month it starts in and books whole seconds of every month it overlaps, an event ending
+    before it starts books none, like its period.
+    """
+    end = max(start, end)
+    contributions = {}
+    month, starting = month_of(moment=start, timezone=timezone), 1
+    while True:
+        month_start, month_end = month_bounds(month=month, timezone=timezone)
+        booked = max(min(end, month_end) - max(start, month_start), datetime.timedelta(0))
+        contributions[month] = (starting, booked // datetime.timedelta(seconds=1))
+        if end <= month_end:
+            return contributions
+        month, starting = next_month(month), 0
+
+
+def summary_deltas(
+        added: typing.Iterable[EventSpan], removed: typing.Iterable[EventSpan], timezone: str
+) -> SummaryDeltas:
+    """Changes to the monthly summaries of event types when the `added` events replace the `removed` ones"""
+    deltas: collections.defaultdict[tuple[int, datetime.date], list[int]] = collections.defaultdict(lambda: [0, 0])
+    for spans, sign in ((added, 1), (removed, -1)):
+        for event_type, start, end in spans:
+            for month, (starting, booked) in month_contributions(start=start, end=end, timezone=timezone).items():
+                deltas[event_type, month][0] += sign * starting
+                deltas[event_type, month][1] += sign * booked
+
+    # An update that neither moves nor resizes an event leaves its months alone
+    return {key: (count, seconds) for key, (count, seconds) in sorted(deltas.items()) if count or seconds}
+
+
+def month_span(first: datetime.date, last: datetime.date) -> int:
+    """Number of months from the one of `first` to the one of `last`, both included, 0 or less when reversed"""
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+
+def months_between(first: datetime.date, last: datetime.date) -> list[datetime.date]:
+    """First days of the months from the one of `first` to the one of `last`, both included"""
+    months, month = [], first.replace(day=1)
+    for _ in range(month_span(first=first, last=last)):
+        months.append(month)
+        month = next_month(month)
+    return months
@@ -1,8 +1,10 @@
-import requests
+import csv
 import random
 import string
+import sys
 
-BASE_URL = "http://localhost:8000/api"
+# Import the generated file with `python -m app.cli.import_users users.csv`
+OUTPUT_PATH = "users.csv"
 
 
 def generate_random_string(length):
@@ -15,20 +17,16 @@ def generate_random_password(length):
     return "".join(random.choice(chars) for _ in range(length))
 
 
-def create_user(username, password):
-    url = f"{BASE_URL}/users"
-    payload = {"username": username, "password": password}
-    response = requests.post(url, json=payload)
-    if response.status_code == 200:
-        print(f"User created: username={username}, password={password}")
-    else:
-        print(f"Failed to create user: {response.text}")
-
-
 # Number of users to create
-num_users = 30
-
-for _ in range(num_users):
-    username = generate_random_string(8)
-    password = generate_random_password(12)
-    create_user(username, password)
+num_users = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+with open(OUTPUT_PATH, "w", newline="") as csv_file:
+    writer = csv.writer(csv_file)
+    writer.writerow(["username", "password", "roles"])
+    for _ in range(num_users):
+        username = generate_random_string(8)
+        password = generate_random_password(12)
+        writer.writerow([username, password, ""])
+        print(f"User generated: username={username}, password={password}")
+
+print(f"Wrote {num_users} users to {OUTPUT_PATH}")
@@ -0,0 +1,139 @@
+import fastapi
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.dependencies.catalog import get_catalog_snapshot
+from app.api.dependencies.session import get_async_session
+from app.api.routes import admin
+from app.cache.catalog import CatalogSnapshot
+from app.models.db.event_type import EventType
+from app.models.db.role import Role
+from app.models.db.role_event_type import Permission, RoleEventType
+from app.models.db.user import User
+from app.models.schemas.role_event_type import RoleEventTypeInMatrix
+from app.models.schemas.user_role import UserRoleInBatch, UserRolesInBatchAssignResult
+from app.repositories import role_event_type, user
+from app.repositories.role_event_type import RoleEventTypeRepository
+from app.repositories.user import UserRepository
+from app.services.notification import NotificationService
+
+
+def compile_statement(statement) -> str:
+    return str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(admin.router)
+    snapshot = CatalogSnapshot(
+        version=1,
+        event_types=[
+            EventType(id=10, name="scout_event", description="", is_exclusive=False),
+            EventType(id=20, name="chalet", description="", is_exclusive=False),
+        ],
+        roles=[Role(id=1, name="admin"), Role(id=2, name="chef")],
+    )
+    app.dependency_overrides[get_async_session] = lambda: mocker.Mock()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    app.dependency_overrides[get_catalog_snapshot] = lambda: snapshot
+    mocker.patch.object(UserRepository, "get_roles_for_user", return_value=[Role(id=1, name="admin")])
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestAssignRolesToUsers:
+    @pytest.mark.asyncio
+    async def test_one_statement_reports_new_and_missing(self, mocker):
+        mocker.patch.object(user.invalidation_bus, "publish")
+        session = mocker.AsyncMock()
+        session.execute.return_value.all = mocker.Mock(return_value=[
+            ("user", 1, None), ("user", 2, None), ("role", 2, None), ("assigned", 2, 2),
+        ])
+
+        result = await UserRepository(async_session=session).assign_roles_to_users(user_ids=[1, 2, 3], role_ids=[2, 4])
+
+        sql = compile_statement(session.execute.call_args.args[0])
+        assert session.execute.await_count == 1
+        assert 'INSERT INTO "USER_ROLE"' in sql and "ON CONFLICT DO NOTHING" in sql
+        assert result.assigned == [UserRoleInBatch(user_id=2, role_id=2)]
+        assert result.already_assigned == 1
+        assert (result.missing_user_ids, result.missing_role_ids) == ([3], [4])
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_route(self, client, mocker):
+        assign = mocker.patch.object(UserRepository, "assign_roles_to_users", return_value=UserRolesInBatchAssignResult(
+            assigned=[UserRoleInBatch(user_id=5, role_id=2)], already_assigned=0, missing_user_ids=[],
+            missing_role_ids=[],
+        ))
+        notify = mocker.patch.object(NotificationService, "send_user_role_batch_notification")
+
+        response = await client.post("/admin/users/assign/roles", json={"userIds": [5], "roleIds": [2]})
+
+        assert response.status_code == 200
+        assert response.json()["assigned"] == [{"userId": 5, "roleId": 2}]
+        assert assign.call_args.kwargs == {"user_ids": [5], "role_ids": [2]}
+        notify.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_are_rejected(self, client):
+        response = await client.post("/admin/users/assign/roles", json={"userIds": [5, 5], "roleIds": [2]})
+
+        assert response.status_code == 422
+
+
+class TestReplacePermissions:
+    @pytest.mark.asyncio
+    async def test_delete_and_upsert_in_one_statement(self, mocker):
+        mocker.patch.object(role_event_type.invalidation_bus, "publish")
+        session = mocker.AsyncMock()
+        session.execute.return_value.scalars = mocker.Mock()
+        permissions = [
+            RoleEventTypeInMatrix(event_type_id=10, can_edit=False, can_see=True, can_add=False),
+            RoleEventTypeInMatrix(event_type_id=10, can_edit=True, can_see=True, can_add=True),
+        ]
+
+        await RoleEventTypeRepository(async_session=session).replace_permissions_of_role(
+            role_id=2, permissions=permissions
+        )
+
+        statement = session.execute.call_args.kwargs["statement"]
+        sql = compile_statement(statement)
+        assert session.execute.await_count == 1
+        assert sql.startswith('WITH "REMOVED" AS \n(DELETE FROM "ROLE_EVENT_TYPE"')
+        assert "ON CONFLICT" in sql and "DO UPDATE" in sql
+        # Only the last permissions given for an event type are written
+        assert statement.compile().params["PERMISSIONS_m0"] == Permission.EDIT | Permission.SEE | Permission.ADD
+        assert "PERMISSIONS_m1" not in statement.compile().params
+
+    @pytest.mark.asyncio
+    async def test_empty_matrix_only_deletes(self, mocker):
+        mocker.patch.object(role_event_type.invalidation_bus, "publish")
+        session = mocker.AsyncMock()
+
+        assert await RoleEventTypeRepository(async_session=session).replace_permissions_of_role(
+            role_id=2, permissions=[]
+        ) == []
+        assert compile_statement(session.execute.call_args.kwargs["statement"]).startswith("DELETE")
+
+    @pytest.mark.asyncio
+    async def test_route_checks_the_catalog(self, client, mocker):
+        replace = mocker.patch.object(RoleEventTypeRepository, "replace_permissions_of_role", return_value=[
+            RoleEventType(role_id=2, event_type_id=10, can_edit=True, can_see=True, can_add=True)
+        ])
+        mocker.patch.object(NotificationService, "send_permission_batch_notification")
+        body = [{"eventTypeId": 10, "canEdit": True, "canSee": True, "canAdd": True}]
+
+        unknown_role = await client.put("/admin/roles/3/permissions", json=body)
+        unknown_event_type = await client.put(
+            "/admin/roles/2/permissions", json=body + [{**body[0], "eventTypeId": 30}]
+        )
+        response = await client.put("/admin/roles/2/permissions", json=body)
+
+        assert unknown_role.status_code == unknown_event_type.status_code == 404
+        assert "[30]" in unknown_event_type.json()["detail"]
+        assert response.status_code == 200
+        assert response.json() == [{"roleId": 2, "eventTypeId": 10, "canEdit": True, "canSee": True, "canAdd": True}]
+        replace.assert_awaited_once()
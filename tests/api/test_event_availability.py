@@ -0,0 +1,86 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.dependencies.session import get_async_session
+from app.api.routes import event
+from app.models.db.event import Event
+from app.models.db.user import User
+from app.repositories.event import as_booking_conflict, EventRepository
+from app.services.notification import NotificationService
+from app.utilities.exceptions.database import EntityConflict
+
+NOW = datetime.datetime(2024, 7, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+class ExclusionViolation(Exception):
+    sqlstate = "23P01"
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_async_session] = lambda: mocker.Mock()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    mocker.patch.object(event, "check_event_type_permission")
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestAvailability:
+    @pytest.mark.asyncio
+    async def test_periods_are_read_with_an_overlap_query(self, mocker):
+        session = mocker.AsyncMock()
+        session.execute.return_value.all = mocker.Mock(return_value=[])
+
+        await EventRepository(async_session=session).get_periods_in_window(
+            event_type_id=3, window_start=NOW, window_end=NOW + datetime.timedelta(days=7)
+        )
+
+        sql = str(session.execute.call_args.kwargs["statement"].compile(dialect=postgresql.asyncpg.dialect()))
+        assert 'SELECT "EVENT"."ID", lower("EVENT"."PERIOD")' in sql
+        assert '"EVENT"."PERIOD" && tstzrange(' in sql
+
+    @pytest.mark.asyncio
+    async def test_route(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_periods_in_window", return_value=[
+            (1, NOW, NOW + datetime.timedelta(hours=2)),
+        ])
+        end = NOW + datetime.timedelta(hours=4)
+
+        response = await client.get(
+            "/events/availability", params={"event_type": 3, "start": NOW.isoformat(), "end": end.isoformat()}
+        )
+        invalid = await client.get(
+            "/events/availability", params={"event_type": 3, "start": end.isoformat(), "end": NOW.isoformat()}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["freeSlots"] == [{"startDate": "2024-07-01T12:00:00Z", "endDate": "2024-07-01T14:00:00Z"}]
+        assert invalid.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_double_booking_is_a_conflict(self, client, mocker):
+        mocker.patch.object(EventRepository, "create_event", side_effect=EntityConflict())
+        notify = mocker.patch.object(NotificationService, "send_event_notification")
+        body = {
+            "createdBy": 1, "eventType": 3, "title": "Rental", "description": "", "startDate": NOW.isoformat(),
+            "endDate": NOW.isoformat(),
+        }
+
+        response = await client.post("/events/create", json=body)
+
+        assert response.status_code == 409
+        notify.assert_not_called()
+
+    def test_only_exclusion_violations_are_conflicts(self):
+        violation = sqlalchemy.exc.IntegrityError("INSERT", {}, ExclusionViolation())
+        other = sqlalchemy.exc.IntegrityError("INSERT", {}, Exception())
+
+        assert isinstance(as_booking_conflict(violation), EntityConflict)
+        assert as_booking_conflict(other) is other
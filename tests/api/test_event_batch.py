@@ -0,0 +1,120 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.dependencies.session import get_async_session
+from app.api.routes import event
+from app.cache.catalog import catalog_cache, CatalogSnapshot
+from app.models.db.event import Event
+from app.models.db.event_type import EventType
+from app.models.db.user import User
+from app.repositories.event import EventRepository
+from app.repositories.user import UserRepository
+from app.services.notification import NotificationService
+
+NOW = datetime.datetime(2023, 9, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+def build_event(event_id: int, event_type: int, title: str = "Camp") -> Event:
+    return Event(
+        id=event_id, created_by=1, event_type=event_type, title=title, description="", start_date=NOW, end_date=NOW,
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_async_session] = lambda: mocker.Mock()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    mocker.patch.object(event, "get_permitted_event_types", return_value={10})
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestEventBatch:
+    @pytest.mark.asyncio
+    async def test_create_reports_each_item_and_notifies_once(self, client, mocker):
+        create_events = mocker.patch.object(
+            EventRepository, "create_events", return_value=[build_event(1, 10), build_event(2, 10)]
+        )
+        notify = mocker.patch.object(NotificationService, "send_event_batch_notification")
+        body = [
+            {"createdBy": 1, "eventType": event_type, "title": "Camp", "description": "",
+             "startDate": NOW.isoformat(), "endDate": NOW.isoformat()}
+            for event_type in (10, 20, 10)
+        ]
+
+        response = await client.post("/events/batch/create", json=body)
+
+        assert response.status_code == 200
+        assert [(item["index"], item["statusCode"]) for item in response.json()] == [(0, 201), (1, 403), (2, 201)]
+        assert [item["event"]["id"] for item in response.json() if item["event"]] == [1, 2]
+        assert len(create_events.call_args.kwargs["event_creates"]) == 2
+        notify.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_update_checks_missing_and_target_types(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_events_by_ids", return_value=[build_event(1, 10), build_event(2, 20)])
+        update_events = mocker.patch.object(EventRepository, "update_events", return_value=[build_event(1, 10, "New")])
+        mocker.patch.object(NotificationService, "send_event_batch_notification")
+        body = [{"id": 1, "title": "New"}, {"id": 1, "eventType": 20}, {"id": 2, "title": "New"}, {"id": 3}]
+
+        response = await client.put("/events/batch/update", json=body)
+
+        assert [item["statusCode"] for item in response.json()] == [200, 403, 403, 404]
+        assert [event_update.id for event_update in update_events.call_args.kwargs["event_updates"]] == [1]
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_written_when_every_item_fails(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_events_by_ids", return_value=[build_event(2, 20)])
+        delete_events = mocker.patch.object(EventRepository, "delete_events_by_ids")
+        notify = mocker.patch.object(NotificationService, "send_event_batch_notification")
+
+        response = await client.post("/events/batch/delete", json=[2, 3])
+
+        assert [item["statusCode"] for item in response.json()] == [403, 404]
+        delete_events.assert_not_called()
+        notify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_read_reports_missing_and_forbidden_ids(self, client, mocker):
+        get_events = mocker.patch.object(
+            EventRepository, "get_events_by_ids", return_value=[build_event(2, 20), build_event(1, 10)]
+        )
+
+        response = await client.get("/events/batch", params={"ids": [1, 2, 3, 1]})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()["events"]] == [1]
+        assert response.json()["missingIds"] == [3]
+        assert response.json()["forbiddenIds"] == [2]
+        get_events.assert_awaited_once_with([1, 2, 3])
+        event.get_permitted_event_types.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_read_details_are_loaded_in_one_query(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_events_by_ids", return_value=[build_event(1, 10), build_event(2, 10)])
+        get_users = mocker.patch.object(
+            UserRepository, "get_users_by_ids", return_value=[User(id=1, username="alice", created_at=NOW)]
+        )
+        mocker.patch.object(catalog_cache, "get", return_value=CatalogSnapshot(
+            version=1, roles=[],
+            event_types=[EventType(id=10, name="scout_event", description="", is_exclusive=False)],
+        ))
+
+        response = await client.get("/events/batch", params={"ids": [1, 2], "details": True})
+
+        events = response.json()["events"]
+        assert [item["creator"]["username"] for item in events] == ["alice", "alice"]
+        assert [item["eventTypeDetails"]["name"] for item in events] == ["scout_event", "scout_event"]
+        get_users.assert_awaited_once_with([1])
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_limited(self, client):
+        response = await client.post("/events/batch/delete", json=[])
+
+        assert response.status_code == 422
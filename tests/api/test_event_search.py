@@ -0,0 +1,74 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.dependencies.session import get_async_session
+from app.api.routes import event
+from app.models.db.event import Event
+from app.models.db.user import User
+from app.repositories.event import EventRepository
+
+NOW = datetime.datetime(2023, 9, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+def build_event(event_id: int) -> Event:
+    return Event(
+        id=event_id, created_by=1, event_type=10, title="Summer camp", description="", start_date=NOW, end_date=NOW,
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_async_session] = lambda: mocker.Mock()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestEventSearch:
+    @pytest.mark.asyncio
+    async def test_ranked_query_is_limited_to_visible_event_types(self, mocker):
+        session = mocker.AsyncMock()
+        session.execute.return_value.all = mocker.Mock(return_value=[(build_event(1), 0.5)])
+
+        results = await EventRepository(async_session=session).search_events(
+            text="summer camp", event_type_ids=[10, 20], limit=21, offset=40
+        )
+
+        statement = session.execute.call_args.kwargs["statement"]
+        sql = str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+        assert '"EVENT"."SEARCH_VECTOR" @@ websearch_to_tsquery' in sql
+        assert '"EVENT"."EVENT_TYPE" IN' in sql
+        assert "ORDER BY rank DESC" in sql
+        assert results == [(results[0][0], 0.5)]
+
+    @pytest.mark.asyncio
+    async def test_route_pages_through_results(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_event_type_ids_for_user", return_value=[10])
+        search = mocker.patch.object(EventRepository, "search_events", return_value=[
+            (build_event(1), 0.9), (build_event(2), 0.4), (build_event(3), 0.1),
+        ])
+
+        response = await client.get("/events/search", params={"q": "camp", "limit": 2, "offset": 4})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()["events"]] == [1, 2]
+        assert response.json()["events"][0]["rank"] == 0.9
+        assert response.json()["nextOffset"] == 6
+        assert search.call_args.kwargs == {"text": "camp", "event_type_ids": [10], "limit": 3, "offset": 4}
+
+    @pytest.mark.asyncio
+    async def test_user_without_visible_event_types_gets_nothing(self, client, mocker):
+        mocker.patch.object(EventRepository, "get_event_type_ids_for_user", return_value=[])
+        search = mocker.patch.object(EventRepository, "search_events")
+
+        response = await client.get("/events/search", params={"q": "camp"})
+
+        assert response.json() == {"events": [], "nextOffset": None}
+        search.assert_not_called()
@@ -0,0 +1,76 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.routes import event
+from app.models.db.event_month_summary import EventMonthSummary
+from app.models.db.user import User
+from app.repositories.event import EventRepository
+from app.repositories.event_summary import EventSummaryRepository
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    mocker.patch.object(EventRepository, "get_event_type_ids_for_user", return_value=[10, 3])
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestMonthlySummaries:
+    @pytest.mark.asyncio
+    async def test_every_month_of_the_range_is_listed(self, client, mocker):
+        july = EventMonthSummary(
+            event_type=10, month=datetime.date(2024, 7, 1), event_count=3, booked_seconds=31 * 24 * 3600
+        )
+        get_summaries = mocker.patch.object(EventSummaryRepository, "get_monthly_summaries", return_value=[july])
+
+        response = await client.get(
+            "/events/summary/monthly", params={"first_month": "2024-06-15", "last_month": "2024-07-01"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"eventType": 3, "month": "2024-06-01", "eventCount": 0, "bookedSeconds": 0, "occupancy": 0.0},
+            {"eventType": 3, "month": "2024-07-01", "eventCount": 0, "bookedSeconds": 0, "occupancy": 0.0},
+            {"eventType": 10, "month": "2024-06-01", "eventCount": 0, "bookedSeconds": 0, "occupancy": 0.0},
+            {
+                "eventType": 10, "month": "2024-07-01", "eventCount": 3, "bookedSeconds": july.booked_seconds,
+                "occupancy": 1.0,
+            },
+        ]
+        assert get_summaries.call_args.kwargs == {
+            "event_type_ids": [10, 3], "first_month": datetime.date(2024, 6, 1), "last_month": datetime.date(2024, 7, 1)
+        }
+
+    @pytest.mark.asyncio
+    async def test_only_visible_event_types_are_summarized(self, client, mocker):
+        get_summaries = mocker.patch.object(EventSummaryRepository, "get_monthly_summaries", return_value=[])
+
+        response = await client.get(
+            "/events/summary/monthly",
+            params={"first_month": "2024-07-01", "last_month": "2024-07-01", "event_type": [10, 99]},
+        )
+
+        assert response.status_code == 200
+        assert [item["eventType"] for item in response.json()] == [10]
+        assert get_summaries.call_args.kwargs["event_type_ids"] == [10]
+
+    @pytest.mark.asyncio
+    async def test_invalid_ranges(self, client, mocker):
+        get_summaries = mocker.patch.object(EventSummaryRepository, "get_monthly_summaries", return_value=[])
+
+        reversed_range = await client.get(
+            "/events/summary/monthly", params={"first_month": "2024-07-01", "last_month": "2024-06-01"}
+        )
+        too_long = await client.get(
+            "/events/summary/monthly", params={"first_month": "2000-01-01", "last_month": "2024-06-01"}
+        )
+
+        assert reversed_range.status_code == 422
+        assert too_long.status_code == 422
+        assert not get_summaries.called
@@ -0,0 +1,96 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.routes import event
+from app.models.db.event import Event
+from app.models.db.user import User
+from app.repositories.event import EventRepository
+
+NOW = datetime.datetime(2024, 7, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+def build_event(event_id: int, start: datetime.datetime = NOW, recurrence_rule: str | None = None) -> Event:
+    return Event(
+        id=event_id, created_by=1, event_type=10, title="Camp", description="", start_date=start, end_date=start,
+        recurrence_rule=recurrence_rule, created_at=NOW,
+    )
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    mocker.patch.object(EventRepository, "get_event_type_ids_for_user", return_value=[10, 11])
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestUpcomingEvents:
+    @pytest.mark.asyncio
+    async def test_events_of_visible_types_in_index_order(self, client, mocker):
+        get_ids = mocker.patch.object(EventRepository, "get_upcoming_event_ids", return_value=[7, 3])
+        mocker.patch.object(EventRepository, "get_events_by_ids", return_value=[build_event(3), build_event(7)])
+        mocker.patch.object(EventRepository, "get_recurring_events_started_before", return_value=[])
+
+        response = await client.get("/events/upcoming", params={"limit": 2})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [7, 3]
+        assert get_ids.call_args.kwargs["event_type_ids"] == [10, 11]
+        assert get_ids.call_args.kwargs["limit"] == 2
+
+    @pytest.mark.asyncio
+    async def test_series_started_before_are_merged_by_next_occurrence(self, client, mocker):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        mocker.patch.object(EventRepository, "get_upcoming_event_ids", return_value=[3, 7])
+        mocker.patch.object(EventRepository, "get_events_by_ids", return_value=[
+            build_event(3, start=now + datetime.timedelta(hours=1)),
+            build_event(7, start=now + datetime.timedelta(days=3)),
+        ])
+        # Daily since last year, next in about 12 hours, and weekly but over long ago
+        last_year = now - datetime.timedelta(days=365) + datetime.timedelta(hours=12)
+        mocker.patch.object(EventRepository, "get_recurring_events_started_before", return_value=[
+            build_event(5, start=last_year, recurrence_rule="FREQ=DAILY"),
+            build_event(6, start=last_year, recurrence_rule="FREQ=WEEKLY;COUNT=3"),
+        ])
+
+        response = await client.get("/events/upcoming", params={"limit": 2})
+
+        assert [item["id"] for item in response.json()] == [3, 5]
+
+    @pytest.mark.asyncio
+    async def test_limit_is_bounded(self, client):
+        response = await client.get("/events/upcoming", params={"limit": 100000})
+
+        assert response.status_code == 422
+
+
+class TestMyEvents:
+    @pytest.mark.asyncio
+    async def test_only_the_page_is_hydrated(self, client, mocker):
+        get_ids = mocker.patch.object(EventRepository, "get_event_ids_created_by", return_value=[9, 4])
+        get_events = mocker.patch.object(
+            EventRepository, "get_events_by_ids", return_value=[build_event(4), build_event(9)]
+        )
+
+        response = await client.get("/events/mine", params={"limit": 2, "offset": 4})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [9, 4]
+        assert get_ids.call_args.kwargs == {"user_id": 1, "limit": 2, "offset": 4}
+        assert get_events.call_args.args == ([9, 4],)
+
+
+class TestUpcomingEventIds:
+    @pytest.mark.asyncio
+    async def test_no_visible_event_type_reads_nothing(self, mocker):
+        session = mocker.AsyncMock()
+
+        event_ids = await EventRepository(session).get_upcoming_event_ids(event_type_ids=[], after=NOW, limit=5)
+
+        assert event_ids == []
+        assert not session.execute.called
@@ -0,0 +1,49 @@
+import datetime
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.dependencies.authentication import get_current_user
+from app.api.dependencies.session import get_async_session
+from app.api.routes import event
+from app.models.db.event import Event
+from app.models.db.user import User
+from app.repositories.event import EventRepository
+
+NOW = datetime.datetime(2024, 7, 1, 10, tzinfo=datetime.timezone.utc)
+
+
+def build_event(event_id: int) -> Event:
+    return Event(
+        id=event_id, created_by=1, event_type=10, title="Camp", description="", start_date=NOW, end_date=NOW,
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def client(mocker):
+    app = fastapi.FastAPI()
+    app.include_router(event.router)
+    app.dependency_overrides[get_async_session] = lambda: mocker.Mock()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    mocker.patch.object(EventRepository, "get_event_type_ids_for_user", return_value=[10])
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestEventWindow:
+    @pytest.mark.asyncio
+    async def test_only_the_page_is_hydrated_in_index_order(self, client, mocker):
+        mocker.patch.object(event.interval_index, "overlapping", return_value=[7, 3, 9, 4])
+        get_events = mocker.patch.object(
+            EventRepository, "get_events_by_ids", return_value=[build_event(9), build_event(3)]
+        )
+        end = NOW + datetime.timedelta(days=1)
+
+        response = await client.get(
+            "/events/window", params={"start": NOW.isoformat(), "end": end.isoformat(), "limit": 2, "offset": 1}
+        )
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [3, 9]
+        assert get_events.call_args.args == ([3, 9],)
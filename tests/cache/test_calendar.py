@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache.calendar import CalendarCache, ENTRY_OVERHEAD_BYTES
+
+
+class CountingLoader:
+    def __init__(self, event_type_ids: list[int], body: bytes = b"[]"):
+        self.event_type_ids = event_type_ids
+        self.body = body
+        self.calls = 0
+
+    async def __call__(self) -> tuple[list[int], bytes]:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.event_type_ids, self.body + str(self.calls).encode()
+
+
+def advance(monkeypatch, seconds: float) -> None:
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + seconds)
+
+
+class TestCalendarCache:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_from_cache(self):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+        loader = CountingLoader(event_type_ids=[1])
+
+        assert await cache.get(user_id=1, load=loader) == b"[]1"
+        assert await cache.get(user_id=1, load=loader) == b"[]1"
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_in_background(self, monkeypatch):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+        loader = CountingLoader(event_type_ids=[1])
+        await cache.get(user_id=1, load=loader)
+
+        advance(monkeypatch, seconds=31)
+        stale = await asyncio.gather(*(cache.get(user_id=1, load=loader) for _ in range(10)))
+        await asyncio.gather(*cache._revalidations.values())
+
+        assert stale == [b"[]1"] * 10
+        assert loader.calls == 2
+        assert await cache.get(user_id=1, load=loader) == b"[]2"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_waits_for_a_single_load(self, monkeypatch):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+        loader = CountingLoader(event_type_ids=[1])
+        await cache.get(user_id=1, load=loader)
+
+        advance(monkeypatch, seconds=601)
+        bodies = await asyncio.gather(*(cache.get(user_id=1, load=loader) for _ in range(10)))
+
+        assert bodies == [b"[]2"] * 10
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_background_refresh_keeps_stale_entry(self, monkeypatch):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+        await cache.get(user_id=1, load=CountingLoader(event_type_ids=[1]))
+
+        async def failing_loader():
+            raise ConnectionError("database unavailable")
+
+        advance(monkeypatch, seconds=31)
+        assert await cache.get(user_id=1, load=failing_loader) == b"[]1"
+        await asyncio.gather(*cache._revalidations.values())
+
+        assert await cache.get(user_id=1, load=failing_loader) == b"[]1"
+        await asyncio.gather(*cache._revalidations.values())
+
+    @pytest.mark.asyncio
+    async def test_event_change_only_evicts_users_seeing_its_type(self):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+        alice = CountingLoader(event_type_ids=[1, 2])
+        bob = CountingLoader(event_type_ids=[3])
+        await cache.get(user_id=1, load=alice)
+        await cache.get(user_id=2, load=bob)
+
+        cache.invalidate_event_types([2])
+        await cache.get(user_id=1, load=alice)
+        await cache.get(user_id=2, load=bob)
+
+        assert alice.calls == 2
+        assert bob.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        cache = CalendarCache(max_bytes=10_000, soft_ttl=30, hard_ttl=600)
+
+        async def racing_loader():
+            cache.invalidate_user_ids([1])
+            return [1], b"[]"
+
+        await cache.get(user_id=1, load=racing_loader)
+
+        assert cache.size == 0
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_evicts_least_recently_used(self):
+        entry_size = 100 + ENTRY_OVERHEAD_BYTES + 8
+        cache = CalendarCache(max_bytes=2 * entry_size, soft_ttl=30, hard_ttl=600)
+        loaders = {user_id: CountingLoader(event_type_ids=[1], body=b"x" * 99) for user_id in (1, 2, 3)}
+
+        await cache.get(user_id=1, load=loaders[1])
+        await cache.get(user_id=2, load=loaders[2])
+        await cache.get(user_id=1, load=loaders[1])
+        await cache.get(user_id=3, load=loaders[3])
+
+        assert cache.size == 2 * entry_size
+        await cache.get(user_id=1, load=loaders[1])
+        await cache.get(user_id=2, load=loaders[2])
+        assert loaders[1].calls == 1
+        assert loaders[2].calls == 2
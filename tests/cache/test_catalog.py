@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.dependencies import catalog
+from app.api.dependencies.session import get_async_session
+from app.api.routes import event
+from app.cache.catalog import CatalogCache, CatalogSnapshot
+from app.models.db.event_type import EventType
+from app.models.db.role import Role
+
+
+def build_snapshot(version: int = 0) -> CatalogSnapshot:
+    return CatalogSnapshot(
+        version=version,
+        event_types=[
+            EventType(id=1, name="scout_event", description="Pfadfindertermine", is_exclusive=False),
+            EventType(id=2, name="chalet", description="Chaletvermietung", is_exclusive=False),
+        ],
+        roles=[Role(id=1, name="admin"), Role(id=2, name="chef")],
+    )
+
+
+class TestCatalogSnapshot:
+    def test_lookups_by_id_and_name(self):
+        snapshot = build_snapshot()
+
+        assert snapshot.event_types_by_id[2].name == "chalet"
+        assert snapshot.event_types_by_name["scout_event"].id == 1
+        assert snapshot.roles_by_id[1].name == "admin"
+        assert snapshot.roles_by_name["chef"].id == 2
+        assert "missing" not in snapshot.roles_by_name
+
+    def test_responses_are_pre_serialized(self):
+        snapshot = build_snapshot()
+
+        assert json.loads(snapshot.roles_json) == [{"id": 1, "name": "admin"}, {"id": 2, "name": "chef"}]
+        assert json.loads(snapshot.event_types_json)[1] == {
+            "id": 2, "name": "chalet", "description": "Chaletvermietung", "isExclusive": False
+        }
+
+
+class TestCatalogCache:
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_load_once(self):
+        cache = CatalogCache()
+        loads = []
+
+        async def load(async_session, version):
+            loads.append(version)
+            await asyncio.sleep(0)
+            return build_snapshot(version=version)
+
+        cache._load = load
+        snapshots = await asyncio.gather(*(cache.get(async_session=None) for _ in range(10)))
+
+        assert len(loads) == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_replaces_snapshot(self):
+        cache = CatalogCache()
+
+        async def load(async_session, version):
+            return build_snapshot(version=version)
+
+        cache._load = load
+        first = await cache.get(async_session=None)
+        cache.invalidate()
+        second = await cache.get(async_session=None)
+
+        assert first is not second
+        assert second.version > first.version
+
+    @pytest.mark.asyncio
+    async def test_snapshot_invalidated_while_loading_is_not_kept(self):
+        cache = CatalogCache()
+
+        async def load(async_session, version):
+            cache.invalidate()
+            return build_snapshot(version=version)
+
+        cache._load = load
+        await cache.get(async_session=None)
+
+        assert cache._snapshot is None
+
+    @pytest.mark.asyncio
+    async def test_exclusive_event_type_is_served_after_invalidation(self, mocker):
+        chalet = EventType(id=2, name="chalet", description="Chaletvermietung", is_exclusive=False)
+        session = mocker.Mock()
+
+        async def execute(statement):
+            rows = [chalet] if statement.column_descriptions[0]["entity"] is EventType else []
+            return mocker.Mock(scalars=mocker.Mock(return_value=mocker.Mock(all=mocker.Mock(return_value=rows))))
+
+        session.execute = execute
+        cache = mocker.patch.object(catalog, "catalog_cache", CatalogCache())
+        app = fastapi.FastAPI()
+        app.include_router(event.router)
+        app.dependency_overrides[get_async_session] = lambda: session
+        client = httpx.AsyncClient(app=app, base_url="http://test")
+
+        before = await client.get("/events/event_types")
+        # As done by set_exclusive_by_id, the update is followed by an invalidation
+        chalet.is_exclusive = True
+        cache.invalidate([chalet.id])
+        after = await client.get("/events/event_types")
+
+        assert before.json()[0]["isExclusive"] is False
+        assert after.json()[0]["isExclusive"] is True
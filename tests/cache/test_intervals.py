@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+
+from app.cache.intervals import EventTypeIntervals, IntervalIndex, to_microseconds
+
+
+def at(day: int, hour: int = 0) -> datetime.datetime:
+    return datetime.datetime(2024, 7, day, hour, tzinfo=datetime.timezone.utc)
+
+
+def window(intervals: EventTypeIntervals, start: datetime.datetime, end: datetime.datetime) -> list[int]:
+    positions = intervals.overlapping(window_start=to_microseconds(start), window_end=to_microseconds(end))
+    return intervals.ids[positions].tolist()
+
+
+class FakeSession:
+    """Answers the index query with the rows of the requested eventTypes"""
+
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        params = statement.compile().params
+        event_type_ids = next((value for value in params.values() if isinstance(value, list)), None)
+        return FakeResult([row for row in self.rows if event_type_ids is None or row[0] in event_type_ids])
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+class TestEventTypeIntervals:
+    def test_overlapping(self):
+        intervals = EventTypeIntervals(rows=[
+            (1, at(1), at(20), False),  # long camp started before the window
+            (2, at(5), at(6), False),  # ended before the window
+            (3, at(10), at(10), False),  # no duration, inside the window
+            (4, at(2), at(2, 2), True),  # recurring, started long before
+            (5, at(12), at(13), False),  # after the window
+        ])
+
+        assert window(intervals, at(10), at(12)) == [1, 4, 3]
+
+
+class TestIntervalIndex:
+    @pytest.mark.asyncio
+    async def test_event_types_are_merged_by_start(self):
+        session = FakeSession(rows=[
+            (10, 1, at(3), at(4), False), (20, 2, at(1), at(4), False), (10, 3, at(2), at(4), False),
+        ])
+        index = IntervalIndex()
+
+        assert await index.overlapping(
+            async_session=session, event_type_ids=[10, 20], window_start=at(1), window_end=at(5)
+        ) == [2, 3, 1]
+        assert await index.overlapping(
+            async_session=session, event_type_ids=[10, 20], window_start=at(3, 12), window_end=at(5)
+        ) == [2, 3, 1]
+        assert session.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidated_event_types_are_rebuilt(self):
+        session = FakeSession(rows=[(10, 1, at(3), at(4), False), (20, 2, at(1), at(4), False)])
+        index = IntervalIndex()
+        await index.build(async_session=session)
+
+        session.rows.append((10, 3, at(2), at(4), False))
+        index.invalidate_event_types([10])
+
+        assert await index.overlapping(
+            async_session=session, event_type_ids=[10, 20], window_start=at(1), window_end=at(5)
+        ) == [2, 3, 1]
+        assert session.queries == 2
+
+    @pytest.mark.asyncio
+    async def test_event_types_without_events_are_remembered(self):
+        session = FakeSession(rows=[])
+        index = IntervalIndex()
+
+        for _ in range(2):
+            assert await index.overlapping(
+                async_session=session, event_type_ids=[30], window_start=at(1), window_end=at(5)
+            ) == []
+        assert session.queries == 1
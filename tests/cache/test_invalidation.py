@@ -0,0 +1,52 @@
+from app.cache.invalidation import InvalidationBus, InvalidationNamespace, MAX_PAYLOAD_BYTES
+
+
+class TestInvalidationBus:
+    def test_encode_and_decode_payload(self):
+        bus = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+        bus.origin = "worker-1"
+
+        payload = bus.encode(namespace=InvalidationNamespace.USERS, keys=[1, 2])
+
+        assert bus.decode(payload) == ("worker-1", "users", [1, 2])
+
+    def test_encode_oversized_payload_falls_back_to_full_flush(self):
+        bus = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+
+        payload = bus.encode(namespace=InvalidationNamespace.USERS, keys=list(range(MAX_PAYLOAD_BYTES)))
+
+        assert len(payload.encode()) < MAX_PAYLOAD_BYTES
+        assert bus.decode(payload)[2] is None
+
+    def test_notification_dispatches_to_registered_handlers(self):
+        bus = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+        bus.origin = "worker-1"
+        received = []
+        bus.register(InvalidationNamespace.ROLES, received.append)
+
+        sender = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+        sender.origin = "worker-2"
+        bus._on_notification(None, 0, "test", sender.encode(namespace=InvalidationNamespace.ROLES, keys=[3]))
+        bus._on_notification(None, 0, "test", sender.encode(namespace=InvalidationNamespace.USERS, keys=[4]))
+
+        assert received == [[3]]
+
+    def test_own_notifications_are_ignored(self):
+        bus = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+        bus.origin = "worker-1"
+        received = []
+        bus.register(InvalidationNamespace.ROLES, received.append)
+
+        bus._on_notification(None, 0, "test", bus.encode(namespace=InvalidationNamespace.ROLES, keys=[3]))
+
+        assert received == []
+
+    def test_flush_all_invalidates_every_namespace(self):
+        bus = InvalidationBus(channel="test", reconnect_delay=1, health_check_interval=1)
+        received = []
+        bus.register(InvalidationNamespace.ROLES, lambda keys: received.append(("roles", keys)))
+        bus.register(InvalidationNamespace.USERS, lambda keys: received.append(("users", keys)))
+
+        bus.flush_all()
+
+        assert sorted(received) == [("roles", None), ("users", None)]
@@ -0,0 +1,50 @@
+import datetime
+
+import pytest
+
+from app.cache.occurrences import OccurrenceCache
+
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+END = datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc)
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        return str(self.calls).encode()
+
+
+class TestOccurrenceCache:
+    @pytest.mark.asyncio
+    async def test_windows_are_shared_by_the_same_event_types(self):
+        cache = OccurrenceCache(max_entries=10)
+        loader = CountingLoader()
+
+        assert await cache.get(event_type_ids=[1, 2], window_start=START, window_end=END, load=loader) == b"1"
+        assert await cache.get(event_type_ids=[2, 1], window_start=START, window_end=END, load=loader) == b"1"
+        assert await cache.get(event_type_ids=[1], window_start=START, window_end=END, load=loader) == b"2"
+
+    @pytest.mark.asyncio
+    async def test_only_windows_of_the_event_type_are_invalidated(self):
+        cache = OccurrenceCache(max_entries=10)
+        loader = CountingLoader()
+        await cache.get(event_type_ids=[1], window_start=START, window_end=END, load=loader)
+        await cache.get(event_type_ids=[2], window_start=START, window_end=END, load=loader)
+
+        cache.invalidate_event_types([1])
+
+        assert await cache.get(event_type_ids=[1], window_start=START, window_end=END, load=loader) == b"3"
+        assert await cache.get(event_type_ids=[2], window_start=START, window_end=END, load=loader) == b"2"
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_window_is_evicted(self):
+        cache = OccurrenceCache(max_entries=1)
+        loader = CountingLoader()
+        await cache.get(event_type_ids=[1], window_start=START, window_end=END, load=loader)
+        later_end = END + datetime.timedelta(days=1)
+        await cache.get(event_type_ids=[1], window_start=START, window_end=later_end, load=loader)
+
+        assert await cache.get(event_type_ids=[1], window_start=START, window_end=END, load=loader) == b"3"
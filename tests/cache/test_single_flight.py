@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache.single_flight import SingleFlight
+
+
+class FakeDatabase:
+    """Stand-in for the events query, counting how often it actually runs"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+
+    async def query(self) -> bytes:
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return b"[]"
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_reads_share_one_call(self):
+        single_flight = SingleFlight(name="test_share")
+        database = FakeDatabase(latency=0.01)
+
+        bodies = await asyncio.gather(*(single_flight.do(key="events", fn=database.query) for _ in range(50)))
+
+        assert database.queries == 1
+        assert all(body is bodies[0] for body in bodies)
+        assert single_flight.metrics.hits == 49
+
+    @pytest.mark.asyncio
+    async def test_different_scopes_do_not_share_calls(self):
+        single_flight = SingleFlight(name="test_scopes")
+        database = FakeDatabase(latency=0.01)
+
+        await asyncio.gather(
+            single_flight.do(key=("events", "scope-1"), fn=database.query),
+            single_flight.do(key=("events", "scope-2"), fn=database.query),
+        )
+
+        assert database.queries == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiting_caller(self):
+        single_flight = SingleFlight(name="test_errors")
+
+        async def failing_query():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database is down")
+
+        results = await asyncio.gather(
+            *(single_flight.do(key="events", fn=failing_query) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_shared_call(self):
+        single_flight = SingleFlight(name="test_cancel")
+        database = FakeDatabase(latency=0.02)
+
+        leader = asyncio.create_task(single_flight.do(key="events", fn=database.query))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do(key="events", fn=database.query))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == b"[]"
+        assert database.queries == 1
+
+    @pytest.mark.asyncio
+    async def test_load_burst_reduces_queries_per_second(self):
+        # Dashboard burst: 20 waves of 50 simultaneous page loads hitting the same read
+        latency, waves, users = 0.005, 20, 50
+
+        async def run_burst(read) -> float:
+            started = time.perf_counter()
+            for _ in range(waves):
+                await asyncio.gather(*(read() for _ in range(users)))
+            return time.perf_counter() - started
+
+        uncoalesced = FakeDatabase(latency=latency)
+        uncoalesced_elapsed = await run_burst(uncoalesced.query)
+
+        single_flight = SingleFlight(name="test_burst")
+        coalesced = FakeDatabase(latency=latency)
+        coalesced_elapsed = await run_burst(lambda: single_flight.do(key="events", fn=coalesced.query))
+
+        uncoalesced_qps = uncoalesced.queries / uncoalesced_elapsed
+        coalesced_qps = coalesced.queries / coalesced_elapsed
+
+        assert uncoalesced.queries == waves * users
+        assert coalesced.queries == waves
+        assert coalesced_qps * 10 < uncoalesced_qps
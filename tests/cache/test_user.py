@@ -0,0 +1,81 @@
+import time
+
+from app.cache.user import UserCache
+from app.models.db.user import User
+
+
+def build_user(user_id: int, username: str) -> User:
+    user = User(id=user_id, username=username, is_active=True)
+    user.set_hashed_password(hashed_password="secret")
+    return user
+
+
+class TestUserCache:
+    def test_cached_user_is_detached_copy_without_credentials(self):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+        user = build_user(user_id=1, username="alice")
+
+        cache.set("alice", user, generation=cache.generation)
+        is_cached, cached_user = cache.get("alice")
+
+        assert is_cached
+        assert cached_user is not user
+        assert cached_user.id == 1 and cached_user.is_active
+        assert cached_user.hashed_password is None
+
+    def test_unknown_username_is_negatively_cached(self):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+
+        cache.set("forged", None, generation=cache.generation)
+
+        assert cache.get("forged") == (True, None)
+
+    def test_expired_entry_is_a_miss(self, monkeypatch):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+        cache.set("alice", build_user(user_id=1, username="alice"), generation=cache.generation)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+        assert cache.get("alice") == (False, None)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = UserCache(max_size=2, ttl=60, negative_ttl=30)
+        cache.set("alice", build_user(user_id=1, username="alice"), generation=cache.generation)
+        cache.set("bob", build_user(user_id=2, username="bob"), generation=cache.generation)
+        cache.get("alice")
+        cache.set("carol", build_user(user_id=3, username="carol"), generation=cache.generation)
+
+        assert cache.get("bob") == (False, None)
+        assert cache.get("alice")[0]
+
+    def test_invalidate_by_user_id_and_username(self):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+        cache.set("alice", build_user(user_id=1, username="alice"), generation=cache.generation)
+        cache.set("bob", None, generation=cache.generation)
+
+        cache.invalidate_user_ids([1])
+        cache.invalidate_usernames(["bob"])
+
+        assert cache.get("alice") == (False, None)
+        assert cache.get("bob") == (False, None)
+
+    def test_lookup_racing_an_invalidation_is_not_cached(self):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+        generation = cache.generation
+
+        cache.invalidate_user_ids([1])
+        cache.set("alice", build_user(user_id=1, username="alice"), generation=generation)
+
+        assert cache.get("alice") == (False, None)
+
+    def test_metrics_count_queries_saved(self):
+        cache = UserCache(max_size=10, ttl=60, negative_ttl=30)
+        hits = cache.metrics.hits
+        cache.set("alice", build_user(user_id=1, username="alice"), generation=cache.generation)
+
+        cache.get("alice")
+        cache.get("alice")
+
+        assert cache.metrics.hits == hits + 2
+        assert cache.metrics.as_dict()["queries_saved"] == cache.metrics.hits
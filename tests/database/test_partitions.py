@@ -0,0 +1,178 @@
+import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.database import partitions
+from app.database.partitions import (
+    archive_event_partitions,
+    create_event_partitions,
+    partition_bounds,
+    partition_years,
+    years_to_archive,
+    years_to_create,
+)
+from app.repositories.event_summary import EventSummaryRepository
+
+TODAY = datetime.date(2026, 10, 19)
+
+
+class FakeSession:
+    """
+    Records the SQL it executes, with the given partitions, the tables holding rows its checks look for, the
+    events of the partitions and the years of the events of the default partition.
+    """
+
+    def __init__(
+            self,
+            partition_names: list[str],
+            matching_tables: set[str] = frozenset(),
+            events: dict[str, list[tuple]] | None = None,
+            default_years: list[int] | None = None,
+    ):
+        self.partition_names = partition_names
+        self.matching_tables = matching_tables
+        self.events = events or {}
+        self.default_years = default_years or []
+        self.statements: list[str] = []
+        self.committed = False
+        self.rolled_back = False
+
+    def _record(self, statement) -> str:
+        sql = str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+        self.statements.append(sql)
+        return sql
+
+    async def execute(self, statement, params=None):
+        sql = self._record(statement)
+        return FakeResult(next((rows for table, rows in self.events.items() if f'FROM "{table}"' in sql), []))
+
+    async def scalars(self, statement, params=None):
+        sql = self._record(statement)
+        return self.default_years if f'FROM "{partitions.DEFAULT_PARTITION}"' in sql else self.partition_names
+
+    async def scalar(self, statement, params=None):
+        sql = self._record(statement)
+        return any(f'FROM "{table}"' in sql for table in self.matching_tables)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+class TestPartitionYears:
+    def test_bounds_are_utc_years(self):
+        start, end = partition_bounds(year=2026)
+
+        assert start == datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+        assert end == datetime.datetime(2027, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def test_default_partition_is_not_a_year(self):
+        assert partition_years(["EVENT_2025", "EVENT_DEFAULT", "EVENT_2023", "EVENT_archive"]) == [2023, 2025]
+
+    def test_years_to_create(self):
+        assert years_to_create(existing=[2025, 2026], current_year=2026, years_ahead=2) == [2027, 2028]
+        assert years_to_create(existing=[], current_year=2026, years_ahead=0) == [2026]
+
+    def test_years_to_archive(self):
+        existing = [2019, 2021, 2022, 2023, 2026]
+
+        assert years_to_archive(existing=existing, current_year=2026, keep_years=3) == [2019, 2021, 2022]
+        assert years_to_archive(existing=existing, current_year=2026, keep_years=10) == []
+
+
+class TestCreateEventPartitions:
+    @pytest.mark.asyncio
+    async def test_creates_missing_years(self):
+        session = FakeSession(partition_names=["EVENT_2026", "EVENT_DEFAULT"])
+
+        created = await create_event_partitions(async_session=session, years_ahead=2, today=TODAY)
+
+        assert created == ["EVENT_2027", "EVENT_2028"]
+        assert session.committed
+        assert "pg_advisory_xact_lock" in session.statements[0]
+        assert (
+            'CREATE TABLE "EVENT_2027" PARTITION OF "EVENT" '
+            'FOR VALUES FROM (\'2027-01-01T00:00:00+00:00\') TO (\'2028-01-01T00:00:00+00:00\')'
+        ) in session.statements
+
+    @pytest.mark.asyncio
+    async def test_skips_years_held_by_the_default_partition(self):
+        session = FakeSession(partition_names=["EVENT_2026", "EVENT_DEFAULT"], matching_tables={"EVENT_DEFAULT"})
+
+        created = await create_event_partitions(async_session=session, years_ahead=2, today=TODAY)
+
+        assert created == []
+        assert not any(sql.startswith("CREATE TABLE") for sql in session.statements)
+
+
+class TestArchiveEventPartitions:
+    @pytest.mark.asyncio
+    async def test_detaches_old_years_into_the_schema(self, mocker):
+        publish = mocker.patch.object(partitions.invalidation_bus, "publish")
+        session = FakeSession(partition_names=["EVENT_2021", "EVENT_2022", "EVENT_2025", "EVENT_2026"])
+
+        archived = await archive_event_partitions(async_session=session, keep_years=3, schema="archive", today=TODAY)
+
+        assert archived == ["EVENT_2021", "EVENT_2022"]
+        assert 'ALTER TABLE "EVENT" DETACH PARTITION "EVENT_2021"' in session.statements
+        assert 'ALTER TABLE "EVENT_2022" SET SCHEMA "archive"' in session.statements
+        assert session.committed
+        publish.assert_called_once_with(session, partitions.InvalidationNamespace.EVENTS)
+
+    @pytest.mark.asyncio
+    async def test_keeps_partitions_with_recurring_events(self, mocker):
+        publish = mocker.patch.object(partitions.invalidation_bus, "publish")
+        session = FakeSession(partition_names=["EVENT_2021", "EVENT_2022"], matching_tables={"EVENT_2021"})
+
+        archived = await archive_event_partitions(async_session=session, keep_years=3, schema="archive", today=TODAY)
+
+        assert archived == ["EVENT_2022"]
+        assert 'ALTER TABLE "EVENT" DETACH PARTITION "EVENT_2021"' not in session.statements
+        publish.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_archived_events_are_taken_out_of_the_summaries(self, mocker):
+        mocker.patch.object(partitions.invalidation_bus, "publish")
+        apply_event_changes = mocker.patch.object(EventSummaryRepository, "apply_event_changes")
+        camp = (10, datetime.datetime(2021, 12, 31, 18, tzinfo=datetime.timezone.utc),
+                datetime.datetime(2022, 1, 2, 10, tzinfo=datetime.timezone.utc))
+        session = FakeSession(partition_names=["EVENT_2021", "EVENT_2026"], events={"EVENT_2021": [camp]})
+
+        await archive_event_partitions(async_session=session, keep_years=3, schema="archive", today=TODAY)
+
+        apply_event_changes.assert_awaited_once_with(removed=[camp])
+        assert 'DELETE FROM "EVENT_MONTH_SUMMARY" WHERE "EVENT_MONTH_SUMMARY"."EVENT_COUNT" = $1::INTEGER' in (
+            session.statements[-1]
+        )
+
+    @pytest.mark.asyncio
+    async def test_old_events_of_the_default_partition_are_reported(self, mocker):
+        mocker.patch.object(partitions.invalidation_bus, "publish")
+        warning = mocker.patch.object(partitions.logger, "warning")
+        session = FakeSession(partition_names=["EVENT_2026", "EVENT_DEFAULT"], default_years=[2019, 2020])
+
+        archived = await archive_event_partitions(async_session=session, keep_years=3, schema="archive", today=TODAY)
+
+        assert archived == []
+        assert "[2019, 2020]" in warning.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_archive(self, mocker):
+        publish = mocker.patch.object(partitions.invalidation_bus, "publish")
+        session = FakeSession(partition_names=["EVENT_2025", "EVENT_2026", "EVENT_DEFAULT"])
+
+        archived = await archive_event_partitions(async_session=session, keep_years=3, schema="archive", today=TODAY)
+
+        assert archived == []
+        assert not publish.called
@@ -0,0 +1,112 @@
+import pydantic
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.database import seed
+from app.database.seed import apply_seed, DEFAULT_SEED, FULL, SEE, SeedSpec
+
+
+class FakeSession:
+    """Records the SQL it executes, upserted roles and event types get ids in the order they are listed"""
+
+    def __init__(self, user_id: int | None = None):
+        self.user_id = user_id
+        self.statements: list[str] = []
+        self.committed = False
+
+    def _record(self, statement) -> str:
+        compiled = statement.compile(dialect=postgresql.asyncpg.dialect())
+        self.statements.append(str(compiled))
+        return str(compiled)
+
+    async def execute(self, statement):
+        sql = self._record(statement)
+        if sql.startswith(('INSERT INTO "ROLE" ', 'INSERT INTO "EVENT_TYPE" ')):
+            params = statement.compile().params
+            names = [value for key, value in params.items() if key.startswith("NAME")]
+            return [(_id, name) for _id, name in enumerate(names, start=1)]
+        return None
+
+    async def scalar(self, statement):
+        sql = self._record(statement)
+        return 42 if sql.startswith("INSERT") else self.user_id
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class TestSeedSpec:
+    def test_undeclared_references(self):
+        with pytest.raises(pydantic.ValidationError):
+            SeedSpec(roles=["chef"], event_types={"scout_event": ""}, permissions={"leader": {}}, super_role="super")
+        with pytest.raises(pydantic.ValidationError):
+            SeedSpec(
+                roles=["chef"], event_types={"scout_event": ""}, permissions={"chef": {"chalet": SEE}},
+                super_role="super",
+            )
+
+    def test_default_permission_rows(self):
+        rows = {(role, event_type): grant for role, event_type, grant in DEFAULT_SEED.permission_rows()}
+
+        assert all(rows["super", event_type] == FULL for event_type in DEFAULT_SEED.event_types)
+        assert rows["chalet", "chalet"] == FULL
+        assert rows["chefassistent", "scout_event"] == SEE
+        assert ("chef", "chalet") not in rows
+
+
+class TestApplySeed:
+    @pytest.mark.asyncio
+    async def test_one_upsert_per_table(self, mocker):
+        publish = mocker.patch.object(seed.invalidation_bus, "publish")
+        session = FakeSession()
+
+        await apply_seed(async_session=session, spec=DEFAULT_SEED)
+
+        assert session.committed
+        assert len(session.statements) == 4
+        assert "pg_advisory_xact_lock" in session.statements[0]
+        assert all("ON CONFLICT" in sql and "DO UPDATE" in sql for sql in session.statements[1:3])
+        assert session.statements[3].count("), (") == len(DEFAULT_SEED.permission_rows()) - 1
+        assert publish.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_existing_permissions_are_only_overwritten_when_asked(self, mocker):
+        mocker.patch.object(seed.invalidation_bus, "publish")
+        kept, overwritten = FakeSession(), FakeSession()
+
+        await apply_seed(async_session=kept, spec=DEFAULT_SEED)
+        await apply_seed(async_session=overwritten, spec=DEFAULT_SEED, overwrite_permissions=True)
+
+        assert kept.statements[3].endswith("ON CONFLICT (\"ROLE_ID\", \"EVENT_TYPE_ID\") DO NOTHING")
+        assert 'DO UPDATE SET "PERMISSIONS" = excluded."PERMISSIONS"' in overwritten.statements[3]
+
+    @pytest.mark.asyncio
+    async def test_statements_do_not_grow_with_the_spec(self, mocker):
+        mocker.patch.object(seed.invalidation_bus, "publish")
+        spec = SeedSpec(
+            roles=[f"role-{i}" for i in range(50)],
+            event_types={f"type-{i}": "" for i in range(20)},
+            permissions={f"role-{i}": {f"type-{j}": SEE for j in range(20)} for i in range(50)},
+            super_role="super",
+        )
+        session = FakeSession()
+
+        await apply_seed(async_session=session, spec=spec)
+
+        assert len(session.statements) == 4
+
+    @pytest.mark.asyncio
+    async def test_existing_super_user_is_not_recreated(self, mocker):
+        mocker.patch.object(seed.invalidation_bus, "publish")
+        hash_password = mocker.spy(seed.pass_generator, "generate_hashed_password")
+        session = FakeSession(user_id=7)
+
+        await apply_seed(async_session=session, spec=DEFAULT_SEED, super_user=("admin", "secret"))
+
+        assert not hash_password.called
+        assert not any(sql.startswith('INSERT INTO "USER" ') for sql in session.statements)
+        assert 'INSERT INTO "USER_ROLE"' in session.statements[-1]
+        assert "ON CONFLICT DO NOTHING" in session.statements[-1]
@@ -0,0 +1,50 @@
+import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.event_summary import EventSummaryRepository
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+def utc(*args: int) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+
+class TestApplyEventChanges:
+    @pytest.mark.asyncio
+    async def test_months_are_incremented_with_one_upsert(self):
+        session = FakeSession()
+
+        await EventSummaryRepository(session).apply_event_changes(
+            added=[(10, utc(2024, 8, 1, 10), utc(2024, 8, 1, 11)), (10, utc(2024, 7, 2), utc(2024, 7, 2))],
+            removed=[(10, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))],
+        )
+
+        assert len(session.statements) == 1
+        compiled = session.statements[0].compile(dialect=postgresql.asyncpg.dialect())
+        assert 'ON CONFLICT ("EVENT_TYPE", "MONTH") DO UPDATE' in str(compiled)
+        assert '"EVENT_COUNT" = ("EVENT_MONTH_SUMMARY"."EVENT_COUNT" + excluded."EVENT_COUNT")' in str(compiled)
+        params = compiled.params
+        assert (params["MONTH_m0"], params["EVENT_COUNT_m0"], params["BOOKED_SECONDS_m0"]) == (
+            datetime.date(2024, 7, 1), 0, -7200
+        )
+        assert (params["MONTH_m1"], params["EVENT_COUNT_m1"], params["BOOKED_SECONDS_m1"]) == (
+            datetime.date(2024, 8, 1), 1, 3600
+        )
+
+    @pytest.mark.asyncio
+    async def test_unchanged_events_write_nothing(self):
+        session = FakeSession()
+        span = (10, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))
+
+        await EventSummaryRepository(session).apply_event_changes(added=[span], removed=[span])
+
+        assert session.statements == []
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.repositories.loaders import DataLoader
+
+
+class RecordingBatchLoad:
+    def __init__(self, values: dict, fail: bool = False):
+        self.values = values
+        self.fail = fail
+        self.calls: list[list] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, keys: list) -> dict:
+        self.calls.append(keys)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0)
+        self.running -= 1
+        if self.fail:
+            raise RuntimeError("database is gone")
+        return {key: self.values[key] for key in keys if key in self.values}
+
+
+class TestDataLoader:
+    @pytest.mark.asyncio
+    async def test_loads_of_one_tick_are_batched(self):
+        batch_load = RecordingBatchLoad(values={1: "alice", 2: "bob"})
+        loader = DataLoader(batch_load=batch_load)
+
+        results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+        assert results == ["alice", "bob", "alice", None]
+        assert batch_load.calls == [[1, 2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_results_are_memoized(self):
+        batch_load = RecordingBatchLoad(values={1: "alice", 2: "bob"})
+        loader = DataLoader(batch_load=batch_load)
+
+        assert await loader.load(1) == "alice"
+        assert await loader.load_many([1, 2]) == ["alice", "bob"]
+
+        assert batch_load.calls == [[1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_memoized(self):
+        batch_load = RecordingBatchLoad(values={1: "alice"}, fail=True)
+        loader = DataLoader(batch_load=batch_load)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(loader.load(1), loader.load(2))
+        batch_load.fail = False
+
+        assert await loader.load(1) == "alice"
+
+    @pytest.mark.asyncio
+    async def test_loaders_sharing_a_lock_do_not_query_at_once(self):
+        batch_load = RecordingBatchLoad(values={1: "alice"})
+        lock = asyncio.Lock()
+        users, roles = DataLoader(batch_load=batch_load, lock=lock), DataLoader(batch_load=batch_load, lock=lock)
+
+        await asyncio.gather(users.load(1), roles.load(1))
+
+        assert len(batch_load.calls) == 2
+        assert batch_load.max_running == 1
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.db.role_event_type import Permission, RoleEventType
+from app.models.schemas.role_event_type import RoleEventTypeInUpdate
+from app.repositories import role_event_type
+from app.repositories.role_event_type import RoleEventTypeRepository
+
+
+class TestUpdatePermissions:
+    @pytest.mark.asyncio
+    async def test_flags_are_written_as_one_mask(self, mocker):
+        mocker.patch.object(role_event_type.invalidation_bus, "publish")
+        mocker.patch.object(
+            RoleEventTypeRepository, "get_permissions_by_role_id_and_event_type_id",
+            return_value=RoleEventType(role_id=2, event_type_id=10, permissions=Permission.SEE),
+        )
+        session = mocker.AsyncMock()
+
+        await RoleEventTypeRepository(async_session=session).update_permissions_by_id(
+            role_id=2, event_type_id=10,
+            permission_update=RoleEventTypeInUpdate(can_edit=True, can_see=True, can_add=None),
+        )
+
+        compiled = session.execute.call_args.kwargs["statement"].compile(dialect=postgresql.asyncpg.dialect())
+        assert str(compiled).startswith('UPDATE "ROLE_EVENT_TYPE" SET "PERMISSIONS"=$1::INTEGER WHERE')
+        assert compiled.params["PERMISSIONS"] == Permission.EDIT | Permission.SEE
+        session.commit.assert_awaited_once()
@@ -0,0 +1,104 @@
+import fastapi
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+
+from app.models.db.role_event_type import Permission, RoleEventType
+from app.models.db.user import User
+from app.models.db.user_event_type_access import UserEventTypeAccess
+from app.utilities.authorization.permissions import check_event_type_permission, get_permitted_event_types
+
+
+class TestPermission:
+    def test_from_flags(self):
+        assert Permission.from_flags(can_edit=True, can_see=True, can_add=False) == Permission.EDIT | Permission.SEE
+        assert Permission.from_flags(can_edit=None, can_see=False, can_add=False) == Permission(0)
+
+    def test_boolean_fields_read_and_write_the_mask(self):
+        permission = RoleEventType(role_id=1, event_type_id=10, can_see=True, can_add=True, can_edit=False)
+
+        assert permission.permissions == Permission.SEE | Permission.ADD
+        permission.can_add = False
+        permission.can_edit = True
+        assert permission.permissions == Permission.SEE | Permission.EDIT
+        assert (permission.can_edit, permission.can_see, permission.can_add) == (True, True, False)
+
+    def test_boolean_fields_filter_on_the_mask(self):
+        stmt = sqlalchemy.select(RoleEventType.role_id).where(RoleEventType.can_add)
+        compiled = stmt.compile(dialect=postgresql.asyncpg.dialect())
+
+        assert '("ROLE_EVENT_TYPE"."PERMISSIONS" & $1::INTEGER) != $2::INTEGER' in str(compiled)
+        assert list(compiled.construct_params().values()) == [4, 0]
+
+
+class TestCheckEventTypePermission:
+    @pytest.mark.asyncio
+    async def test_access_granting_the_action_passes(self, mocker):
+        permission_repo = mocker.Mock(get_access_of_user=mocker.AsyncMock(return_value=UserEventTypeAccess(
+            user_id=1, event_type_id=10, permissions=Permission.SEE | Permission.ADD
+        )))
+
+        await check_event_type_permission(
+            permission_repo=permission_repo, current_user=User(id=1), event_type=10,
+            action="add",
+        )
+
+        # One primary key lookup, whatever the number of roles of the user
+        permission_repo.get_access_of_user.assert_awaited_once_with(user_id=1, event_type_id=10)
+
+    @pytest.mark.asyncio
+    async def test_access_without_the_action_is_denied(self, mocker):
+        permission_repo = mocker.Mock(get_access_of_user=mocker.AsyncMock(return_value=UserEventTypeAccess(
+            user_id=1, event_type_id=10, permissions=Permission.SEE
+        )))
+
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            await check_event_type_permission(
+                permission_repo=permission_repo, current_user=User(id=1), event_type=10,
+                action="edit",
+            )
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_no_access_is_denied(self, mocker):
+        permission_repo = mocker.Mock(get_access_of_user=mocker.AsyncMock(return_value=None))
+
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            await check_event_type_permission(
+                permission_repo=permission_repo, current_user=User(id=1), event_type=10,
+                action="see",
+            )
+
+        assert exc_info.value.status_code == 403
+
+
+class TestGetPermittedEventTypes:
+    @pytest.mark.asyncio
+    async def test_access_granting_the_action_permits_the_type(self, mocker):
+        permission_repo = mocker.Mock(get_accesses_of_user=mocker.AsyncMock(return_value=[
+            UserEventTypeAccess(user_id=1, event_type_id=10, can_add=True, can_edit=False),
+            UserEventTypeAccess(user_id=1, event_type_id=20, can_add=True, can_edit=True),
+            UserEventTypeAccess(user_id=1, event_type_id=30, can_add=False, can_edit=True),
+        ]))
+
+        permitted = await get_permitted_event_types(
+            permission_repo=permission_repo, current_user=User(id=1),
+            event_types=[10, 20, 20, 30, 40], action="add",
+        )
+
+        assert permitted == {10, 20}
+        # One lookup for the whole batch
+        permission_repo.get_accesses_of_user.assert_awaited_once_with(user_id=1, event_type_ids={10, 20, 30, 40})
+
+    @pytest.mark.asyncio
+    async def test_no_event_types_is_permitted_nothing(self, mocker):
+        permission_repo = mocker.Mock(get_accesses_of_user=mocker.AsyncMock())
+
+        permitted = await get_permitted_event_types(
+            permission_repo=permission_repo, current_user=User(id=1), event_types=[],
+            action="edit",
+        )
+
+        assert permitted == set()
+        permission_repo.get_accesses_of_user.assert_not_awaited()
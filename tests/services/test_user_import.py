@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from app.models.db.role import Role
+from app.models.db.user import User
+from app.repositories.user import UserRepository
+from app.security.hashing.password import pass_generator
+from app.services import user_import
+from app.services.user_import import hash_passwords, parse_user_import, UserImportService
+from app.utilities.exceptions.upload import InvalidImportFile
+from app.utilities.executors.process_pool import ProcessPool
+
+CSV_IMPORT = (
+    # Spreadsheet exports start with a byte order mark
+    "\ufeffusername,first_name,last_name,password,roles\n"
+    "alice,Alice,Smith,secret1,admin; leader\n"
+    "bob,,,secret2,\n"
+).encode()
+
+
+class TestParseUserImport:
+    def test_csv_with_roles(self):
+        records = parse_user_import(content=CSV_IMPORT, filename="members.csv")
+
+        assert records == [
+            {"username": "alice", "first_name": "Alice", "last_name": "Smith", "password": "secret1",
+             "roles": ["admin", "leader"]},
+            {"username": "bob", "first_name": None, "last_name": None, "password": "secret2", "roles": []},
+        ]
+
+    def test_json_by_content_type(self):
+        content = json.dumps([{"username": "alice", "password": "secret", "roles": ["admin"]}]).encode()
+
+        assert parse_user_import(content=content, content_type="application/json")[0]["roles"] == ["admin"]
+
+    def test_unreadable_files(self):
+        for content, filename in ((b'{"username": "alice"}', "a.json"), (b"[1, 2]", "a.json"), (b"\xff\xfe", "a.csv")):
+            with pytest.raises(InvalidImportFile):
+                parse_user_import(content=content, filename=filename)
+
+
+class TestHashPasswords:
+    @pytest.mark.asyncio
+    async def test_hashed_in_worker_processes(self, mocker):
+        pool = ProcessPool(max_workers=2)
+        mocker.patch.object(user_import, "process_pool", pool)
+        passwords = [f"password-{i}" for i in range(9)]
+
+        try:
+            hashes = await hash_passwords(passwords)
+        finally:
+            await pool.shutdown()
+
+        assert len(hashes) == len(passwords)
+        assert len({salt for salt, _ in hashes}) == len(passwords)
+        for password, (salt, hashed_password) in zip(passwords, hashes):
+            assert pass_generator.is_password_authenticated(
+                salt=salt, password=password, hashed_password=hashed_password
+            )
+
+
+class TestUserImportService:
+    @pytest.mark.asyncio
+    async def test_only_valid_records_are_imported(self, mocker):
+        records = [
+            {"username": "alice", "password": "a", "roles": ["leader"]},
+            {"username": "bob", "first_name": "Bob", "password": "b"},
+            {"username": "taken", "password": "c"},
+            {"username": "alice", "password": "d"},
+            {"username": "carol", "password": "e", "roles": ["nobody"]},
+            {"password": "f"},
+        ]
+        mocker.patch.object(UserRepository, "get_taken_usernames", return_value={"taken"})
+        mocker.patch.object(
+            user_import.catalog_cache, "get", return_value=mocker.Mock(roles_by_name={"leader": Role(id=1)})
+        )
+        mocker.patch.object(user_import, "hash_passwords", return_value=[("salt", "hash")])
+        import_users = mocker.patch.object(UserRepository, "import_users", return_value=[
+            User(id=7, username="alice", created_at="2023-09-01T10:00:00+00:00"),
+        ])
+
+        results = await UserImportService(async_session=mocker.Mock()).import_users(records=records)
+
+        assert [result.status_code for result in results] == [201, 422, 400, 400, 404, 422]
+        assert results[0].user.id == 7
+        assert [user.username for user in import_users.call_args.kwargs["users"]] == ["alice"]
@@ -0,0 +1,176 @@
+import hashlib
+import os
+
+import fastapi
+import httpx
+import pytest
+
+from app.api.routes import assets
+from app.config.manager import settings
+from app.storage.files import AssetFileResponse, etag_matches, parse_range, resolve_asset_path, ZEROCOPY_EXTENSION
+from app.utilities.exceptions.assets import AssetNotFound, RangeNotSatisfiable
+
+CONTENT = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def assets_root(tmp_path, monkeypatch):
+    (tmp_path / "1").mkdir()
+    (tmp_path / "1" / "profile_pic.png").write_bytes(CONTENT)
+    (tmp_path / "1" / ".upload-1.png").write_bytes(b"partial")
+    (tmp_path.parent / "secret.txt").write_bytes(b"secret")
+    monkeypatch.setattr(settings, "ASSETS_PATH", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(assets_root):
+    app = fastapi.FastAPI()
+    app.include_router(assets.router)
+    return httpx.AsyncClient(app=app, base_url="http://test")
+
+
+class TestResolveAssetPath:
+    def test_paths_outside_root_and_temporary_files_are_refused(self, assets_root):
+        assert resolve_asset_path(str(assets_root), "1/profile_pic.png") == str(assets_root / "1" / "profile_pic.png")
+
+        for path in ("../secret.txt", "1/../../secret.txt", "/etc/passwd", "1/.upload-1.png", ""):
+            with pytest.raises(AssetNotFound):
+                resolve_asset_path(str(assets_root), path)
+
+
+class TestParseRange:
+    def test_ranges(self):
+        assert parse_range(None, size=100) is None
+        assert parse_range("bytes=0-9", size=100) == (0, 10)
+        assert parse_range("bytes=90-", size=100) == (90, 10)
+        assert parse_range("bytes=-10", size=100) == (90, 10)
+        assert parse_range("bytes=50-1000", size=100) == (50, 50)
+
+    def test_multiple_or_malformed_ranges_send_the_whole_file(self):
+        assert parse_range("bytes=0-1,5-6", size=100) is None
+        assert parse_range("bytes=a-b", size=100) is None
+        assert parse_range("items=0-1", size=100) is None
+
+    def test_unsatisfiable_ranges(self):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=100-", size=100)
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=-0", size=100)
+
+
+class TestEtagMatches:
+    def test_matches(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"x"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestGetAssetFile:
+    @pytest.mark.asyncio
+    async def test_full_file_with_strong_etag(self, client):
+        async with client:
+            response = await client.get("/assets/files/1/profile_pic.png")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["content-length"] == str(len(CONTENT))
+        assert response.headers["etag"].startswith('"') and len(response.headers["etag"]) == 66
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    @pytest.mark.asyncio
+    async def test_versioned_url_is_immutable(self, client):
+        async with client:
+            response = await client.get(
+                "/assets/files/1/profile_pic.png", params={"v": hashlib.sha256(CONTENT).hexdigest()[:16]}
+            )
+
+        assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+    @pytest.mark.asyncio
+    async def test_stale_or_short_version_is_revalidated(self, client):
+        async with client:
+            stale = await client.get("/assets/files/1/profile_pic.png", params={"v": "0123456789abcdef"})
+            short = await client.get(
+                "/assets/files/1/profile_pic.png", params={"v": hashlib.sha256(CONTENT).hexdigest()[:4]}
+            )
+
+        assert stale.headers["cache-control"] == "private, no-cache"
+        assert short.headers["cache-control"] == "private, no-cache"
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_not_modified(self, client):
+        async with client:
+            etag = (await client.get("/assets/files/1/profile_pic.png")).headers["etag"]
+            response = await client.get("/assets/files/1/profile_pic.png", headers={"if-none-match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_with_content(self, client, assets_root):
+        async with client:
+            first = (await client.get("/assets/files/1/profile_pic.png")).headers["etag"]
+            replacement = assets_root / "1" / "new.png"
+            replacement.write_bytes(b"new content")
+            os.replace(replacement, assets_root / "1" / "profile_pic.png")
+            second = await client.get("/assets/files/1/profile_pic.png", headers={"if-none-match": first})
+
+        assert second.status_code == 200
+        assert second.content == b"new content"
+        assert second.headers["etag"] != first
+
+    @pytest.mark.asyncio
+    async def test_byte_range(self, client):
+        async with client:
+            response = await client.get("/assets/files/1/profile_pic.png", headers={"range": "bytes=1000-1999"})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[1000:2000]
+        assert response.headers["content-range"] == f"bytes 1000-1999/{len(CONTENT)}"
+
+    @pytest.mark.asyncio
+    async def test_range_for_another_version_sends_whole_file(self, client):
+        async with client:
+            response = await client.get(
+                "/assets/files/1/profile_pic.png", headers={"range": "bytes=0-9", "if-range": '"stale"'},
+            )
+
+        assert response.status_code == 200
+        assert len(response.content) == len(CONTENT)
+
+    @pytest.mark.asyncio
+    async def test_unsatisfiable_range(self, client):
+        async with client:
+            response = await client.get("/assets/files/1/profile_pic.png", headers={"range": "bytes=999999999-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    @pytest.mark.asyncio
+    async def test_traversal_and_missing_files_are_not_found(self, client):
+        async with client:
+            for path in ("/assets/files/../secret.txt", "/assets/files/1/%2e%2e/%2e%2e/secret.txt",
+                         "/assets/files/1/.upload-1.png", "/assets/files/1", "/assets/files/2/missing.png"):
+                assert (await client.get(path)).status_code == 404
+
+
+class TestAssetFileResponse:
+    @pytest.mark.asyncio
+    async def test_file_is_handed_to_server_when_zerocopy_is_available(self, assets_root):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        response = AssetFileResponse(path=str(assets_root / "1" / "profile_pic.png"), offset=10, count=20)
+        await response({"type": "http", "extensions": {ZEROCOPY_EXTENSION: {}}}, None, send)  # type: ignore
+
+        assert messages[0]["type"] == "http.response.start"
+        assert messages[1]["type"] == ZEROCOPY_EXTENSION
+        assert (messages[1]["offset"], messages[1]["count"], messages[1]["more_body"]) == (10, 20, False)
+        assert len(messages) == 2
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+from app.repositories.assets import AssetsRepository
+from app.storage.backends.local import LocalStorageBackend
+from app.storage.blobs import blob_hash, blob_key, incoming_root
+from app.storage.gc import AssetGarbageCollector, find_garbage, garbage_batches
+
+OLD = time.time() - 10 * 24 * 3600
+
+
+def write_blob(root: str, content: bytes, extension: str = ".jpg", mtime: float = OLD) -> list[str]:
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = os.path.join(root, *blob_key(sha256=sha256, extension=extension).split("/"))
+    stem = os.path.splitext(path)[0]
+    paths = [path, f"{stem}_small{extension}", f"{stem}_small.webp"]
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for file_path in paths:
+        with open(file_path, "wb") as file_object:
+            file_object.write(content)
+        os.utime(file_path, (mtime, mtime))
+
+    return paths
+
+
+def build_collector(root: str) -> AssetGarbageCollector:
+    return AssetGarbageCollector(
+        backend=LocalStorageBackend(root=root), root=root, interval=3600, grace_period=3600, batch_size=2,
+    )
+
+
+class TestBlobs:
+    def test_sharded_layout(self):
+        sha256 = "ab" + "cd" + "0" * 60
+
+        assert blob_key(sha256=sha256, extension=".png") == f"blobs/ab/cd/{sha256}.png"
+
+    def test_hash_of_blob_urls_and_derivatives(self):
+        sha256 = "f" * 64
+
+        assert blob_hash(f"/api/assets/files/blobs/ff/ff/{sha256}.jpg") == sha256
+        assert blob_hash(f"/api/assets/files/blobs/ff/ff/{sha256}_small.webp?v=1") == sha256
+        assert blob_hash("/api/assets/files/1/profile_pic.jpg") is None
+        assert blob_hash(None) is None
+
+
+class TestFindGarbage:
+    def test_unreferenced_blobs_are_garbage_with_their_derivatives(self):
+        referenced, unreferenced = "a" * 64, "b" * 64
+        objects = [
+            (f"blobs/aa/aa/{referenced}.jpg", OLD),
+            (f"blobs/bb/bb/{unreferenced}.jpg", OLD),
+            (f"blobs/bb/bb/{unreferenced}_small.webp", OLD),
+        ]
+
+        garbage = find_garbage(objects=objects, referenced={referenced}, older_than=time.time() - 3600)
+
+        assert garbage == [f"blobs/bb/bb/{unreferenced}.jpg", f"blobs/bb/bb/{unreferenced}_small.webp"]
+
+    def test_blob_is_kept_while_any_of_its_objects_is_recent(self):
+        sha256 = "c" * 64
+        objects = [(f"blobs/cc/cc/{sha256}.jpg", time.time()), (f"blobs/cc/cc/{sha256}_small.jpg", OLD)]
+
+        assert find_garbage(objects=objects, referenced=set(), older_than=time.time() - 3600) == []
+
+
+class TestGarbageBatches:
+    def test_blobs_are_never_split_between_batches(self):
+        first, second, third = "a" * 64, "b" * 64, "c" * 64
+        garbage = [
+            f"blobs/aa/aa/{first}.jpg", f"blobs/aa/aa/{first}_small.jpg", f"blobs/aa/aa/{first}_small.webp",
+            f"blobs/bb/bb/{second}.jpg",
+            f"blobs/cc/cc/{third}.jpg", f"blobs/cc/cc/{third}_small.jpg",
+        ]
+
+        assert garbage_batches(garbage=garbage, batch_size=2) == [garbage[:3], garbage[3:4], garbage[4:]]
+        assert garbage_batches(garbage=garbage, batch_size=4) == [garbage[:4], garbage[4:]]
+
+
+class TestAssetGarbageCollector:
+    @pytest.mark.asyncio
+    async def test_collect_deletes_unreferenced_blobs_in_batches(self, tmp_path, mocker):
+        root = str(tmp_path)
+        referenced = write_blob(root, b"referenced", extension=".png")
+        unreferenced = write_blob(root, b"unreferenced") + write_blob(root, b"replaced")
+        recent = write_blob(root, b"just uploaded", mtime=time.time())
+        url = f"/api/assets/files/blobs/{os.path.relpath(referenced[0], os.path.join(root, 'blobs'))}"
+        mocker.patch.object(AssetsRepository, "try_lock_garbage_collection", return_value=True)
+        mocker.patch.object(AssetsRepository, "get_profile_pic_urls", return_value=[url])
+
+        deleted = await build_collector(root).collect(async_session=mocker.Mock())
+
+        assert deleted == len(unreferenced)
+        assert all(os.path.exists(path) for path in referenced + recent)
+        assert not any(os.path.exists(path) for path in unreferenced)
+
+    @pytest.mark.asyncio
+    async def test_abandoned_uploads_are_removed(self, tmp_path, mocker):
+        root = str(tmp_path)
+        abandoned = os.path.join(incoming_root(root), "1-abandoned")
+        in_progress = os.path.join(incoming_root(root), "2-in-progress")
+        for directory in (abandoned, in_progress):
+            os.makedirs(directory)
+            open(os.path.join(directory, "upload.jpg"), "wb").close()
+        os.utime(abandoned, (OLD, OLD))
+        mocker.patch.object(AssetsRepository, "try_lock_garbage_collection", return_value=False)
+
+        await build_collector(root).collect(async_session=mocker.Mock())
+
+        assert os.listdir(incoming_root(root)) == ["2-in-progress"]
+
+    @pytest.mark.asyncio
+    async def test_collect_is_skipped_while_another_worker_holds_the_lock(self, tmp_path, mocker):
+        unreferenced = write_blob(str(tmp_path), b"unreferenced")
+        mocker.patch.object(AssetsRepository, "try_lock_garbage_collection", return_value=False)
+
+        assert await build_collector(str(tmp_path)).collect(async_session=mocker.Mock()) == 0
+        assert all(os.path.exists(path) for path in unreferenced)
+
+    @pytest.mark.asyncio
+    async def test_blob_claimed_after_listing_keeps_its_derivatives(self, tmp_path, mocker):
+        root = str(tmp_path)
+        reuploaded = write_blob(root, b"uploaded again")
+        backend = LocalStorageBackend(root=root)
+        list_objects = backend.list_objects
+
+        async def list_then_claim(prefix: str):
+            objects = await list_objects(prefix=prefix)
+            # The same content is uploaded again while the collector is running
+            await backend.claim(os.path.relpath(reuploaded[0], root).replace(os.sep, "/"))
+            return objects
+
+        mocker.patch.object(backend, "list_objects", side_effect=list_then_claim)
+        mocker.patch.object(AssetsRepository, "try_lock_garbage_collection", return_value=True)
+        mocker.patch.object(AssetsRepository, "get_profile_pic_urls", return_value=[])
+        collector = AssetGarbageCollector(
+            backend=backend, root=root, interval=3600, grace_period=3600, batch_size=1,
+        )
+
+        assert await collector.collect(async_session=mocker.Mock()) == 0
+        assert all(os.path.exists(path) for path in reuploaded)
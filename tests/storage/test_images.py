@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from PIL import Image
+
+from app.models.db.user import User
+from app.models.schemas.profile_pic import ProfilePicFormat, ProfilePicSize
+from app.storage.blobs import profile_pic_variant_url
+from app.storage.images import process_profile_pic
+from app.utilities.exceptions.upload import UnsupportedMediaType
+from app.utilities.executors.process_pool import ProcessPool
+
+EXIF_ORIENTATION = 0x0112
+
+
+def write_jpeg_with_exif(path: str, size: tuple[int, int]) -> None:
+    image = Image.new("RGB", size, color=(200, 30, 30))
+    exif = Image.Exif()
+    # Rotated 90 degrees clockwise, as stored by a phone held upright
+    exif[EXIF_ORIENTATION] = 6
+    exif[0x010F] = "PhoneMaker"
+    image.save(path, format="JPEG", exif=exif)
+
+
+class TestProcessProfilePic:
+    def test_writes_thumbnails_and_webp_variants_without_metadata(self, tmp_path):
+        source = str(tmp_path / ".upload-1.jpg")
+        write_jpeg_with_exif(source, size=(1200, 800))
+
+        written = process_profile_pic(source=source, destination=str(tmp_path / "ab" / "abc.jpg"))
+
+        # The original comes last, so it is only stored once all of its derivatives are
+        assert len(written) == 7
+        assert written[-1] == str(tmp_path / "ab" / "abc.jpg")
+        assert not os.path.exists(source)
+        with Image.open(tmp_path / "ab" / "abc.jpg") as original:
+            # Upright at full size, without the location or camera of the upload
+            assert original.size == (800, 1200)
+            assert not original.getexif()
+            assert "xmp" not in original.info and "icc_profile" not in original.info
+        for size, pixels in (("small", 64), ("medium", 256), ("large", 512)):
+            for extension, image_format in (("jpg", "JPEG"), ("webp", "WEBP")):
+                with Image.open(tmp_path / "ab" / f"abc_{size}.{extension}") as variant:
+                    assert variant.format == image_format
+                    assert variant.size == (pixels, pixels)
+                    assert not variant.getexif()
+                    assert "icc_profile" not in variant.info
+
+    def test_png_keeps_its_format_and_transparency(self, tmp_path):
+        source = str(tmp_path / ".upload-1.png")
+        Image.new("RGBA", (300, 300), color=(0, 0, 0, 0)).save(source, format="PNG")
+
+        process_profile_pic(source=source, destination=str(tmp_path / "abc.png"))
+
+        with Image.open(tmp_path / "abc_small.png") as variant:
+            assert variant.mode == "RGBA"
+            assert variant.getpixel((0, 0))[3] == 0
+
+    def test_invalid_image_is_removed(self, tmp_path):
+        source = tmp_path / ".upload-2.jpg"
+        source.write_bytes(b"\xff\xd8\xff\xe0 truncated")
+
+        with pytest.raises(UnsupportedMediaType):
+            process_profile_pic(source=str(source), destination=str(tmp_path / "abc.jpg"))
+
+        assert os.listdir(tmp_path) == []
+
+
+class TestProfilePicVariantUrl:
+    def test_original_by_default(self):
+        assert profile_pic_variant_url("assets/1/profile_pic.png", size=None, image_format=None) \
+            == "assets/1/profile_pic.png"
+
+    def test_size_and_format(self):
+        url = "assets/1/profile_pic.png"
+
+        assert profile_pic_variant_url(url, ProfilePicSize.SMALL, None) == "assets/1/profile_pic_small.png"
+        assert profile_pic_variant_url(url, ProfilePicSize.SMALL, ProfilePicFormat.ORIGINAL) \
+            == "assets/1/profile_pic_small.png"
+        assert profile_pic_variant_url(url, ProfilePicSize.MEDIUM, ProfilePicFormat.WEBP) \
+            == "assets/1/profile_pic_medium.webp"
+        assert profile_pic_variant_url(url, None, ProfilePicFormat.WEBP) == "assets/1/profile_pic_large.webp"
+
+    def test_version_query_is_kept(self):
+        url = "/api/assets/files/1/profile_pic.jpg?v=0123456789abcdef"
+
+        assert profile_pic_variant_url(url, ProfilePicSize.SMALL, ProfilePicFormat.WEBP) \
+            == "/api/assets/files/1/profile_pic_small.webp?v=0123456789abcdef"
+
+    def test_user_without_profile_pic(self):
+        assert User(id=1, username="alice").profile_pic_url_for(size=ProfilePicSize.SMALL) is None
+
+    def test_models_do_not_load_pillow(self):
+        # Models are imported by alembic and the CLIs, which have no use for image decoding
+        code = "import sys, app.models.db.user; sys.exit('PIL' in sys.modules)"
+
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+class TestProcessPool:
+    @pytest.mark.asyncio
+    async def test_profile_pic_is_processed_in_a_worker_process(self, tmp_path):
+        pool = ProcessPool(max_workers=1)
+        source = str(tmp_path / ".upload-1.jpg")
+        write_jpeg_with_exif(source, size=(600, 600))
+
+        invalid = tmp_path / ".upload-2.png"
+        invalid.write_bytes(b"\x89PNG\r\n\x1a\n truncated")
+
+        try:
+            written = await pool.run(process_profile_pic, source=source, destination=str(tmp_path / "abc.jpg"))
+            # Errors raised in the worker reach the caller
+            with pytest.raises(UnsupportedMediaType):
+                await pool.run(process_profile_pic, source=str(invalid), destination=str(tmp_path / "def.png"))
+        finally:
+            await pool.shutdown()
+
+        assert written[-1] == str(tmp_path / "abc.jpg")
+        assert os.path.exists(tmp_path / "abc_large.webp")
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pytest
+from fastapi import UploadFile
+
+from app.storage.uploads import save_image_upload, sniff_image_extension
+from app.utilities.exceptions.upload import UnsupportedMediaType, UploadTooLarge
+
+JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+TEN_MB = 10 * 1024 * 1024
+
+
+def build_upload(content: bytes, content_type: str = "image/jpeg") -> UploadFile:
+    # Same spooling as starlette's multipart parser: kept in memory up to 1 MB, on disk above
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename="../../evil.png", headers={"content-type": content_type})  # type: ignore
+
+
+class TestSniffImageExtension:
+    def test_known_signatures(self):
+        assert sniff_image_extension(JPEG_HEADER) == "jpg"
+        assert sniff_image_extension(PNG_HEADER) == "png"
+
+    def test_unknown_content(self):
+        assert sniff_image_extension(b"<svg xmlns=") is None
+        assert sniff_image_extension(b"") is None
+
+
+class TestSaveImageUpload:
+    @pytest.mark.asyncio
+    async def test_stored_under_sniffed_extension_not_client_filename(self, tmp_path):
+        content = PNG_HEADER + os.urandom(200_000)
+
+        path, sha256 = await save_image_upload(
+            file=build_upload(content, content_type="image/jpeg"), directory=str(tmp_path / "1"), name="pic",
+            max_bytes=TEN_MB,
+        )
+
+        assert path == str(tmp_path / "1" / "pic.png")
+        assert sha256 == hashlib.sha256(content).hexdigest()
+        with open(path, "rb") as stored:
+            assert stored.read() == content
+        assert os.listdir(tmp_path / "1") == ["pic.png"]
+
+    @pytest.mark.asyncio
+    async def test_content_is_sniffed_instead_of_trusting_content_type(self, tmp_path):
+        with pytest.raises(UnsupportedMediaType):
+            await save_image_upload(
+                file=build_upload(b"GIF89a" + b"\x00" * 100, content_type="image/png"), directory=str(tmp_path),
+                name="pic", max_bytes=TEN_MB,
+            )
+
+    @pytest.mark.asyncio
+    async def test_size_limit_is_enforced_while_streaming(self, tmp_path):
+        upload = build_upload(JPEG_HEADER + b"\x00" * 500_000)
+
+        with pytest.raises(UploadTooLarge):
+            await save_image_upload(file=upload, directory=str(tmp_path), name="pic", max_bytes=100_000)
+
+        # Neither a partial file nor the temporary file is left behind
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_previous_file_is_kept_until_the_new_one_is_complete(self, tmp_path):
+        first = JPEG_HEADER + b"first"
+        await save_image_upload(file=build_upload(first), directory=str(tmp_path), name="pic", max_bytes=1000)
+
+        with pytest.raises(UploadTooLarge):
+            await save_image_upload(
+                file=build_upload(JPEG_HEADER + b"\x00" * 2000), directory=str(tmp_path), name="pic", max_bytes=1000,
+            )
+
+        with open(tmp_path / "pic.jpg", "rb") as stored:
+            assert stored.read() == first
+
+
+class TestUploadBenchmark:
+    @pytest.mark.asyncio
+    async def test_parallel_10mb_uploads_keep_memory_and_loop_latency_low(self, tmp_path):
+        """Eight parallel 10 MB uploads, while a ticker measures how late the event loop wakes it up"""
+        uploads = [build_upload(JPEG_HEADER + os.urandom(TEN_MB - len(JPEG_HEADER))) for _ in range(8)]
+        interval = 0.005
+        lags: list[float] = []
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(interval)
+                lags.append(time.perf_counter() - start - interval)
+
+        ticker_task = asyncio.ensure_future(ticker())
+        tracemalloc.start()
+        try:
+            results = await asyncio.gather(*(
+                save_image_upload(file=upload, directory=str(tmp_path / str(i)), name="pic", max_bytes=TEN_MB)
+                for i, upload in enumerate(uploads)
+            ))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            done.set()
+            await ticker_task
+
+        assert all(os.path.getsize(path) == TEN_MB for path, _ in results)
+        # Only chunks are held in memory, never a whole upload
+        assert peak < TEN_MB
+        assert max(lags) < 0.25
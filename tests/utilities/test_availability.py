@@ -0,0 +1,42 @@
+import datetime
+
+from app.models.schemas.event import EventConflict, EventPeriod
+from app.utilities.scheduling.availability import find_availability
+
+
+def at(hour: int) -> datetime.datetime:
+    return datetime.datetime(2024, 7, 1, hour, tzinfo=datetime.timezone.utc)
+
+
+class TestFindAvailability:
+    def test_free_slots_between_bookings(self):
+        free_slots, conflicts = find_availability(
+            periods=[(1, at(6), at(10)), (2, at(12), at(14)), (3, at(14), at(16))],
+            window_start=at(8),
+            window_end=at(20),
+        )
+
+        # Back-to-back bookings neither leave a slot nor conflict
+        assert free_slots == [
+            EventPeriod(start_date=at(10), end_date=at(12)), EventPeriod(start_date=at(16), end_date=at(20))
+        ]
+        assert conflicts == []
+
+    def test_overlapping_bookings_are_conflicts(self):
+        free_slots, conflicts = find_availability(
+            periods=[(2, at(9), at(11)), (1, at(8), at(12)), (3, at(10), at(13))],
+            window_start=at(8),
+            window_end=at(13),
+        )
+
+        assert free_slots == []
+        assert conflicts == [
+            EventConflict(event_id=1, other_event_id=2, start_date=at(9), end_date=at(11)),
+            EventConflict(event_id=1, other_event_id=3, start_date=at(10), end_date=at(12)),
+            EventConflict(event_id=2, other_event_id=3, start_date=at(10), end_date=at(11)),
+        ]
+
+    def test_empty_window_is_free(self):
+        assert find_availability(periods=[], window_start=at(8), window_end=at(9)) == (
+            [EventPeriod(start_date=at(8), end_date=at(9))], []
+        )
@@ -0,0 +1,95 @@
+import datetime
+
+from app.utilities.scheduling.months import (
+    month_bounds,
+    month_contributions,
+    month_of,
+    month_span,
+    months_between,
+    summary_deltas,
+)
+
+TIMEZONE = "Europe/Paris"
+HOUR = 3600
+
+
+def utc(*args: int) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+
+class TestMonths:
+    def test_months_are_those_of_the_timezone(self):
+        # Already February in Paris
+        assert month_of(moment=utc(2024, 1, 31, 23, 30), timezone=TIMEZONE) == datetime.date(2024, 2, 1)
+        assert month_of(moment=utc(2024, 1, 31, 22, 30), timezone=TIMEZONE) == datetime.date(2024, 1, 1)
+
+    def test_bounds_follow_daylight_saving_time(self):
+        start, end = month_bounds(month=datetime.date(2024, 3, 1), timezone=TIMEZONE)
+
+        assert start == utc(2024, 2, 29, 23)
+        assert end == utc(2024, 3, 31, 22)
+        assert end - start == datetime.timedelta(days=31, hours=-1)
+
+    def test_span_and_months_between(self):
+        assert month_span(first=datetime.date(2024, 11, 20), last=datetime.date(2025, 2, 1)) == 4
+        assert month_span(first=datetime.date(2025, 2, 1), last=datetime.date(2024, 11, 20)) < 1
+        assert months_between(first=datetime.date(2024, 11, 20), last=datetime.date(2025, 2, 1)) == [
+            datetime.date(2024, 11, 1),
+            datetime.date(2024, 12, 1),
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 2, 1),
+        ]
+        assert months_between(first=datetime.date(2025, 2, 1), last=datetime.date(2024, 11, 20)) == []
+
+
+class TestMonthContributions:
+    def test_event_within_a_month(self):
+        contributions = month_contributions(start=utc(2024, 7, 1, 10), end=utc(2024, 7, 1, 12), timezone=TIMEZONE)
+
+        assert contributions == {datetime.date(2024, 7, 1): (1, 2 * HOUR)}
+
+    def test_event_across_months_counts_in_its_first_one(self):
+        # Midnight of August 1st in Paris
+        contributions = month_contributions(start=utc(2024, 7, 31, 20), end=utc(2024, 8, 2, 22), timezone=TIMEZONE)
+
+        assert contributions == {datetime.date(2024, 7, 1): (1, 2 * HOUR), datetime.date(2024, 8, 1): (0, 48 * HOUR)}
+
+    def test_event_ending_at_the_end_of_a_month_stays_in_it(self):
+        contributions = month_contributions(start=utc(2024, 7, 30, 22), end=utc(2024, 7, 31, 22), timezone=TIMEZONE)
+
+        assert list(contributions) == [datetime.date(2024, 7, 1)]
+
+    def test_event_without_duration_books_nothing(self):
+        assert month_contributions(start=utc(2024, 7, 1), end=utc(2024, 7, 1), timezone=TIMEZONE) == {
+            datetime.date(2024, 7, 1): (1, 0)
+        }
+        assert month_contributions(start=utc(2024, 7, 2), end=utc(2024, 7, 1), timezone=TIMEZONE) == {
+            datetime.date(2024, 7, 1): (1, 0)
+        }
+
+
+class TestSummaryDeltas:
+    def test_moving_an_event_between_months(self):
+        before = (10, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))
+        after = (10, utc(2024, 8, 1, 10), utc(2024, 8, 1, 11))
+
+        deltas = summary_deltas(added=[after], removed=[before], timezone=TIMEZONE)
+
+        assert deltas == {(10, datetime.date(2024, 7, 1)): (-1, -2 * HOUR), (10, datetime.date(2024, 8, 1)): (1, HOUR)}
+
+    def test_unchanged_events_leave_their_months_alone(self):
+        event = (10, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))
+
+        assert summary_deltas(added=[event], removed=[event], timezone=TIMEZONE) == {}
+
+    def test_changing_the_event_type(self):
+        deltas = summary_deltas(
+            added=[(11, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))],
+            removed=[(10, utc(2024, 7, 1, 10), utc(2024, 7, 1, 12))],
+            timezone=TIMEZONE,
+        )
+
+        assert deltas == {
+            (10, datetime.date(2024, 7, 1)): (-1, -2 * HOUR),
+            (11, datetime.date(2024, 7, 1)): (1, 2 * HOUR),
+        }
@@ -0,0 +1,97 @@
+import datetime
+
+import pydantic
+import pytest
+
+from app.models.db.event import Event
+from app.models.db.event_override import EventOverride
+from app.models.schemas.event import EventInCreate
+from app.utilities.recurrence.expansion import expand_event, is_occurrence, next_occurrence_start
+
+UTC = datetime.timezone.utc
+
+
+def utc(*args: int) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=UTC)
+
+
+def weekly_event() -> Event:
+    # Saturdays at 14:00 in Paris, 13:00 UTC in winter
+    return Event(
+        id=1, created_by=1, event_type=10, title="Meeting", description="Weekly",
+        start_date=utc(2024, 1, 6, 13), end_date=utc(2024, 1, 6, 15), recurrence_rule="FREQ=WEEKLY;BYDAY=SA",
+    )
+
+
+class TestExpandEvent:
+    def test_only_the_window_is_expanded(self):
+        occurrences = expand_event(
+            event=weekly_event(), overrides=[], window_start=utc(2024, 2, 1), window_end=utc(2024, 2, 15)
+        )
+
+        assert [occurrence.start_date for occurrence in occurrences] == [utc(2024, 2, 3, 13), utc(2024, 2, 10, 13)]
+
+    def test_local_time_is_kept_across_daylight_saving_time(self):
+        occurrences = expand_event(
+            event=weekly_event(), overrides=[], window_start=utc(2024, 3, 25), window_end=utc(2024, 4, 10)
+        )
+
+        # Summer time starts on the 31st of March
+        assert [occurrence.start_date for occurrence in occurrences] == [utc(2024, 3, 30, 13), utc(2024, 4, 6, 12)]
+
+    def test_occurrence_overlapping_the_window_start_is_included(self):
+        occurrences = expand_event(
+            event=weekly_event(), overrides=[], window_start=utc(2024, 1, 13, 14), window_end=utc(2024, 1, 14)
+        )
+
+        assert [occurrence.original_start for occurrence in occurrences] == [utc(2024, 1, 13, 13)]
+
+    def test_overrides_are_applied(self):
+        overrides = [
+            EventOverride(event_id=1, original_start=utc(2024, 2, 3, 13), is_cancelled=True),
+            # Moved from the week before the window into it
+            EventOverride(
+                event_id=1, original_start=utc(2024, 1, 27, 13), is_cancelled=False, title="Moved",
+                start_date=utc(2024, 2, 1, 18), end_date=None,
+            ),
+        ]
+
+        occurrences = expand_event(
+            event=weekly_event(), overrides=overrides, window_start=utc(2024, 2, 1), window_end=utc(2024, 2, 8)
+        )
+
+        assert len(occurrences) == 1
+        assert occurrences[0].title == "Moved" and occurrences[0].is_override
+        assert (occurrences[0].start_date, occurrences[0].end_date) == (utc(2024, 2, 1, 18), utc(2024, 2, 1, 20))
+        assert occurrences[0].original_start == utc(2024, 1, 27, 13)
+
+    def test_single_event(self):
+        event = weekly_event()
+        event.recurrence_rule = None
+
+        january = expand_event(event=event, overrides=[], window_start=utc(2024, 1, 1), window_end=utc(2024, 2, 1))
+        february = expand_event(event=event, overrides=[], window_start=utc(2024, 2, 1), window_end=utc(2024, 3, 1))
+
+        assert (len(january), february) == (1, [])
+
+
+class TestRecurrenceRule:
+    def test_is_occurrence(self):
+        assert is_occurrence(event=weekly_event(), start=utc(2024, 4, 6, 12))
+        assert not is_occurrence(event=weekly_event(), start=utc(2024, 4, 6, 13))
+
+    def test_next_occurrence_start(self):
+        finished = weekly_event()
+        finished.recurrence_rule = "FREQ=WEEKLY;BYDAY=SA;COUNT=2"
+
+        assert next_occurrence_start(event=weekly_event(), after=utc(2024, 4, 1)) == utc(2024, 4, 6, 12)
+        assert next_occurrence_start(event=weekly_event(), after=utc(2024, 4, 6, 12)) == utc(2024, 4, 6, 12)
+        assert next_occurrence_start(event=finished, after=utc(2024, 2, 1)) is None
+
+    @pytest.mark.parametrize("rule", ["FREQ=MINUTELY", "FREQ=WEEKLY;BYDAY=XX", "DTSTART:20240101T000000Z", "nonsense"])
+    def test_unsupported_rules_are_rejected(self, rule):
+        with pytest.raises(pydantic.ValidationError):
+            EventInCreate(
+                created_by=1, event_type=10, title="Meeting", description="", start_date=utc(2024, 1, 6, 13),
+                end_date=utc(2024, 1, 6, 15), recurrence_rule=rule,
+            )